@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Deserialization throughput of :mod:`deexbase.decoders` for the operations of
+``tests/test_encoders.py``, as dicts and as operation objects. Run it from the
+repository root:
+
+.. code-block:: bash
+
+    python benchmarks/decoders.py --number 2000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Import the packages from this checkout, even if they are not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deexbase.decoders import decode_operation, decode_transaction
+from deexbase.encoders import encode_operation, encode_transaction
+from tests.test_encoders import (
+    expiration,
+    ref_block_num,
+    ref_block_prefix,
+    test_operations,
+)
+
+
+def bench(func, number):
+    return number / timeit.timeit(func, number=number)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--prefix", default="DX")
+    args = parser.parse_args()
+
+    print("{:<28} {:>8} {:>12} {:>12}".format("", "bytes", "dicts/s", "objects/s"))
+    for op in test_operations:
+        raw = encode_operation(op)
+        dicts = bench(lambda: decode_operation(raw, args.prefix), args.number)
+        objects = bench(
+            lambda: decode_operation(raw, args.prefix, objects=True), args.number
+        )
+        print(
+            "{:<28} {:>8} {:>12.0f} {:>12.0f}".format(op[0], len(raw), dicts, objects)
+        )
+
+    signature = "1f" + "00" * 64
+    raw = encode_transaction(
+        ref_block_num, ref_block_prefix, expiration, test_operations, [signature]
+    )
+    number = max(args.number // len(test_operations), 1)
+    dicts = bench(lambda: decode_transaction(raw, args.prefix), number)
+    objects = bench(lambda: decode_transaction(raw, args.prefix, objects=True), number)
+    print(
+        "{:<28} {:>8} {:>12.0f} {:>12.0f}".format(
+            "transaction ({} ops)".format(len(test_operations)),
+            len(raw),
+            dicts,
+            objects,
+        )
+    )
+    print("{:.1f} MB/s as dicts".format(dicts * len(raw) / 1e6))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serialization throughput of :mod:`deexbase.encoders` compared to the
+operation classes, for the operations of ``tests/test_encoders.py``. Run it
+from the repository root:
+
+.. code-block:: bash
+
+    python benchmarks/encoders.py --number 2000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Import the packages from this checkout, even if they are not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deexbase.encoders import encode_operation, encode_transaction
+from deexbase.objects import Operation
+from deexbase.signedtransactions import Signed_Transaction
+from tests.test_encoders import (
+    expiration,
+    ref_block_num,
+    ref_block_prefix,
+    test_operations,
+)
+
+
+def copy(op):
+    # The classes modify the memo they get
+    data = dict(op[1])
+    if data.get("memo"):
+        data["memo"] = dict(data["memo"])
+    return [op[0], data]
+
+
+def objects(op):
+    return bytes(Operation(copy(op)))
+
+
+def transaction_objects(ops):
+    return bytes(
+        Signed_Transaction(
+            ref_block_num=ref_block_num,
+            ref_block_prefix=ref_block_prefix,
+            expiration=expiration,
+            operations=[Operation(copy(op)) for op in ops],
+        )
+    )
+
+
+def bench(func, number):
+    return number / timeit.timeit(func, number=number)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("{:<28} {:>12} {:>12} {:>8}".format("", "classes/s", "encoders/s", ""))
+    for op in test_operations:
+        before = bench(lambda: objects(op), args.number)
+        after = bench(lambda: encode_operation(op), args.number)
+        print(
+            "{:<28} {:>12.0f} {:>12.0f} {:>7.1f}x".format(
+                op[0], before, after, after / before
+            )
+        )
+    ops = test_operations
+    number = max(args.number // len(ops), 1)
+    before = bench(lambda: transaction_objects(ops), number)
+    after = bench(
+        lambda: encode_transaction(
+            ref_block_num, ref_block_prefix, expiration, ops, signatures=[]
+        ),
+        number,
+    )
+    print(
+        "{:<28} {:>12.0f} {:>12.0f} {:>7.1f}x".format(
+            "transaction ({} ops)".format(len(ops)), before, after, after / before
+        )
+    )
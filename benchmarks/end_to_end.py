@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+End-to-end latency and throughput of common call paths against a local mock
+node, no network needed. Run it from the repository root:
+
+.. code-block:: bash
+
+    python benchmarks/end_to_end.py --latency 0.005 --jitter 0.002 --rounds 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Import the packages from this checkout, even if they are not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deex import DeEx
+from deex.account import Account
+from deex.asset import Asset
+from deex.market import Market
+from deexapi.recorder import replay_stats
+from tests.mocknode import MockNode
+
+
+def paths(deex):
+    """Call paths to measure, by name."""
+    market = Market("USD:DEEX", blockchain_instance=deex)
+
+    def account():
+        Account.clear_cache()
+        Account("init0", blockchain_instance=deex)
+
+    def asset():
+        Asset.clear_cache()
+        Asset("USD", blockchain_instance=deex)
+
+    def transfer():
+        deex.transfer("init1", 1, "DEEX", account="init0")
+
+    return dict(
+        get_objects=lambda: deex.rpc.get_objects(["2.1.0"]),
+        account=account,
+        asset=asset,
+        ticker=market.ticker,
+        orderbook=market.orderbook,
+        transfer=transfer,
+    )
+
+
+def bench(deex, rounds):
+    results = {}
+    for name, path in paths(deex).items():
+        latencies = []
+        start = time.monotonic()
+        for _ in range(rounds):
+            called = time.monotonic()
+            path()
+            latencies.append(time.monotonic() - called)
+        results[name] = replay_stats(latencies, time.monotonic() - start)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--responses", help="File with recorded responses")
+    args = parser.parse_args()
+
+    with MockNode(
+        responses=args.responses, latency=args.latency, jitter=args.jitter
+    ) as node:
+        deex = DeEx(
+            node.url,
+            keys=["5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"],
+            nobroadcast=True,
+            num_retries=1,
+        )
+        calls = node.calls
+        results = bench(deex, args.rounds)
+        deex.rpc.connection.disconnect()
+
+    for name, stats in results.items():
+        print(
+            "{name:>12}: {per_sec:8.1f} calls/sec, latency mean {mean:.2f}ms "
+            "p50 {p50:.2f}ms p99 {p99:.2f}ms".format(
+                name=name,
+                per_sec=stats["messages_per_sec"],
+                mean=stats["latency_mean"] * 1e3,
+                p50=stats["latency_p50"] * 1e3,
+                p99=stats["latency_p99"] * 1e3,
+            )
+        )
+    print("{} RPC calls served".format(node.calls - calls))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Import time of the packages, each measured in a fresh interpreter. The
+packages only import their submodules on first access, so ``import deex``
+should stay far below ``from deex import DeEx``. Run it from the repository
+root:
+
+.. code-block:: bash
+
+    python benchmarks/imports.py --repeat 5
+
+With ``--check``, it fails if a lazy import pulls in a heavy module or takes
+longer than ``--limit`` milliseconds.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+#: Statements that are measured and whether they are expected to be lazy
+statements = [
+    ("import deexbase", True),
+    ("import deex", True),
+    ("import deex.aio", True),
+    ("from deexbase import operations", False),
+    ("from deex import DeEx", False),
+    ("from deex.aio import DeEx", False),
+]
+
+#: Modules that a lazy import must not load
+heavy_modules = [
+    "deex.deex",
+    "deex.aio.deex",
+    "deex.storage",
+    "deexbase.operations",
+    "graphenestorage",
+    "sqlite3",
+]
+
+#: Repository root, the packages are imported from this checkout
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_script = """
+import sys, time
+sys.path.insert(0, {!r})
+start = time.perf_counter()
+{}
+elapsed = time.perf_counter() - start
+print(elapsed * 1000)
+print(",".join(name for name in {!r} if name in sys.modules))
+"""
+
+
+def measure(statement):
+    """Return the import time in ms and the heavy modules that were loaded."""
+    output = subprocess.check_output(
+        [sys.executable, "-c", _script.format(root, statement, heavy_modules)],
+        universal_newlines=True,
+    )
+    elapsed, loaded = output.splitlines()
+    return float(elapsed), [name for name in loaded.split(",") if name]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--limit", type=float, default=20.0)
+    args = parser.parse_args()
+
+    failures = []
+    print("{:<32} {:>10}  {}".format("", "ms", "heavy modules"))
+    for statement, lazy in statements:
+        results = [measure(statement) for _ in range(args.repeat)]
+        elapsed = statistics.median(result[0] for result in results)
+        loaded = results[0][1]
+        print("{:<32} {:>10.1f}  {}".format(statement, elapsed, ", ".join(loaded)))
+        if lazy and loaded:
+            failures.append("{} loads {}".format(statement, ", ".join(loaded)))
+        if lazy and elapsed > args.limit:
+            failures.append("{} takes {:.1f} ms".format(statement, elapsed))
+
+    if args.check and failures:
+        sys.exit("\n".join(failures))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of :meth:`deexapi.websocket.DeExWebsocket.process_notice`.
+
+Matches notices against a growing number of subscribed object ids. The cost per
+notice should stay flat.
+
+.. code-block:: bash
+
+    python benchmarks/process_notice.py
+"""
+
+import os
+import sys
+import timeit
+
+# Import the packages from this checkout, even if they are not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deexapi.websocket import DeExWebsocket
+
+
+def bench(subscriptions, number=100000):
+    objects = ["1.7.{}".format(i) for i in range(subscriptions)] + ["2.1.x"]
+    ws = DeExWebsocket("ws://localhost", objects=objects)
+    ws.on_object += lambda notice: None
+    notices = [
+        {"id": "1.7.{}".format(subscriptions - 1)},  # exact match
+        {"id": "2.1.0"},  # wildcard match
+        {"id": "1.2.0"},  # no match
+    ]
+    seconds = timeit.timeit(
+        lambda: [ws.process_notice(n) for n in notices], number=number
+    )
+    return seconds / (number * len(notices))
+
+
+if __name__ == "__main__":
+    for subscriptions in (10, 1000, 100000):
+        print(
+            "{:>7} subscribed objects: {:.3f} us/notice".format(
+                subscriptions, bench(subscriptions) * 1e6
+            )
+        )
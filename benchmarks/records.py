@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memory and construction time of the operations of ``tests/test_encoders.py``
+as operation objects, as dicts and as records of :mod:`deexbase.records`.
+The memory is the size that is allocated per operation while they are all
+kept alive, as measured with :mod:`tracemalloc`. Run it from the repository
+root:
+
+.. code-block:: bash
+
+    python benchmarks/records.py --count 2000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Import the packages from this checkout, even if they are not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deexbase.decoders import decode_operation
+from deexbase.encoders import encode_operation
+from deexbase.objects import Operation
+from deexbase.records import record_for
+from tests.test_encoders import test_operations
+
+
+def measure(make, count):
+    """Return the bytes per operation and the operations per second."""
+    make(test_operations[0])  # compile the classes and decoders
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = [make(op) for _ in range(count) for op in test_operations]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size / (count * len(test_operations)), len(test_operations) * count / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--prefix", default="DX")
+    args = parser.parse_args()
+
+    # Every operation is made from its own copy of the data, as it would be
+    # when it comes from the API
+    texts = [json.dumps(op) for op in test_operations]
+    raws = {id(op): encode_operation(op) for op in test_operations}
+    text = {id(op): texts[i] for i, op in enumerate(test_operations)}
+    cases = [
+        ("objects", lambda op: Operation(json.loads(text[id(op)]))),
+        ("dicts", lambda op: json.loads(text[id(op)])),
+        (
+            "records",
+            lambda op: record_for(op[0])(json.loads(text[id(op)])[1]),
+        ),
+        ("decoded dicts", lambda op: decode_operation(raws[id(op)], args.prefix)),
+        (
+            "decoded records",
+            lambda op: decode_operation(raws[id(op)], args.prefix, records=True),
+        ),
+    ]
+
+    print("{:<20} {:>12} {:>12}".format("", "bytes/op", "ops/s"))
+    for name, make in cases:
+        size, rate = measure(make, args.count)
+        print("{:<20} {:>12.0f} {:>12.0f}".format(name, size, rate))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Throughput of the notification path, replayed from a recorded stream.
+
+Record a stream from a node first, then replay it as often as needed:
+
+.. code-block:: bash
+
+    python benchmarks/replay.py record stream.jsonl.gz --url wss://node.deex.eu \\
+        --seconds 300 --objects 2.1.0 --accounts init0
+    python benchmarks/replay.py replay stream.jsonl.gz --objects 2.1.0 \\
+        --accounts init0
+
+Without an argument, a synthetic stream of block and object notices is
+replayed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+
+# Import the packages from this checkout, even if they are not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deexapi.recorder import StreamRecorder, StreamReplayer
+from deexapi.websocket import DeExWebsocket
+
+
+def notice(event, payload):
+    return json.dumps(
+        {
+            "method": "notice",
+            "params": [DeExWebsocket.__events__.index(event), payload],
+        }
+    )
+
+
+def synthesize(path, blocks=10000):
+    """Write a stream with a block notice and a batch of object notices per
+    block."""
+    with StreamRecorder(path) as recorder:
+        for num in range(blocks):
+            recorder.record(notice("on_block", ["{:08x}".format(num) + "0" * 32]))
+            recorder.record(
+                notice(
+                    "on_object",
+                    [
+                        [
+                            {"id": "2.1.0", "head_block_number": num},
+                            {"id": "2.6.{}".format(num % 50), "total_ops": num},
+                            {"id": "1.7.{}".format(num), "for_sale": num},
+                        ]
+                    ],
+                )
+            )
+
+
+def record(args):
+    ws = DeExWebsocket(
+        args.url, accounts=args.accounts, objects=args.objects, max_backfill=0
+    )
+    with StreamRecorder(args.file) as recorder:
+        recorder.attach(ws)
+        threading.Timer(args.seconds, ws.close).start()
+        ws.run_forever()
+    print("Recorded {} frames".format(recorder.frames))
+
+
+def replay(args):
+    replayer = StreamReplayer(args.file)
+    ws = DeExWebsocket(
+        "ws://localhost",
+        accounts=args.accounts,
+        objects=args.objects,
+        max_backfill=0,
+        coalesce_notices=args.coalesce,
+    )
+    ws.on_block += lambda block_id: None
+    ws.on_object += lambda notice: None
+    ws.on_account += lambda notice: None
+    stats = replayer.replay(ws.on_message, speed=args.speed)
+    print(
+        "{messages} messages in {seconds:.3f}s: {messages_per_sec:.0f} msgs/sec, "
+        "handler latency mean {mean:.1f}us p50 {p50:.1f}us p99 {p99:.1f}us "
+        "max {max:.1f}us".format(
+            mean=stats["latency_mean"] * 1e6,
+            p50=stats["latency_p50"] * 1e6,
+            p99=stats["latency_p99"] * 1e6,
+            max=stats["latency_max"] * 1e6,
+            **stats
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("mode", nargs="?", choices=["record", "replay"])
+    parser.add_argument("file", nargs="?")
+    parser.add_argument("--url", default="wss://node.deex.eu")
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--accounts", nargs="*", default=[])
+    parser.add_argument("--objects", nargs="*", default=["2.1.0", "2.6.x"])
+    parser.add_argument("--speed", type=float, default=None)
+    parser.add_argument("--coalesce", type=float, default=None)
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        record(args)
+    elif args.mode == "replay":
+        replay(args)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            args.file = os.path.join(tmp, "synthetic.jsonl.gz")
+            synthesize(args.file)
+            replay(args)
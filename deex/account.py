@@ -5,6 +5,7 @@ from graphenecommon.account import (
     Account as GrapheneAccount,
     AccountUpdate as GrapheneAccountUpdate,
 )
+from deexapi.deadline import with_deadline
 from deexbase import operations
 
 
@@ -20,6 +21,10 @@ class Account(GrapheneAccount):
     :param bool lazy: Use lazy loading
     :param bool full: Obtain all account data including orders, positions,
            etc.
+    :param float timeout: Give up loading after this many seconds, see
+           :func:`deexapi.deadline.deadline`
+    :param float deadline: Give up loading at this :func:`time.monotonic`
+           timestamp
     :returns: Account data
     :rtype: dictionary
     :raises deex.exceptions.AccountDoesNotExistsException: if account
@@ -40,11 +45,19 @@ class Account(GrapheneAccount):
               refreshed with ``Account.refresh()``.
     """
 
+    @with_deadline
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
     def define_classes(self):
         self.type_id = 2
         self.amount_class = Amount
         self.operations = operations
 
+    @with_deadline
+    def refresh(self):
+        super().refresh()
+
     @property
     def call_positions(self):
         """Alias for :func:deex.account.Account.callpositions."""
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from .deex import DeEx
+import importlib
 
 
 __all__ = [
@@ -20,3 +20,26 @@ __all__ = [
     "proposal",
     "message",
 ]
+
+#: Attributes that are imported on first access, see :func:`__getattr__`
+lazy_attributes = {"DeEx": "deex"}
+
+
+def __getattr__(name):
+    """Import :class:`deex.aio.deex.DeEx` and the submodules on first access,
+    which keeps ``import deex.aio`` cheap (PEP 562)."""
+    if name in lazy_attributes:
+        module = importlib.import_module("." + lazy_attributes[name], __name__)
+        value = globals()[name] = getattr(module, name)
+        return value
+    if name in __all__:
+        try:
+            return importlib.import_module("." + name, __name__)
+        except ModuleNotFoundError as e:
+            if e.name != __name__ + "." + name:
+                raise
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(lazy_attributes))
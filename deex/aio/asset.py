@@ -2,6 +2,7 @@
 import json
 from graphenecommon.aio.asset import Asset as GrapheneAsset
 
+from deexapi.deadline import with_deadline
 from deexbase import operations
 from deexbase.asset_permissions import (
     asset_permissions,
@@ -22,6 +23,7 @@ class Asset(GrapheneAsset, SyncAsset):
     Async version of :class:`deex.deex.Asset`
     """
 
+    @with_deadline
     async def __init__(self, *args, **kwargs):
         await super().__init__(*args, **kwargs)
 
@@ -33,6 +35,10 @@ class Asset(GrapheneAsset, SyncAsset):
         except Exception:
             self["description"] = self["options"]["description"]
 
+    @with_deadline
+    async def refresh(self):
+        await super().refresh()
+
     @property
     async def max_market_fee(self):
 
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from graphenecommon.aio.chain import AbstractGrapheneChain
 
 from deexapi.aio.deexnoderpc import DeExNodeRPC
+from deexapi.deadline import with_deadline
 from deexbase import operations
 from deexbase.account import PublicKey
 from deexbase.asset_permissions import asset_permissions, toint
@@ -59,6 +60,11 @@ class DeEx(AbstractGrapheneChain, SyncDeEx):
         self.transactionbuilder_class = TransactionBuilder
         self.blockchainobject_class = BlockchainObject
 
+    @with_deadline
+    async def finalizeOp(self, ops, account, permission, **kwargs):
+        """See :meth:`deex.deex.DeEx.finalizeOp`."""
+        return await super().finalizeOp(ops, account, permission, **kwargs)
+
     # -------------------------------------------------------------------------
     # Simple Transfer
     # -------------------------------------------------------------------------
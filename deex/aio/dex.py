@@ -43,17 +43,14 @@ class Dex(BlockchainInstance):
             10000000.0}, 'assert': {'fee': 20000.0},
             'committee_member_create': {'fee': 100000000.0}}
         """
-        from deexbase.operations import operations
+        from deexbase.operationids import operation_names
 
         r = {}
         obj, base = await self.blockchain.rpc.get_objects(["2.0.0", "1.3.0"])
         fees = obj["parameters"]["current_fees"]["parameters"]
         scale = float(obj["parameters"]["current_fees"]["scale"])
         for f in fees:
-            op_name = "unknown %d" % f[0]
-            for name in operations:
-                if operations[name] == f[0]:
-                    op_name = name
+            op_name = operation_names.get(f[0], "unknown %d" % f[0])
             fs = f[1]
             for _type in fs:
                 fs[_type] = float(fs[_type]) * scale / 1e4 / 10 ** base["precision"]
@@ -2,6 +2,7 @@
 from datetime import datetime, timedelta
 from asyncinit import asyncinit
 
+from deexapi.deadline import with_deadline
 from deexbase import operations
 
 from .account import Account
@@ -44,6 +45,15 @@ class Market(SyncMarket):
               :func:`deex.market.Market.sell` or
               :func:`deex.market.Market.buy`, you will sell/buy **only
               quote** and obtain/pay **only base**.
+
+    Methods that talk to the node take the keyword arguments ``timeout``
+    (seconds) and ``deadline`` (:func:`time.monotonic` timestamp) and raise
+    :class:`deex.exceptions.DeadlineExceeded` if they do not finish in time,
+    see :func:`deexapi.deadline.deadline`:
+
+    .. code-block:: python
+
+        orderbook = await market.orderbook(limit=25, timeout=0.15)
     """
 
     async def __init__(self, *args, **kwargs):
@@ -62,6 +72,7 @@ class Market(SyncMarket):
         else:
             raise ValueError("Unknown Market Format: %s" % str(args))
 
+    @with_deadline
     async def ticker(self):
         """
         Returns the ticker for all markets.
@@ -106,11 +117,17 @@ class Market(SyncMarket):
         if cer["base"]["asset_id"] == self["quote"]["id"]:
             data["core_exchange_rate"] = await data["core_exchange_rate"].invert()
 
+        # Fetch bitasset data and ticker in a single round trip
+        async with self.blockchain.rpc.batch() as batch:
+            if "bitasset_data_id" in self["quote"]:
+                bitasset = batch.get_object(self["quote"]["bitasset_data_id"])
+            elif "bitasset_data_id" in self["base"]:
+                bitasset = batch.get_object(self["base"]["bitasset_data_id"])
+            ticker = batch.get_ticker(self["base"]["id"], self["quote"]["id"])
+
         # smartcoin stuff
         if "bitasset_data_id" in self["quote"]:
-            bitasset = await self.blockchain.rpc.get_object(
-                self["quote"]["bitasset_data_id"]
-            )
+            bitasset = await bitasset
             backing_asset_id = bitasset["options"]["short_backing_asset"]
             if backing_asset_id == self["base"]["id"]:
                 sp = bitasset["current_feed"]["settlement_price"]
@@ -123,9 +140,7 @@ class Market(SyncMarket):
                     ].invert()
 
         elif "bitasset_data_id" in self["base"]:
-            bitasset = await self.blockchain.rpc.get_object(
-                self["base"]["bitasset_data_id"]
-            )
+            bitasset = await bitasset
             backing_asset_id = bitasset["options"]["short_backing_asset"]
             if backing_asset_id == self["quote"]["id"]:
                 data["baseSettlement_price"] = await Price(
@@ -133,9 +148,7 @@ class Market(SyncMarket):
                     blockchain_instance=self.blockchain,
                 )
 
-        ticker = await self.blockchain.rpc.get_ticker(
-            self["base"]["id"], self["quote"]["id"]
-        )
+        ticker = await ticker
         data["baseVolume"] = await Amount(
             ticker["base_volume"] or 0.0,
             self["base"],
@@ -168,6 +181,7 @@ class Market(SyncMarket):
 
         return data
 
+    @with_deadline
     async def volume24h(self):
         """
         Returns the 24-hour volume for all markets, plus totals for primary currencies.
@@ -195,6 +209,7 @@ class Market(SyncMarket):
             ),
         }
 
+    @with_deadline
     async def orderbook(self, limit=25):
         """
         Returns the order book for a given market. You may also specify "all" to get the
@@ -258,6 +273,7 @@ class Market(SyncMarket):
         data = {"asks": asks, "bids": bids}
         return data
 
+    @with_deadline
     async def get_limit_orders(self, limit=25):
         """
         Returns the list of limit orders for a given market.
@@ -348,6 +364,7 @@ class Market(SyncMarket):
                     return
                 sequence = order.get("sequence")
 
+    @with_deadline
     async def accounttrades(self, account=None, limit=25):
         """
         Returns your trade history for a given market, specified by the "currencyPair"
@@ -391,6 +408,7 @@ class Market(SyncMarket):
                 )
         return trades
 
+    @with_deadline
     async def accountopenorders(self, account=None):
         """
         Returns open Orders.
@@ -418,6 +436,7 @@ class Market(SyncMarket):
                 r.append(await Order(o, blockchain_instance=self.blockchain))
         return r
 
+    @with_deadline
     async def buy(
         self,
         price,
@@ -527,6 +546,7 @@ class Market(SyncMarket):
 
         return tx
 
+    @with_deadline
     async def sell(
         self,
         price,
@@ -620,6 +640,7 @@ class Market(SyncMarket):
 
         return tx
 
+    @with_deadline
     async def cancel(self, orderNumber, account=None, **kwargs):
         """
         Cancels an order you have placed in a given market. Requires only the
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import json
 
+from deexapi.deadline import with_deadline
 from deexbase import operations
 from deexbase.asset_permissions import (
     asset_permissions,
@@ -25,6 +26,10 @@ class Asset(GrapheneAsset):
     :param bool full: Also obtain bitasset-data and dynamic asset data
     :param deex.deex.DeEx blockchain_instance: DeEx
         instance
+    :param float timeout: Give up loading after this many seconds, see
+        :func:`deexapi.deadline.deadline`
+    :param float deadline: Give up loading at this :func:`time.monotonic`
+        timestamp
     :returns: All data of an asset
     :rtype: dict
 
@@ -36,6 +41,7 @@ class Asset(GrapheneAsset):
     def define_classes(self):
         self.type_id = 3
 
+    @with_deadline
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -47,6 +53,10 @@ class Asset(GrapheneAsset):
         except Exception:
             self["description"] = self["options"]["description"]
 
+    @with_deadline
+    def refresh(self):
+        super().refresh()
+
     @property
     def market_fee_percent(self):
         return self["options"]["market_fee_percent"] / 100 / 100
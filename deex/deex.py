@@ -5,7 +5,9 @@ from datetime import datetime, timedelta
 
 from graphenecommon.chain import AbstractGrapheneChain
 
+from deexapi.deadline import with_deadline
 from deexapi.deexnoderpc import DeExNodeRPC
+from deexapi.pool import DeExNodeRPCPool
 from deexbase import operations
 from deexbase.account import PublicKey
 from deexbase.asset_permissions import asset_permissions, toint
@@ -58,6 +60,9 @@ class DeEx(AbstractGrapheneChain):
         "irrversible")
     :param bool bundle: Do not broadcast transactions right away, but allow
         to bundle operations *(optional)*
+    :param int pool_size: Keep this many connections and spread the calls of
+        concurrent threads over them (see
+        :class:`deexapi.pool.DeExNodeRPCPool`) *(optional)*
 
     Three wallet operation modes are possible:
 
@@ -113,6 +118,13 @@ class DeEx(AbstractGrapheneChain):
     This class also deals with edits, votes and reading content.
     """
 
+    def connect(self, node="", rpcuser="", rpcpassword="", pool_size=None, **kwargs):
+        """Connect to blockchain network (internal use only)"""
+        if pool_size:
+            self.rpc_class = DeExNodeRPCPool
+            kwargs["pool_size"] = pool_size
+        super().connect(node=node, rpcuser=rpcuser, rpcpassword=rpcpassword, **kwargs)
+
     def define_classes(self):
         from .blockchainobject import BlockchainObject
 
@@ -124,6 +136,21 @@ class DeEx(AbstractGrapheneChain):
         self.transactionbuilder_class = TransactionBuilder
         self.blockchainobject_class = BlockchainObject
 
+    @with_deadline
+    def finalizeOp(self, ops, account, permission, **kwargs):
+        """
+        See :meth:`graphenecommon.chain.AbstractGrapheneChain.finalizeOp`.
+
+        :param float timeout: Give up after this many seconds, see
+            :func:`deexapi.deadline.deadline`
+        :param float deadline: Give up at this :func:`time.monotonic` timestamp
+
+        The deadline covers every call to the node, from looking up fees and
+        keys to broadcasting. The methods of this class that broadcast pass
+        ``timeout`` and ``deadline`` on to here.
+        """
+        return super().finalizeOp(ops, account, permission, **kwargs)
+
     # -------------------------------------------------------------------------
     # Simple Transfer
     # -------------------------------------------------------------------------
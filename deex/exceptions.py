@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from graphenestorage.exceptions import WrongMasterPasswordException
+from deexapi.exceptions import DeadlineExceeded
 from graphenecommon.exceptions import (
     AccountDoesNotExistsException,
     AssetDoesNotExistsException,
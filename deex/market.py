@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from datetime import datetime, timedelta
 
+from deexapi.deadline import with_deadline
 from deexbase import operations
 
 from .account import Account
@@ -41,6 +42,15 @@ class Market(dict):
               :func:`deex.market.Market.sell` or
               :func:`deex.market.Market.buy`, you will sell/buy **only
               quote** and obtain/pay **only base**.
+
+    Methods that talk to the node take the keyword arguments ``timeout``
+    (seconds) and ``deadline`` (:func:`time.monotonic` timestamp) and raise
+    :class:`deex.exceptions.DeadlineExceeded` if they do not finish in time,
+    see :func:`deexapi.deadline.deadline`:
+
+    .. code-block:: python
+
+        orderbook = market.orderbook(limit=25, timeout=0.15)
     """
 
     def __init__(self, *args, **kwargs):
@@ -83,6 +93,7 @@ class Market(dict):
                 and self["base"]["symbol"] == other["base"]["symbol"]
             )
 
+    @with_deadline
     def ticker(self):
         """
         Returns the ticker for all markets.
@@ -125,9 +136,17 @@ class Market(dict):
         if cer["base"]["asset_id"] == self["quote"]["id"]:
             data["core_exchange_rate"] = data["core_exchange_rate"].invert()
 
+        # Fetch bitasset data and ticker in a single round trip
+        with self.blockchain.rpc.batch() as batch:
+            if "bitasset_data_id" in self["quote"]:
+                bitasset = batch.get_object(self["quote"]["bitasset_data_id"])
+            elif "bitasset_data_id" in self["base"]:
+                bitasset = batch.get_object(self["base"]["bitasset_data_id"])
+            ticker = batch.get_ticker(self["base"]["id"], self["quote"]["id"])
+
         # smartcoin stuff
         if "bitasset_data_id" in self["quote"]:
-            bitasset = self.blockchain.rpc.get_object(self["quote"]["bitasset_data_id"])
+            bitasset = bitasset.result()
             backing_asset_id = bitasset["options"]["short_backing_asset"]
             if backing_asset_id == self["base"]["id"]:
                 sp = bitasset["current_feed"]["settlement_price"]
@@ -140,7 +159,7 @@ class Market(dict):
                     ].invert()
 
         elif "bitasset_data_id" in self["base"]:
-            bitasset = self.blockchain.rpc.get_object(self["base"]["bitasset_data_id"])
+            bitasset = bitasset.result()
             backing_asset_id = bitasset["options"]["short_backing_asset"]
             if backing_asset_id == self["quote"]["id"]:
                 data["baseSettlement_price"] = Price(
@@ -148,7 +167,7 @@ class Market(dict):
                     blockchain_instance=self.blockchain,
                 )
 
-        ticker = self.blockchain.rpc.get_ticker(self["base"]["id"], self["quote"]["id"])
+        ticker = ticker.result()
         data["baseVolume"] = Amount(
             ticker["base_volume"] or 0.0,
             self["base"],
@@ -181,6 +200,7 @@ class Market(dict):
 
         return data
 
+    @with_deadline
     def volume24h(self):
         """
         Returns the 24-hour volume for all markets, plus totals for primary currencies.
@@ -208,6 +228,7 @@ class Market(dict):
             ),
         }
 
+    @with_deadline
     def orderbook(self, limit=25):
         """
         Returns the order book for a given market. You may also specify "all" to get the
@@ -275,6 +296,7 @@ class Market(dict):
         data = {"asks": asks, "bids": bids}
         return data
 
+    @with_deadline
     def get_limit_orders(self, limit=25):
         """
         Returns the list of limit orders for a given market.
@@ -375,6 +397,7 @@ class Market(dict):
                     return
                 sequence = order.get("sequence")
 
+    @with_deadline
     def accounttrades(self, account=None, limit=25):
         """
         Returns your trade history for a given market, specified by the "currencyPair"
@@ -418,6 +441,7 @@ class Market(dict):
                 )
         return trades
 
+    @with_deadline
     def accountopenorders(self, account=None):
         """
         Returns open Orders.
@@ -445,6 +469,7 @@ class Market(dict):
                 r.append(Order(o, blockchain_instance=self.blockchain))
         return r
 
+    @with_deadline
     def buy(
         self,
         price,
@@ -552,6 +577,7 @@ class Market(dict):
 
         return tx
 
+    @with_deadline
     def sell(
         self,
         price,
@@ -643,6 +669,7 @@ class Market(dict):
 
         return tx
 
+    @with_deadline
     def cancel(self, orderNumber, account=None, **kwargs):
         """
         Cancels an order you have placed in a given market. Requires only the
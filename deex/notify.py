@@ -25,6 +25,19 @@ class Notify(Events, BlockchainInstance):
     :param fnt on_block: Callback that will be called for each block received
     :param fnt on_account: Callback that will be called for changes of the listed accounts
     :param fnt on_market: Callback that will be called for changes of the listed markets
+    :param int keep_alive: Seconds between two keepalive pings
+    :param str keepalive_mode: ``rpc`` or ``ping`` (see
+        :class:`deexapi.websocket.DeExWebsocket`)
+    :param float ping_timeout: Seconds to wait for a pong in ``ping`` mode
+    :param int dispatch_workers: Number of worker threads that call the
+        callbacks, ``0`` calls them from the websocket thread
+    :param int dispatch_queue_size: Maximum number of notifications waiting
+        for a worker
+    :param str dispatch_policy: ``block``, ``drop`` or ``coalesce`` (see
+        :class:`deexapi.dispatch.Dispatcher`)
+    :param float coalesce_notices: Only pass on the latest version of an
+        object or account per message (``0``) or per that many seconds, see
+        :class:`deexapi.websocket.DeExWebsocket`
     :param deex.deex.DeEx blockchain_instance: DeEx instance
 
     **Example**
@@ -59,6 +72,12 @@ class Notify(Events, BlockchainInstance):
         on_account=None,
         on_market=None,
         keep_alive=25,
+        keepalive_mode="rpc",
+        ping_timeout=10,
+        dispatch_workers=0,
+        dispatch_queue_size=1000,
+        dispatch_policy="block",
+        coalesce_notices=None,
         **kwargs
     ):
         # Events
@@ -94,8 +113,21 @@ class Notify(Events, BlockchainInstance):
             on_account=self.process_account,
             on_market=self.process_market,
             keep_alive=keep_alive,
+            keepalive_mode=keepalive_mode,
+            ping_timeout=ping_timeout,
+            dispatch_workers=dispatch_workers,
+            dispatch_queue_size=dispatch_queue_size,
+            dispatch_policy=dispatch_policy,
+            coalesce_notices=coalesce_notices,
+            # Share the node health statistics with the RPC connection
+            node_selector=getattr(self.blockchain.rpc, "nodes", None),
         )
 
+        # New blocks invalidate block-bound results cached by the RPC connection
+        cache = getattr(self.blockchain.rpc, "cache", None)
+        if cache is not None:
+            self.websocket.add_head_block_handler(cache.on_block)
+
     def get_market_ids(self, markets):
         # Markets
         market_ids = []
@@ -104,10 +136,18 @@ class Notify(Events, BlockchainInstance):
             market_ids.append([market["base"]["id"], market["quote"]["id"]])
         return market_ids
 
-    def reset_subscriptions(self, accounts=None, markets=None, objects=None):
-        """Change the subscriptions of a running Notify instance."""
+    def reset_subscriptions(
+        self, accounts=None, markets=None, objects=None, full=False
+    ):
+        """
+        Change the subscriptions of a running Notify instance.
+
+        Only added and removed accounts and markets are sent to the node, unless
+        ``full`` is set (see
+        :meth:`deexapi.websocket.DeExWebsocket.reset_subscriptions`).
+        """
         self.websocket.reset_subscriptions(
-            accounts, self.get_market_ids(markets or []), objects
+            accounts, self.get_market_ids(markets or []), objects, full=full
         )
 
     def close(self):
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+from ..batch import Batch as SyncBatch
+
+
+class Batch(SyncBatch):
+    """
+    Collect RPC calls and send them in a single round trip.
+
+    The calls are sent back to back and their replies awaited together, hence
+    the batch costs one round trip. Calls return an :class:`asyncio.Future`:
+
+    .. code-block:: python
+
+        async with rpc.batch() as batch:
+            props = batch.get_dynamic_global_properties()
+            ticker = batch.get_ticker("1.3.0", "1.3.121")
+        print(props.result(), await ticker)
+
+    See :class:`deexapi.batch.Batch`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.derived = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            await self.send()
+
+    def _create_future(self):
+        return asyncio.get_event_loop().create_future()
+
+    def _derive(self, future, func):
+        # Done callbacks of asyncio futures only run on a later iteration of
+        # the loop, derived futures are resolved by send() instead, so that
+        # they are done when leaving the context
+        new_future = self._create_future()
+        self.derived.append((future, func, new_future))
+        return new_future
+
+    async def execute(self):
+        """
+        Send the calls collected so far.
+
+        :returns: list of the results in the order of the calls
+        :raises: the error of the first failing call
+        """
+        return [future.result() for future in await self.send()]
+
+    async def send(self):
+        """
+        Send the calls collected so far and resolve their futures.
+
+        :returns: list of the futures in the order of the calls
+        """
+        calls, self.calls = self.calls, []
+        derived, self.derived = self.derived, []
+        results = await asyncio.gather(
+            *[
+                getattr(self.rpc, name)(*args, **kwargs)
+                for name, args, kwargs, _ in calls
+            ],
+            return_exceptions=True
+        )
+        for (_, _, _, future), result in zip(calls, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+        for future, func, new_future in derived:
+            if future.exception() is not None:
+                new_future.set_exception(future.exception())
+            else:
+                try:
+                    new_future.set_result(func(future.result()))
+                except Exception as e:
+                    new_future.set_exception(e)
+        return [future for _, _, _, future in calls]
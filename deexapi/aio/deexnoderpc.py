@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import time
+
+from grapheneapi.aio.api import Api as Aio_Api
+
+from deexbase.chains import known_chains
+
+from ..deexnoderpc import Api as Sync_Api
+from .. import deadline, exceptions
+from .batch import Batch
+from .loader import DataLoader
+from .scheduler import Scheduler
+from .singleflight import SingleFlight
+
+
+log = logging.getLogger(__name__)
+
+
+class Api(Aio_Api, Sync_Api):
+    """
+    Asyncio Api, see :class:`deexapi.deexnoderpc.Api`.
+
+    :param scheduler: Limit the calls in flight adaptively and send them by
+        priority, either ``True`` for the defaults, a dict of priority classes
+        by method name or a :class:`deexapi.aio.scheduler.Scheduler`
+    """
+
+    singleflight_class = SingleFlight
+
+    def __init__(self, *args, scheduler=None, **kwargs):
+        if scheduler is True:
+            scheduler = Scheduler()
+        elif isinstance(scheduler, dict):
+            scheduler = Scheduler(scheduler)
+        self.scheduler = scheduler if isinstance(scheduler, Scheduler) else None
+        super().__init__(*args, **kwargs)
+
+    async def find_next(self):
+        """Find the best node to connect to next."""
+        deadline.remaining()
+        if int(self.num_retries) < 0:  # pragma: no cover
+            self._cnt_retries += 1
+            if self.nodes.all_failing():
+                sleeptime = (
+                    (self._cnt_retries - 1) * 2 if self._cnt_retries < 10 else 10
+                )
+                if sleeptime:
+                    log.warning(
+                        "All nodes failed during rpcexec(): %s (%d/%d) "
+                        % (self.url, self._cnt_retries, self.num_retries)
+                        + "Retrying in %d seconds" % sleeptime
+                    )
+                    await asyncio.sleep(sleeptime)
+            return self.nodes.best(exclude=[self.url], urls=list(self._url_counter))
+        return Sync_Api.find_next(self)
+
+    def batch(self, mode=None):
+        """
+        Collect calls and send them in a single round trip.
+
+        .. code-block:: python
+
+            async with rpc.batch() as batch:
+                bitasset = batch.get_object("2.4.21")
+                ticker = batch.get_ticker("1.3.0", "1.3.121")
+            print(bitasset.result(), ticker.result())
+        """
+        return Batch(self, mode)
+
+    async def rebalance(self):
+        """Probe all nodes and reconnect if a better node than the current one is
+        available."""
+        ranked = await asyncio.get_event_loop().run_in_executor(
+            None, self.nodes.probe_all
+        )
+        if ranked[0] != self.url:
+            log.info("Switching from node {} to {}".format(self.url, ranked[0]))
+            await self.connection.disconnect()
+            self.url = ranked[0]
+            await self.connect()
+
+    def __getattr__(self, name):
+        func = super().__getattr__(name)
+
+        async def method(*args, **kwargs):
+            start, cnt_errors = time.monotonic(), self._cnt_errors
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                self._trace(name, args, None, start, cnt_errors, e)
+                raise
+            self._record_call(name, result, start, cnt_errors)
+            self._trace(name, args, result, start, cnt_errors)
+            return result
+
+        if self.scheduler is not None:
+            method = self._scheduled(name, method)
+        if name in self.singleflight:
+            method = self._collapse(name, method)
+        if self.cache is not None and name in self.cache:
+            method = self._cached(name, method)
+        return self._deadlined(name, method)
+
+    def _deadlined(self, name, method):
+        async def deadlined(*args, **kwargs):
+            return await self._within_deadline(name, method, *args, **kwargs)
+
+        return deadlined
+
+    async def _within_deadline(self, name, func, *args, **kwargs):
+        timeout = deadline.remaining()
+        if timeout is None:
+            return await func(*args, **kwargs)
+        try:
+            return await asyncio.wait_for(func(*args, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            raise exceptions.DeadlineExceeded(
+                "Deadline exceeded calling {}".format(name)
+            )
+
+    async def _load(self, loader, key):
+        # The batched lookup is shared by callers with different deadlines,
+        # each caller's deadline only applies to its own wait
+        return await self._within_deadline(
+            "{} lookup".format(loader), self.loaders[loader].load, key
+        )
+
+    def _scheduled(self, name, method):
+        async def scheduled(*args, **kwargs):
+            return await self.scheduler.call(name, method, *args, **kwargs)
+
+        return scheduled
+
+    def _cached(self, name, method):
+        async def cached(*args, **kwargs):
+            hit, result = self.cache.get(name, args, kwargs)
+            if not hit:
+                result = await method(*args, **kwargs)
+                self.cache.put(name, args, kwargs, result)
+            return result
+
+        return cached
+
+
+class DeExNodeRPC(Api):
+    """
+    Asyncio RPC connection to a DeEx node.
+
+    :param bool coalesce_lookups: Merge concurrent :meth:`get_object`,
+        :meth:`get_account` and :meth:`get_asset` calls into one
+        ``get_objects``, ``lookup_account_names`` or ``lookup_asset_symbols``
+        call (defaults to ``True``)
+    :param int lookup_batch_size: Maximum number of objects per merged call
+    :param float lookup_delay: Seconds to wait for more lookups before sending
+        a merged call, ``0`` merges the lookups of one event loop iteration
+
+    See :class:`deexapi.aio.loader.DataLoader`.
+    """
+
+    def __init__(
+        self,
+        *args,
+        coalesce_lookups=True,
+        lookup_batch_size=100,
+        lookup_delay=0,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.loaders = {}
+        if coalesce_lookups:
+            options = dict(max_batch_size=lookup_batch_size, flush_delay=lookup_delay)
+            self.loaders = dict(
+                objects=DataLoader(self.get_objects, **options),
+                accounts=DataLoader(self.lookup_account_names, **options),
+                assets=DataLoader(self.lookup_asset_symbols, **options),
+            )
+
+    def get_network(self):
+        """
+        Identify the connected network.
+
+        This call returns a dictionary with keys chain_id, core_symbol and prefix
+        """
+        # Rely on cached chain properties!
+        props = self.get_cached_chain_properties()
+        chain_id = props["chain_id"]
+        for _, v in known_chains.items():
+            if v["chain_id"] == chain_id:
+                return v
+        raise exceptions.UnknownNetworkException(
+            "Connecting to unknown network (chain_id: {})!".format(props["chain_id"])
+        )
+
+    async def get_account(self, name, **kwargs):
+        """
+        Get full account details from account name or id.
+
+        :param str name: Account name or account id
+        """
+        if len(name.split(".")) == 3:
+            return await self.get_object(name, **kwargs)
+        elif self.loaders and not kwargs:
+            return await self._load("accounts", name)
+        else:
+            return await self.get_account_by_name(name, **kwargs)
+
+    async def get_asset(self, name, **kwargs):
+        """
+        Get full asset from name of id.
+
+        :param str name: Symbol name or asset id (e.g. 1.3.0)
+        """
+        if len(name.split(".")) == 3:
+            return await self.get_object(name, **kwargs)
+        elif self.loaders and not kwargs:
+            return await self._load("assets", name)
+        else:
+            result = await self.lookup_asset_symbols([name], **kwargs)
+            return result[0]
+
+    async def get_object(self, o, **kwargs):
+        """
+        Get object with id ``o``
+
+        :param str o: Full object id
+        """
+        if self.loaders and not kwargs:
+            return await self._load("objects", o)
+        result = await self.get_objects([o], **kwargs)
+        return result[0]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import time
+
+from ..dispatch import Dispatcher as SyncDispatcher
+
+
+log = logging.getLogger(__name__)
+
+
+class Dispatcher(SyncDispatcher):
+    """
+    Bounded dispatch stage that calls event slots from a pool of asyncio tasks.
+
+    Takes the same arguments as :class:`deexapi.dispatch.Dispatcher`. Since
+    :meth:`submit` is called from within the event loop it never blocks. With the
+    ``block`` and ``coalesce`` policies, a full queue instead makes the reader
+    await :meth:`wait_for_space` before it reads the next frame from the socket.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tasks = []
+        self._ready = None
+        self._space = None
+
+    def submit(self, key, callback, *args, coalesce_key=None):
+        """
+        Submit ``callback(*args)`` for dispatching.
+
+        :param key: Ordering key, calls with the same key are dispatched in order
+        :param coalesce_key: Calls with the same key may be merged by the
+            ``coalesce`` policy
+        :returns: ``False`` if the call was dropped
+        """
+        if not self._running:
+            self.start()
+        index = self._lane_index(key)
+        lane = self._lanes[index]
+        queued = self._enqueue(lane, callback, args, coalesce_key)
+        if queued is None:
+            # Full, but we cannot block here: queue anyway and let the reader
+            # wait in wait_for_space()
+            lane.push(coalesce_key, callback, args, time.monotonic())
+            self._depth += 1
+            queued = True
+        if queued:
+            self._ready[index].set()
+        return queued
+
+    async def wait_for_space(self):
+        """Wait until the number of pending calls is below ``maxsize``."""
+        while self.maxsize and self._depth >= self.maxsize and self._running:
+            self._space.clear()
+            await self._space.wait()
+
+    def start(self):
+        """Start the worker tasks."""
+        if self._running:
+            return
+        self._running = True
+        self._ready = [asyncio.Event() for _ in self._lanes]
+        self._space = asyncio.Event()
+        self._tasks = [
+            asyncio.ensure_future(self._work(i)) for i in range(self.workers)
+        ]
+
+    async def stop(self, wait=True):
+        """Stop the workers once all pending calls have been dispatched."""
+        self._running = False
+        for ready in self._ready or []:
+            ready.set()
+        if self._space:
+            self._space.set()
+        if wait and self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _work(self, index):
+        lane = self._lanes[index]
+        ready = self._ready[index]
+        while True:
+            while not len(lane) and self._running:
+                ready.clear()
+                await ready.wait()
+            if not len(lane):
+                return
+            callback, args = self._dequeue(lane)
+            self._space.set()
+            self._call(callback, args)
+            # Let other tasks, in particular the reader, run
+            await asyncio.sleep(0)
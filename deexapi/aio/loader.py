@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+
+from ..deadline import no_deadline
+
+
+log = logging.getLogger(__name__)
+
+
+class DataLoader:
+    """
+    Coalesce concurrent single lookups into one batched call.
+
+    :param fetch: Coroutine function that takes a list of keys and returns the
+        values in the same order, e.g. ``rpc.get_objects``
+    :param int max_batch_size: Maximum number of keys per call, a full batch is
+        sent right away
+    :param float flush_delay: Seconds to wait for more keys before sending a
+        batch, ``0`` (default) sends everything requested within the same
+        event loop iteration
+
+    Keys that are already pending or in flight are not looked up again. If a
+    batched call fails, its keys are looked up one by one, hence a single bad
+    key does not fail the others.
+
+    .. code-block:: python
+
+        loader = DataLoader(rpc.get_objects)
+        a, b = await asyncio.gather(loader.load("1.2.0"), loader.load("1.3.0"))
+    """
+
+    def __init__(self, fetch, max_batch_size=100, flush_delay=0):
+        self.fetch = fetch
+        self.max_batch_size = max_batch_size
+        self.flush_delay = flush_delay
+        self.batches = 0
+        self.loads = 0
+        self._pending = {}
+        self._inflight = {}
+        self._handle = None
+
+    def load(self, key):
+        """Return a future that resolves to the value of ``key``.
+
+        The lookup is shared by all callers of the same key, every caller gets
+        its own future, hence cancelling one caller does not cancel the
+        others."""
+        self.loads += 1
+        future = self._pending.get(key) or self._inflight.get(key)
+        if future is None:
+            future = self._enqueue(key)
+        return asyncio.shield(future)
+
+    def _enqueue(self, key):
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        # Retrieve the error, the callers may all have been cancelled already
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending[key] = future
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._handle is None:
+            if self.flush_delay:
+                self._handle = loop.call_later(self.flush_delay, self.flush)
+            else:
+                self._handle = loop.call_soon(self.flush)
+        return future
+
+    def flush(self):
+        """Send the pending keys now."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            self.batches += 1
+            self._inflight.update(pending)
+            asyncio.ensure_future(self._dispatch(pending))
+
+    async def _dispatch(self, pending):
+        # The task copies the context of the caller that opened the batch, the
+        # batch is shared by all callers and must not inherit its deadline
+        try:
+            with no_deadline():
+                await self._fetch(pending)
+        finally:
+            for key, future in pending.items():
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    async def _fetch(self, pending):
+        keys = list(pending)
+        try:
+            values = await self.fetch(keys)
+        except Exception as e:
+            if len(keys) == 1:
+                if not pending[keys[0]].done():
+                    pending[keys[0]].set_exception(e)
+                return
+            log.debug("Batched lookup failed, looking up one by one: %s" % str(e))
+            await asyncio.gather(
+                *[self._fetch({key: future}) for key, future in pending.items()]
+            )
+            return
+        for key, value in zip(keys, values):
+            if not pending[key].done():
+                pending[key].set_result(value)
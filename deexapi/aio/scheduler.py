@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from collections import Counter
+
+from grapheneapi.exceptions import RPCError
+
+
+log = logging.getLogger(__name__)
+
+#: Priority classes, calls of a lower class are sent first
+PRIORITIES = {"critical": 0, "high": 1, "normal": 2, "bulk": 3}
+
+#: Priority class by method, other methods are ``normal``
+DEFAULT_PRIORITIES = {
+    "broadcast_transaction": "critical",
+    "broadcast_transaction_synchronous": "critical",
+    "broadcast_transaction_with_callback": "critical",
+    "get_required_fees": "high",
+    "get_required_signatures": "high",
+    "get_potential_signatures": "high",
+    "verify_authority": "high",
+    "get_account_history": "bulk",
+    "get_account_history_operations": "bulk",
+    "get_relative_account_history": "bulk",
+    "get_fill_order_history": "bulk",
+    "get_market_history": "bulk",
+    "get_trade_history": "bulk",
+    "get_trade_history_by_sequence": "bulk",
+}
+
+
+class Scheduler:
+    """
+    Limit the calls in flight to a node and send them by priority.
+
+    :param dict priorities: Priority class (see :data:`PRIORITIES`) by method
+        name, defaults to :data:`DEFAULT_PRIORITIES`
+    :param int initial_limit: Calls in flight to start with
+    :param int min_limit: Lower bound of the limit
+    :param int max_limit: Upper bound of the limit
+    :param float target_latency: Calls that take longer than this many seconds
+        count as congestion
+    :param float backoff: Factor the limit is multiplied with on congestion
+
+    The limit adapts to the node (additive increase, multiplicative
+    decrease): every call that comes back in time raises it by ``1 / limit``,
+    i.e. by about one per round trip, while a slow call or a connection error
+    cuts it by ``backoff``, at most once per round trip. Errors returned by the
+    node for a single call do not change the limit.
+
+    Waiting calls are sent by priority class, hence a broadcast goes ahead of
+    all waiting history reads:
+
+    .. code-block:: python
+
+        deex = DeEx(node, scheduler=True)
+        await deex.connect()
+        print(deex.rpc.scheduler.stats())
+    """
+
+    def __init__(
+        self,
+        priorities=None,
+        initial_limit=8,
+        min_limit=1,
+        max_limit=64,
+        target_latency=1.0,
+        backoff=0.5,
+    ):
+        self.priorities = dict(DEFAULT_PRIORITIES if priorities is None else priorities)
+        for priority in self.priorities.values():
+            if priority not in PRIORITIES:
+                raise ValueError("Unknown priority class {}".format(priority))
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.inflight = 0
+        self.calls = Counter()
+        self.waited = Counter()
+        self.decreases = 0
+        self._waiters = []
+        self._counter = itertools.count()
+        self._last_decrease = 0
+
+    def priority(self, name):
+        return PRIORITIES[self.priorities.get(name, "normal")]
+
+    async def acquire(self, priority=PRIORITIES["normal"]):
+        """Wait for a free slot, the caller must :meth:`release` it."""
+        if self.inflight < self.limit and not self._waiters:
+            self.inflight += 1
+            return
+        future = asyncio.get_event_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot has been handed over already
+                self.release()
+            raise
+
+    def release(self, latency=None, congested=False):
+        """Free a slot and adapt the limit to the outcome of the call."""
+        self.inflight -= 1
+        now = time.monotonic()
+        if congested or (latency is not None and latency > self.target_latency):
+            # Calls sent before the last decrease may still come back slow
+            if now - self._last_decrease > (latency or 0):
+                self._last_decrease = now
+                self.decreases += 1
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                log.debug("Lowering concurrency limit to {:.1f}".format(self.limit))
+        elif latency is not None:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.inflight < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.inflight += 1
+                future.set_result(None)
+
+    async def call(self, name, func, *args, **kwargs):
+        """Return ``await func(*args, **kwargs)`` once a slot is free."""
+        priority = self.priority(name)
+        self.calls[name] += 1
+        if self.inflight >= self.limit or self._waiters:
+            self.waited[name] += 1
+        await self.acquire(priority)
+        start = time.monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except RPCError:
+            self.release()
+            raise
+        except Exception:
+            self.release(time.monotonic() - start, congested=True)
+            raise
+        self.release(time.monotonic() - start)
+        return result
+
+    def stats(self):
+        return dict(
+            limit=self.limit,
+            inflight=self.inflight,
+            waiting=len(self._waiters),
+            decreases=self.decreases,
+            calls=dict(self.calls),
+            waited=dict(self.waited),
+        )
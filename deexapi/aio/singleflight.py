@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+from ..singleflight import SingleFlight as SyncSingleFlight
+
+
+class SingleFlight(SyncSingleFlight):
+    """
+    Share one request between identical calls that are in flight at the same
+    time, see :class:`deexapi.singleflight.SingleFlight`.
+    """
+
+    async def call(self, name, args, kwargs, func):
+        """Return ``await func(*args, **kwargs)``, or the result of an identical
+        call in flight."""
+        key = self.key(name, args, kwargs)
+        future = self._inflight.get(key)
+        while future is not None:
+            self.collapsed[name] += 1
+            try:
+                # A cancelled waiter must not cancel the shared request
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # The call that sent the request was cancelled, not this one, take
+            # over and send it again
+            self.collapsed[name] -= 1
+            future = self._inflight.get(key)
+        future = self._inflight[key] = asyncio.get_event_loop().create_future()
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting, avoid warnings about an unretrieved error
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
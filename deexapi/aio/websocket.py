@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import logging
+import traceback
+
+import websockets
+
+from ..exceptions import NumRetriesReached
+from .dispatch import Dispatcher
+from ..websocket import DeExWebsocket as SyncDeExWebsocket
+
+
+log = logging.getLogger(__name__)
+
+
+class DeExWebsocket(SyncDeExWebsocket):
+    """
+    Create an asyncio websocket connection and request push notifications.
+
+    This class takes the same arguments and offers the same event slots as
+    :class:`deexapi.websocket.DeExWebsocket`, but runs entirely on an asyncio event
+    loop. No threads are spawned, hence many instances can share a single loop:
+
+    .. code-block:: python
+
+        ws = DeExWebsocket(
+            "wss://node4p.deexnet.com/ws",
+            objects=["2.0.x", "2.1.x", "1.3.x"]
+        )
+        ws.on_object += print
+        await ws.run_forever()
+
+    Event slots are plain callables and are called from within the loop, they
+    should therefore not block.
+
+    RPC calls made on this instance are coroutines that resolve to the reply of
+    the node, e.g. ``await ws.get_objects(["2.1.0"])``.
+
+    With ``dispatch_workers`` set, event slots are called from worker tasks and
+    reading from the socket pauses while the dispatch queue is full.
+
+    With ``keepalive_mode="ping"``, the keepalive task sends websocket ping frames
+    and closes the connection if no pong arrives within ``ping_timeout`` seconds.
+    """
+
+    dispatcher_class = Dispatcher
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._keepalive_task = None
+
+    async def on_open(self, *args, **kwargs):
+        """
+        This method will be called once the websocket connection is established. It
+        will.
+
+        * login,
+        * register to the database api, and
+        * subscribe to the objects defined if there is a
+          callback/slot available for callbacks
+        """
+        await self.login(self.user, self.password, api_id=1)
+        await self.database(api_id=1)
+        await self._set_subscriptions()
+        if self._needs_backfill():
+            self._backfilling = True
+            asyncio.ensure_future(self._backfill())
+        if self.keepalive_mode == "ping":
+            self._keepalive_task = asyncio.ensure_future(self._ping_frames(self.ws))
+        else:
+            self._keepalive_task = asyncio.ensure_future(self._ping())
+
+    async def reset_subscriptions(
+        self, accounts=None, markets=None, objects=None, full=False
+    ):
+        """
+        Change the subscriptions of a running connection.
+
+        See :meth:`deexapi.websocket.DeExWebsocket.reset_subscriptions`.
+        """
+        if full:
+            self.subscription_accounts = accounts or []
+            self.subscription_markets = markets or []
+            self.subscription_objects = objects or []
+            calls = self._subscription_calls()
+        else:
+            calls = self._subscription_update_calls(
+                accounts or [], markets or [], objects or []
+            )
+        if self.ws:
+            await self._issue_subscription_calls(calls)
+
+    async def _set_subscriptions(self):
+        await self._issue_subscription_calls(self._subscription_calls())
+
+    async def _issue_subscription_calls(self, calls):
+        for name, args in calls:
+            result = await getattr(self, name)(*args)
+            if name == "get_full_accounts":
+                self._store_account_ids(result)
+
+    async def _backfill(self):
+        """Fetch all missed blocks at once and deliver them."""
+        blocks = []
+        try:
+            props = await self.get_dynamic_global_properties()
+            nums = self._backfill_range(props["head_block_number"])
+            blocks = await asyncio.gather(*[self.get_block(num) for num in nums])
+        except Exception as e:
+            log.warning("Backfilling blocks failed: {}".format(str(e)))
+        finally:
+            self._finish_backfill(blocks)
+
+    async def _ping(self):
+        # We keep the connection alive by requesting a short object
+        while not self.run_event.is_set():
+            await asyncio.sleep(self.keep_alive)
+            log.debug("Sending ping")
+            try:
+                await self.get_objects(["2.8.0"])
+            except Exception as e:
+                log.debug("Ping failed: %s" % str(e))
+                return
+
+    async def _ping_frames(self, ws):
+        """Keep the connection alive with ping frames and close it once a ping
+        is not answered in time."""
+        use_rpc = self.url in self.no_pong_urls
+        pong_seen = False
+        while not self.run_event.is_set():
+            await asyncio.sleep(self.keep_alive)
+            try:
+                if not use_rpc:
+                    log.debug("Sending ping frame")
+                    try:
+                        pong = await ws.ping()
+                        await asyncio.wait_for(pong, self.ping_timeout)
+                        pong_seen = True
+                        continue
+                    except asyncio.TimeoutError:
+                        if pong_seen:
+                            raise
+                        # The node may just not answer ping frames
+                        log.info("No pong from {}, trying an RPC ping".format(self.url))
+                        use_rpc = True
+                        self.no_pong_urls.add(self.url)
+                log.debug("Sending RPC ping")
+                await asyncio.wait_for(self.get_objects(["2.8.0"]), self.ping_timeout)
+            except asyncio.TimeoutError:
+                log.warning(
+                    "Keepalive timed out, connection to {} is dead".format(self.url)
+                )
+                await ws.close()
+                return
+            except Exception as e:
+                log.debug("Ping failed: %s" % str(e))
+                return
+
+    def _schedule_flush(self, delay):
+        return asyncio.get_event_loop().call_later(delay, self.flush_notices)
+
+    def _cancel_keepalive(self):
+        if self._keepalive_task and not self._keepalive_task.done():
+            self._keepalive_task.cancel()
+        self._keepalive_task = None
+
+    async def run_forever(self, *args, **kwargs):
+        """
+        This coroutine is used to run the websocket connection continuously.
+
+        It will execute callbacks as defined and try to stay connected with the provided
+        APIs
+        """
+        cnt = 0
+        while not self.run_event.is_set():
+            cnt += 1
+            self.url = self._next_url()
+            log.debug("Trying to connect to node %s" % self.url)
+            try:
+                options = dict(max_size=None)
+                if self.keepalive_mode == "ping":
+                    # Pings are sent by _ping_frames()
+                    options["ping_interval"] = None
+                async with websockets.connect(self.url, **options) as ws:
+                    self.ws = ws
+                    # Replies to the calls in on_open() are read by the listener
+                    listener = asyncio.ensure_future(self._listen(ws))
+                    try:
+                        await self.on_open()
+                        # We are connected, reset the retry counter
+                        cnt = 0
+                        await listener
+                    finally:
+                        listener.cancel()
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                # Connection errors as well as errors of on_open(), e.g. a
+                # failed login, which would fail again right away
+                self.on_error(e)
+                if self.run_event.is_set():
+                    break
+                if self.num_retries >= 0 and cnt > self.num_retries:
+                    raise NumRetriesReached()
+
+                sleeptime = (cnt - 1) * 2 if cnt < 10 else 10
+                if sleeptime and self._should_back_off():
+                    log.warning(
+                        "Lost connection to node during wsconnect(): %s (%d/%d) "
+                        % (self.url, cnt, self.num_retries)
+                        + "Retrying in %d seconds" % sleeptime
+                    )
+                    await asyncio.sleep(sleeptime)
+
+            finally:
+                self._cancel_keepalive()
+                self.ws = None
+                self.on_close()
+
+    async def _listen(self, ws):
+        try:
+            async for message in ws:
+                self.on_message(message)
+                if self.dispatcher:
+                    await self.dispatcher.wait_for_space()
+        finally:
+            self._fail_pending(IOError("Connection was closed before a reply arrived"))
+
+    async def close(self, *args, **kwargs):
+        """Closes the websocket connection and stops the keepalive task."""
+        self.run_event.set()
+        self._cancel_keepalive()
+        if self.ws:
+            await self.ws.close()
+        if self._flush_timer:
+            self._flush_timer.cancel()
+        self.flush_notices()
+        if self.dispatcher:
+            await self.dispatcher.stop()
+
+    """ RPC Calls
+    """
+
+    def _create_future(self):
+        return asyncio.get_event_loop().create_future()
+
+    async def rpcexec(self, payload):
+        """
+        Execute a call by sending the payload.
+
+        :param dict payload: Payload data
+        :returns: the result of the call
+        :raises RPCError: if the server returns an error
+        """
+        log.debug(json.dumps(payload))
+        future = self._register_request(payload["id"])
+        try:
+            await self.ws.send(json.dumps(payload, ensure_ascii=False))
+        except Exception:
+            with self._pending_lock:
+                self._pending.pop(payload["id"], None)
+                self._sent_at.pop(payload["id"], None)
+            raise
+        return await future
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+import logging
+
+from concurrent.futures import Future
+
+from grapheneapi.exceptions import RPCError
+from grapheneapi.websocket import Websocket
+
+
+log = logging.getLogger(__name__)
+
+#: How a batch is put on the wire
+MODES = ("array", "pipeline", "sequential")
+
+
+def derive(future, func, new_future):
+    """Resolve ``new_future`` with ``func(result)`` once ``future`` is done."""
+
+    def done(future):
+        if future.exception() is not None:
+            new_future.set_exception(future.exception())
+        else:
+            try:
+                new_future.set_result(func(future.result()))
+            except Exception as e:
+                new_future.set_exception(e)
+
+    future.add_done_callback(done)
+    return new_future
+
+
+class Batch:
+    """
+    Collect RPC calls and send them in a single round trip.
+
+    :param deexapi.deexnoderpc.Api rpc: The RPC connection
+    :param str mode: How to send the calls, one of
+
+        * ``array``: a single JSON-RPC batch array
+        * ``pipeline``: all requests back to back before reading the replies
+          (websocket only)
+        * ``sequential``: one call after the other
+
+        Defaults to ``pipeline`` for websockets and ``array`` for http. If the
+        node rejects batch arrays, ``pipeline`` (websocket) or ``sequential``
+        (http) is used from then on.
+
+    Calls on the batch return a :class:`concurrent.futures.Future` each, which
+    is resolved once the batch has been sent, i.e. when leaving the context:
+
+    .. code-block:: python
+
+        with rpc.batch() as batch:
+            props = batch.get_dynamic_global_properties()
+            ticker = batch.get_ticker("1.3.0", "1.3.121")
+        print(props.result(), ticker.result())
+
+    Errors returned by the node are raised by ``result()`` of the failing call
+    only. Connection errors lead to a reconnect and the whole batch is sent
+    again.
+    """
+
+    def __init__(self, rpc, mode=None):
+        if mode is not None and mode not in MODES:
+            raise ValueError("Unknown batch mode {}, use one of {}".format(mode, MODES))
+        self.rpc = rpc
+        self.mode = mode
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.send()
+
+    def __len__(self):
+        return len(self.calls)
+
+    def _create_future(self):
+        return Future()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            future = self._create_future()
+            self.calls.append((name, args, kwargs, future))
+            return future
+
+        return method
+
+    def get_account(self, name, **kwargs):
+        """See :meth:`deexapi.deexnoderpc.DeExNodeRPC.get_account`."""
+        if len(name.split(".")) == 3:
+            return self.get_object(name)
+        else:
+            return self.get_account_by_name(name, **kwargs)
+
+    def get_asset(self, name, **kwargs):
+        """See :meth:`deexapi.deexnoderpc.DeExNodeRPC.get_asset`."""
+        if len(name.split(".")) == 3:
+            return self.get_object(name, **kwargs)
+        else:
+            return self._derive(
+                self.lookup_asset_symbols([name], **kwargs), lambda x: x[0]
+            )
+
+    def get_object(self, o, **kwargs):
+        """See :meth:`deexapi.deexnoderpc.DeExNodeRPC.get_object`."""
+        return self._derive(self.get_objects([o], **kwargs), lambda x: x[0])
+
+    def _derive(self, future, func):
+        """Return a future that is resolved with ``func(result)`` of
+        ``future``."""
+        return derive(future, func, self._create_future())
+
+    def _payload(self, connection, name, args, kwargs):
+        if "api_id" in kwargs:
+            api_id = kwargs["api_id"]
+        elif "api" in kwargs:
+            api_id = connection.api_id.get(kwargs["api"]) or kwargs["api"]
+        else:
+            api_id = 0
+        return {
+            "method": "call",
+            "params": [api_id, name, list(args)],
+            "jsonrpc": "2.0",
+            "id": connection.get_request_id(),
+        }
+
+    def _resolve(self, calls, replies, start, cnt_errors):
+        for (name, args, _, future), reply in zip(calls, replies):
+            try:
+                try:
+                    result = self.rpc.connection.parse_response(reply)
+                except RPCError as e:
+                    self.rpc.post_process_exception(e)
+                    raise
+            except Exception as e:
+                self.rpc._trace(name, args, None, start, cnt_errors, e)
+                future.set_exception(e)
+                continue
+            self.rpc._record_call(name, result, start, cnt_errors)
+            self.rpc._trace(name, args, result, start, cnt_errors)
+            future.set_result(result)
+
+    def execute(self):
+        """
+        Send the calls collected so far.
+
+        :returns: list of the results in the order of the calls
+        :raises: the error of the first failing call
+        """
+        return [future.result() for future in self.send()]
+
+    def send(self):
+        """
+        Send the calls collected so far and resolve their futures.
+
+        :returns: list of the futures in the order of the calls
+        """
+        calls, self.calls = self.calls, []
+        if not calls:
+            return []
+        rpc = self.rpc
+        while True:
+            connection = rpc.connection
+            try:
+                start, cnt_errors = time.monotonic(), rpc._cnt_errors
+                payloads = [
+                    self._payload(connection, name, args, kwargs)
+                    for name, args, kwargs, _ in calls
+                ]
+                replies = self._send(connection, payloads)
+                rpc.reset_counter()
+                break
+            except KeyboardInterrupt:  # pragma: no cover
+                raise
+            except Exception as e:
+                log.warning(str(e))
+                log.warning("Reconnecting ...")
+                rpc.error_url()
+                rpc.next()
+        self._resolve(calls, replies, start, cnt_errors)
+        return [future for _, _, _, future in calls]
+
+    def _send(self, connection, payloads):
+        """Send all payloads and return the replies in the same order."""
+        is_websocket = isinstance(connection, Websocket)
+        mode = self.mode
+        if mode is None:
+            mode = "pipeline" if is_websocket else "array"
+        if mode == "array" and self.rpc._batch_arrays:
+            replies = json.loads(connection.rpcexec(payloads), strict=False)
+            if isinstance(replies, list):
+                return self._match(payloads, replies)
+            log.info("Node {} does not support batch arrays".format(self.rpc.url))
+            self.rpc._batch_arrays = False
+            # The node has not executed any of the calls
+            for payload in payloads:
+                payload["id"] = connection.get_request_id()
+        if mode != "sequential" and is_websocket:
+            return self._pipeline(connection, payloads)
+        return [connection.rpcexec(payload) for payload in payloads]
+
+    def _pipeline(self, connection, payloads):
+        # Websocket.rpcexec() holds the lock from sending a request until the
+        # reply has been read, we need to do the same for the whole batch
+        with connection.locked() as ws:
+            for payload in payloads:
+                ws.send(json.dumps(payload, ensure_ascii=False).encode("utf8"))
+            try:
+                replies = [json.loads(ws.recv(), strict=False) for _ in payloads]
+            except Exception:
+                # Replies that are still to come must not be read by later calls
+                connection.disconnect()
+                raise
+        return self._match(payloads, replies)
+
+    def _match(self, payloads, replies):
+        by_id = {reply.get("id"): reply for reply in replies}
+        try:
+            return [by_id[payload["id"]] for payload in payloads]
+        except KeyError:
+            raise ValueError("Node did not reply to every call of a batch")
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+import time
+
+from collections import Counter, OrderedDict
+
+from .nodehealth import BLOCK_INTERVAL
+
+
+#: Cache policies used by ``DeExNodeRPC(..., cache=True)``
+DEFAULT_POLICIES = {
+    "get_chain_properties": "immutable",
+    "get_config": "immutable",
+    "get_global_properties": 60,
+    "lookup_asset_symbols": 60,
+    "get_ticker": "block",
+    "get_order_book": "block",
+}
+
+
+class ResponseCache:
+    """
+    Cache RPC results per method.
+
+    :param dict policies: How long the results of a method stay valid, by
+        method name (defaults to :data:`DEFAULT_POLICIES`):
+
+        * ``"immutable"``: forever
+        * ``"block"``: until a new head block is seen, see
+          :meth:`new_head_block`, or ``block_ttl`` has passed
+        * a number: for that many seconds
+
+    :param int maxsize: Maximum number of cached results, the least recently
+        used result is evicted first
+    :param float block_ttl: Seconds after which ``"block"`` results expire,
+        even if no new head block has been reported
+
+    Results are shared between callers and must not be modified.
+
+    .. code-block:: python
+
+        rpc = DeExNodeRPC(urls, cache={"get_ticker": "block", "get_config": 600})
+        rpc.get_ticker("1.3.0", "1.3.121")
+        print(rpc.cache.stats())
+    """
+
+    def __init__(self, policies=None, maxsize=1000, block_ttl=BLOCK_INTERVAL):
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        for policy in self.policies.values():
+            if policy not in ("immutable", "block") and not isinstance(
+                policy, (int, float)
+            ):
+                raise ValueError("Unknown cache policy {}".format(policy))
+        self.maxsize = maxsize
+        self.block_ttl = block_ttl
+        self.head_block = None
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self.policies
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(name, args, kwargs):
+        return name, json.dumps([args, kwargs], sort_keys=True, default=str)
+
+    def _valid(self, policy, stored, block):
+        if policy == "immutable":
+            return True
+        age = time.monotonic() - stored
+        if policy == "block":
+            # Head blocks may be reported only now and then, e.g. from
+            # get_dynamic_global_properties, so block_ttl is an upper bound
+            return block == self.head_block and age < self.block_ttl
+        return age < policy
+
+    def get(self, name, args, kwargs):
+        """Return ``(True, result)`` for a valid cached result, else
+        ``(False, None)``."""
+        key = self.key(name, args, kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, stored, block = entry
+                if self._valid(self.policies[name], stored, block):
+                    self._entries.move_to_end(key)
+                    self.hits[name] += 1
+                    return True, result
+                del self._entries[key]
+            self.misses[name] += 1
+        return False, None
+
+    def put(self, name, args, kwargs, result):
+        key = self.key(name, args, kwargs)
+        with self._lock:
+            self._entries[key] = (result, time.monotonic(), self.head_block)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def new_head_block(self, block_num):
+        """Invalidate all ``"block"`` results once ``block_num`` is newer than
+        the last head block."""
+        with self._lock:
+            if self.head_block is None or block_num > self.head_block:
+                self.head_block = block_num
+
+    def on_block(self, block_id):
+        """Event slot for block notifications, e.g. ``ws.on_block +=
+        cache.on_block``."""
+        # The block number is encoded in the block id
+        self.new_head_block(int(block_id[:8], 16))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hits, misses and hit ratio per method, plus totals."""
+        methods = {}
+        for name in set(self.hits) | set(self.misses):
+            total = self.hits[name] + self.misses[name]
+            methods[name] = dict(
+                hits=self.hits[name],
+                misses=self.misses[name],
+                ratio=self.hits[name] / total,
+            )
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return dict(
+            size=len(self._entries),
+            maxsize=self.maxsize,
+            evictions=self.evictions,
+            hits=hits,
+            misses=misses,
+            ratio=hits / (hits + misses) if hits + misses else 0.0,
+            methods=methods,
+        )
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import functools
+import inspect
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .exceptions import DeadlineExceeded
+
+
+_deadline = ContextVar("deadline", default=None)
+
+
+def get_deadline():
+    """The :func:`time.monotonic` timestamp by which the calls of the current
+    context must be done, or ``None``."""
+    return _deadline.get()
+
+
+def expired():
+    at = _deadline.get()
+    return at is not None and time.monotonic() >= at
+
+
+def remaining():
+    """
+    Seconds left until the deadline, ``None`` without a deadline.
+
+    :raises deexapi.exceptions.DeadlineExceeded: if the deadline has passed
+    """
+    at = _deadline.get()
+    if at is None:
+        return None
+    left = at - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded by {:.3f}s".format(-left))
+    return left
+
+
+@contextmanager
+def deadline(timeout=None, at=None):
+    """
+    Have all RPC calls within the ``with`` block finish in time.
+
+    :param float timeout: Seconds from now
+    :param float at: :func:`time.monotonic` timestamp
+
+    Calls that are still running when the deadline passes are given up,
+    retries and reconnects stop, and
+    :class:`deexapi.exceptions.DeadlineExceeded` is raised. Nested deadlines
+    can only shorten the deadline. It applies to the current thread or asyncio
+    task and the tasks started from it.
+
+    .. code-block:: python
+
+        with deadline(0.15):
+            orderbook = market.orderbook()
+    """
+    if timeout is not None:
+        at = (
+            time.monotonic() + timeout
+            if at is None
+            else min(at, time.monotonic() + timeout)
+        )
+    current = _deadline.get()
+    if at is None or (current is not None and current <= at):
+        yield current
+        return
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def no_deadline():
+    """Run the ``with`` block without a deadline, e.g. work that is shared by
+    callers with different deadlines."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+# The keyword argument of with_deadline() shadows the name
+_within = deadline
+
+
+def with_deadline(func):
+    """Decorator that adds the keyword arguments ``timeout`` and ``deadline``
+    (see :func:`deadline`) to a function or coroutine function."""
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def wrapped(*args, timeout=None, deadline=None, **kwargs):
+            with _within(timeout, deadline):
+                return await func(*args, **kwargs)
+
+    else:
+
+        @functools.wraps(func)
+        def wrapped(*args, timeout=None, deadline=None, **kwargs):
+            with _within(timeout, deadline):
+                return func(*args, **kwargs)
+
+    return wrapped
@@ -1,13 +1,287 @@
 # -*- coding: utf-8 -*-
 import re
+import json
+import time
+import logging
+import threading
+
+from contextlib import contextmanager
+
+import websocket
 
 from deexbase.chains import known_chains
 from grapheneapi.api import Api as Original_Api
+from grapheneapi.exceptions import NumRetriesReached
+from grapheneapi.websocket import Websocket as Original_Websocket
+
+from . import deadline, exceptions
+from .batch import Batch
+from .cache import ResponseCache
+from .nodehealth import NodeSelector
+from .singleflight import SingleFlight
+from .tracer import Tracer
+
+
+log = logging.getLogger(__name__)
+
+#: Socket timeout in seconds without a deadline
+SOCKET_TIMEOUT = 30
+
+
+class Websocket(Original_Websocket):
+    """Websocket connection that limits the socket timeout of every call to
+    the deadline of the calling thread or task.
+
+    The timeout is set while the connection lock is held, hence calls of
+    other threads with other deadlines cannot change it during the call.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        #: Lock that is held from sending a request until its reply is read
+        self.lock = threading.Lock()
+
+    def apply_deadline(self):
+        """Limit the socket timeout to the time left until the deadline, to be
+        called with :attr:`lock` held."""
+        timeout = deadline.remaining()
+        self.ws.settimeout(SOCKET_TIMEOUT if timeout is None else timeout)
 
-from . import exceptions
+    @contextmanager
+    def locked(self):
+        """Hold :attr:`lock` on an open connection with the deadline applied
+        for the duration of the ``with`` block."""
+        while True:
+            if not self.ws:
+                # Not with the lock held, connect() logs in through rpcexec()
+                self.connect()
+            with self.lock:
+                # Another thread may have dropped the connection meanwhile
+                if self.ws:
+                    # Raises before sending if the deadline passed while
+                    # waiting for the lock, the connection stays usable for
+                    # the other threads
+                    self.apply_deadline()
+                    yield self.ws
+                    return
+
+    def rpcexec(self, payload):
+        with self.locked() as ws:
+            ws.send(json.dumps(payload, ensure_ascii=False).encode("utf8"))
+            try:
+                return ws.recv()
+            except websocket.WebSocketTimeoutException:
+                # The late reply must not be read by the next call
+                self.disconnect()
+                raise
 
 
 class Api(Original_Api):
+    """
+    Api with node health tracking.
+
+    :param NodeSelector node_selector: Share the health statistics of another
+        connection, e.g. ``DeExNodeRPC(urls, node_selector=rpc.nodes)``
+    :param callable node_scoring: Scoring policy for the nodes (see
+        :func:`deexapi.nodehealth.latency_score`)
+    :param bool probe_nodes: Probe all nodes before connecting and connect to
+        the best one
+    :param list singleflight: Methods for which identical calls in flight at
+        the same time share a single request (see
+        :class:`deexapi.singleflight.SingleFlight`)
+    :param cache: Cache results, either ``True`` for the default policies, a
+        dict of policies by method name or a
+        :class:`deexapi.cache.ResponseCache` (e.g. to share it)
+    :param int cache_size: Maximum number of cached results
+    :param callable on_head_block: Called with the head block number of every
+        ``get_dynamic_global_properties`` result
+    :param tracer: Record every call, either ``True`` or a
+        :class:`deexapi.tracer.Tracer` (e.g. to write to a file)
+
+    Round trip times, errors and head blocks of every call are recorded in
+    ``self.nodes``. If a node fails, the connection moves on to the best other
+    node right away, only once every node has failed there is a back-off.
+
+    Calls made within :func:`deexapi.deadline.deadline` wait for the reply no
+    longer than the deadline and do not retry once it has passed.
+    """
+
+    #: Set to ``False`` once the node has rejected a JSON-RPC batch array
+    _batch_arrays = True
+
+    singleflight_class = SingleFlight
+
+    def __init__(
+        self,
+        urls,
+        *args,
+        node_selector=None,
+        node_scoring=None,
+        probe_nodes=False,
+        singleflight=None,
+        cache=None,
+        cache_size=1000,
+        on_head_block=None,
+        tracer=None,
+        **kwargs
+    ):
+        if not isinstance(urls, list):
+            urls = [urls]
+        self.nodes = node_selector or NodeSelector(urls, scoring=node_scoring)
+        self._cnt_errors = 0
+        self.singleflight = self.singleflight_class(singleflight)
+        if cache is True:
+            cache = ResponseCache(maxsize=cache_size)
+        elif isinstance(cache, dict):
+            cache = ResponseCache(cache, maxsize=cache_size)
+        self.cache = cache if isinstance(cache, ResponseCache) else None
+        self.on_head_block = on_head_block
+        self.tracer = Tracer() if tracer is True else tracer
+        if probe_nodes:
+            urls = self.nodes.probe_all()
+        super().__init__(urls, *args, **kwargs)
+
+    def updated_connection(self):
+        if self.url[:2] == "ws":
+            return Websocket(self.url, **self._kwargs)
+        return super().updated_connection()
+
+    def error_url(self):
+        if deadline.expired():
+            # Not the node's fault
+            return
+        self._cnt_errors += 1
+        self.nodes.record_error(self.url)
+        super().error_url()
+
+    def next(self):
+        # Give up before dropping the connection once the deadline has passed,
+        # the calls of other threads may still use it
+        deadline.remaining()
+        super().next()
+
+    def find_next(self):
+        """Find the best node to connect to next."""
+        deadline.remaining()
+        if int(self.num_retries) < 0:  # pragma: no cover
+            self._cnt_retries += 1
+            if self.nodes.all_failing():
+                self._back_off()
+            return self.nodes.best(exclude=[self.url], urls=list(self._url_counter))
+
+        urls = [
+            k
+            for k, v in self._url_counter.items()
+            if (
+                # the counter for this host/endpoint should be smaller than
+                # num_retries
+                v <= self.num_retries
+                # let's not retry with the same URL *if* we have others
+                # available
+                and (k != self.url or len(self._url_counter) == 1)
+            )
+        ]
+        if not len(urls):
+            raise NumRetriesReached
+        return self.nodes.best(urls=urls)
+
+    def _back_off(self):
+        sleeptime = (self._cnt_retries - 1) * 2 if self._cnt_retries < 10 else 10
+        if sleeptime:
+            log.warning(
+                "All nodes failed during rpcexec(): %s (%d/%d) "
+                % (self.url, self._cnt_retries, self.num_retries)
+                + "Retrying in %d seconds" % sleeptime
+            )
+            time.sleep(sleeptime)
+
+    def _record_call(self, name, result, start, cnt_errors):
+        """Record the round trip time of a call that went through without a
+        reconnect."""
+        if name == "get_dynamic_global_properties" and isinstance(result, dict):
+            block_num = result["head_block_number"]
+            self.nodes.record_head_block(self.url, block_num)
+            if self.cache is not None:
+                self.cache.new_head_block(block_num)
+            if self.on_head_block is not None:
+                self.on_head_block(block_num)
+        if cnt_errors != self._cnt_errors:
+            return
+        self.nodes.record_success(self.url, time.monotonic() - start)
+
+    def _trace(self, name, args, result, start, cnt_errors, error=None):
+        if self.tracer is not None:
+            self.tracer.record(
+                name,
+                args,
+                result,
+                self.url,
+                time.monotonic() - start,
+                retries=self._cnt_errors - cnt_errors,
+                error=error,
+            )
+
+    def batch(self, mode=None):
+        """
+        Collect calls and send them in a single round trip.
+
+        :param str mode: ``array``, ``pipeline`` or ``sequential``, see
+            :class:`deexapi.batch.Batch`
+
+        .. code-block:: python
+
+            with rpc.batch() as batch:
+                bitasset = batch.get_object("2.4.21")
+                ticker = batch.get_ticker("1.3.0", "1.3.121")
+            print(bitasset.result(), ticker.result())
+        """
+        return Batch(self, mode)
+
+    def rebalance(self):
+        """Probe all nodes and reconnect if a better node than the current one is
+        available."""
+        best = self.nodes.probe_all()[0]
+        if best != self.url:
+            log.info("Switching from node {} to {}".format(self.url, best))
+            self.connection.disconnect()
+            self.url = best
+            self.connect()
+
+    def __getattr__(self, name):
+        func = super().__getattr__(name)
+
+        def method(*args, **kwargs):
+            start, cnt_errors = time.monotonic(), self._cnt_errors
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self._trace(name, args, None, start, cnt_errors, e)
+                raise
+            self._record_call(name, result, start, cnt_errors)
+            self._trace(name, args, result, start, cnt_errors)
+            return result
+
+        if name in self.singleflight:
+            method = self._collapse(name, method)
+        if self.cache is not None and name in self.cache:
+            method = self._cached(name, method)
+        return method
+
+    def _collapse(self, name, method):
+        return lambda *args, **kwargs: self.singleflight.call(
+            name, args, kwargs, method
+        )
+
+    def _cached(self, name, method):
+        def cached(*args, **kwargs):
+            hit, result = self.cache.get(name, args, kwargs)
+            if not hit:
+                result = method(*args, **kwargs)
+                self.cache.put(name, args, kwargs, result)
+            return result
+
+        return cached
+
     def post_process_exception(self, e):
         msg = exceptions.decodeRPCErrorMsg(e).strip()
         if msg == "missing required active authority":
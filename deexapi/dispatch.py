@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+import traceback
+
+from collections import deque
+
+
+log = logging.getLogger(__name__)
+
+#: What to do with a new call if the dispatch queue is full
+POLICIES = ("block", "drop", "coalesce")
+
+
+class DispatchLane:
+    """
+    FIFO of pending slot calls that is worked off by a single worker.
+
+    Entries are lists of ``[coalesce_key, callback, args, enqueued]``. Entries with
+    a ``coalesce_key`` are indexed so that a newer call for the same key can
+    replace the pending one in place.
+    """
+
+    def __init__(self):
+        self.entries = deque()
+        self.keyed = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, coalesce_key, callback, args, enqueued):
+        entry = [coalesce_key, callback, args, enqueued]
+        self.entries.append(entry)
+        if coalesce_key is not None:
+            self.keyed[coalesce_key] = entry
+
+    def coalesce(self, coalesce_key, callback, args):
+        """Replace the payload of a pending entry, returns ``False`` if there is
+        none."""
+        entry = self.keyed.get(coalesce_key)
+        if entry is None:
+            return False
+        entry[1] = callback
+        entry[2] = args
+        return True
+
+    def pop(self):
+        entry = self.entries.popleft()
+        if entry[0] is not None and self.keyed.get(entry[0]) is entry:
+            del self.keyed[entry[0]]
+        return entry
+
+
+class Dispatcher:
+    """
+    Bounded dispatch stage that calls event slots from a pool of worker threads.
+
+    :param int workers: Number of worker threads
+    :param int maxsize: Maximum number of pending calls over all workers
+    :param str policy: What to do if the queue is full, one of
+
+        * ``block``: wait until a worker has made space (default)
+        * ``drop``: discard the new call
+        * ``coalesce``: replace a pending call with the same ``coalesce_key``,
+          otherwise wait like ``block``
+
+    Calls submitted with the same ``key`` are always handled by the same worker
+    and hence in the order they have been submitted.
+
+    .. code-block:: python
+
+        dispatcher = Dispatcher(workers=4, maxsize=100, policy="drop")
+        dispatcher.submit("on_block", print, "0062f19d")
+        print(dispatcher.metrics())
+    """
+
+    def __init__(self, workers=1, maxsize=1000, policy="block"):
+        if policy not in POLICIES:
+            raise ValueError(
+                "Unknown dispatch policy {}, use one of {}".format(policy, POLICIES)
+            )
+        self.workers = max(int(workers), 1)
+        self.maxsize = maxsize
+        self.policy = policy
+        self._lanes = [DispatchLane() for _ in range(self.workers)]
+        self._depth = 0
+        self._running = False
+        self._threads = []
+
+        # Metrics
+        self.dispatched = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.avg_lag = 0.0
+
+        self._mutex = threading.Lock()
+        self._space = threading.Condition(self._mutex)
+        self._ready = [threading.Condition(self._mutex) for _ in self._lanes]
+
+    @property
+    def depth(self):
+        """Number of calls waiting to be dispatched."""
+        return self._depth
+
+    def metrics(self):
+        """
+        Return queue depth and lag metrics.
+
+        Lags are given in seconds and measure the time between submitting a call
+        and a worker picking it up.
+        """
+        return dict(
+            depth=self._depth,
+            maxsize=self.maxsize,
+            workers=self.workers,
+            dispatched=self.dispatched,
+            dropped=self.dropped,
+            coalesced=self.coalesced,
+            lag=self.lag,
+            max_lag=self.max_lag,
+            avg_lag=self.avg_lag,
+        )
+
+    def _lane_index(self, key):
+        return hash(key) % self.workers
+
+    def _enqueue(self, lane, callback, args, coalesce_key):
+        """
+        Put a call on ``lane`` if possible.
+
+        Returns ``True`` if the call was queued or coalesced, ``None`` if the queue
+        is full and ``False`` if the call was dropped.
+        """
+        if self.policy == "coalesce" and coalesce_key is not None:
+            if lane.coalesce(coalesce_key, callback, args):
+                self.coalesced += 1
+                return True
+        if self.maxsize and self._depth >= self.maxsize:
+            if self.policy == "drop":
+                self.dropped += 1
+                return False
+            return None
+        lane.push(coalesce_key, callback, args, time.monotonic())
+        self._depth += 1
+        return True
+
+    def _dequeue(self, lane):
+        coalesce_key, callback, args, enqueued = lane.pop()
+        self._depth -= 1
+        self.dispatched += 1
+        self.lag = time.monotonic() - enqueued
+        self.max_lag = max(self.max_lag, self.lag)
+        # Exponentially weighted moving average
+        self.avg_lag += (self.lag - self.avg_lag) * 0.1
+        return callback, args
+
+    def _call(self, callback, args):
+        try:
+            callback(*args)
+        except Exception as e:
+            log.critical(
+                "Error in {}: {}\n\n{}".format(callback, str(e), traceback.format_exc())
+            )
+
+    def submit(self, key, callback, *args, coalesce_key=None):
+        """
+        Submit ``callback(*args)`` for dispatching.
+
+        :param key: Ordering key, calls with the same key are dispatched in order
+        :param coalesce_key: Calls with the same key may be merged by the
+            ``coalesce`` policy
+        :returns: ``False`` if the call was dropped
+        """
+        if not self._running:
+            self.start()
+        index = self._lane_index(key)
+        with self._mutex:
+            while True:
+                queued = self._enqueue(self._lanes[index], callback, args, coalesce_key)
+                if queued is not None:
+                    break
+                self._space.wait()
+            self._ready[index].notify()
+        return queued
+
+    def start(self):
+        """Start the worker threads."""
+        with self._mutex:
+            if self._running:
+                return
+            self._running = True
+            self._threads = [
+                threading.Thread(target=self._work, args=(i,), daemon=True)
+                for i in range(self.workers)
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, wait=True):
+        """Stop the workers once all pending calls have been dispatched."""
+        with self._mutex:
+            self._running = False
+            for ready in self._ready:
+                ready.notify_all()
+        if wait:
+            current = threading.current_thread()
+            for thread in self._threads:
+                if thread is not current:
+                    thread.join()
+
+    def _work(self, index):
+        lane = self._lanes[index]
+        ready = self._ready[index]
+        while True:
+            with self._mutex:
+                while not len(lane) and self._running:
+                    ready.wait()
+                if not len(lane):
+                    return
+                callback, args = self._dequeue(lane)
+                self._space.notify()
+            self._call(callback, args)
@@ -54,3 +54,10 @@ class UnknownNetworkException(Exception):
     """Thrown when we don't recognize the chain id."""
 
     pass
+
+
+class DeadlineExceeded(Exception):
+    """Thrown when a call has not finished within its deadline, see
+    :func:`deexapi.deadline.deadline`."""
+
+    pass
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import threading
+
+from collections import Counter, deque
+
+#: Idempotent read methods that are hedged by ``hedge=True``
+DEFAULT_METHODS = ("get_objects", "get_order_book", "get_ticker", "get_account_history")
+
+
+class Hedger:
+    """
+    Decide when to hedge a call and keep track of hedges.
+
+    :param list methods: Methods to hedge (defaults to
+        :data:`DEFAULT_METHODS`), only idempotent reads must be hedged
+    :param float percentile: A second request is sent once the first one has
+        taken longer than this percentile of the recent latencies of the method
+    :param float initial_delay: Delay in seconds until enough latencies have
+        been observed
+    :param int window: Number of recent latencies per method to consider
+
+    ``stats()`` tells per method how many calls were made, how often a hedge
+    was sent (``fired``) and how often it answered first (``won``).
+    """
+
+    #: Latencies needed before the percentile is used
+    min_samples = 10
+
+    def __init__(self, methods=None, percentile=0.95, initial_delay=0.5, window=100):
+        self.methods = frozenset(DEFAULT_METHODS if methods is None else methods)
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.window = window
+        self.calls = Counter()
+        self.fired = Counter()
+        self.won = Counter()
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self.methods
+
+    def delay(self, name):
+        """Seconds to wait for the first request before hedging."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(name, ()))
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+        return latencies[min(int(len(latencies) * self.percentile), len(latencies) - 1)]
+
+    def record(self, name, latency):
+        """Record the time it took to get an answer."""
+        with self._lock:
+            self.calls[name] += 1
+            if name not in self._latencies:
+                self._latencies[name] = deque(maxlen=self.window)
+            self._latencies[name].append(latency)
+
+    def stats(self):
+        return {
+            name: dict(
+                calls=self.calls[name],
+                fired=self.fired[name],
+                won=self.won[name],
+                delay=self.delay(name),
+            )
+            for name in self.methods
+        }
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+
+from grapheneapi.http import Http
+from grapheneapi.websocket import Websocket
+
+
+log = logging.getLogger(__name__)
+
+#: Seconds between two blocks, used to weigh a lagging head block
+BLOCK_INTERVAL = 3
+
+
+class NodeStats:
+    """
+    Health statistics of a single node.
+
+    :param str url: Endpoint of the node
+
+    Round trip time and error rate are exponentially weighted moving averages,
+    hence recent observations count more than old ones.
+    """
+
+    #: Weight of a new observation in the moving averages
+    alpha = 0.3
+
+    def __init__(self, url):
+        self.url = url
+        self.rtt = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.head_block = None
+        self.last_error = None
+
+    def record_success(self, rtt=None):
+        self.calls += 1
+        self.consecutive_errors = 0
+        self.error_rate -= self.error_rate * self.alpha
+        if rtt is not None:
+            if self.rtt is None:
+                self.rtt = rtt
+            else:
+                self.rtt += (rtt - self.rtt) * self.alpha
+
+    def record_error(self):
+        self.calls += 1
+        self.errors += 1
+        self.consecutive_errors += 1
+        self.error_rate += (1.0 - self.error_rate) * self.alpha
+        self.last_error = time.monotonic()
+
+    def record_head_block(self, block_num):
+        if self.head_block is None or block_num > self.head_block:
+            self.head_block = block_num
+
+    def __repr__(self):
+        return "<NodeStats {} rtt={} error_rate={:.2f} head_block={}>".format(
+            self.url, self.rtt, self.error_rate, self.head_block
+        )
+
+
+def latency_score(stats, head_block):
+    """
+    Default scoring policy, lower scores are better.
+
+    The score is an estimate of the seconds a call takes: the round trip time,
+    inflated by the error rate, plus a penalty for every block the node lags
+    behind the best known head block and for every error in a row.
+
+    :param NodeStats stats: Statistics of the node to score
+    :param int head_block: Highest head block number seen on any node
+    """
+    # Nodes that have never been measured are assumed to be mediocre, so that
+    # they are tried once better nodes fail
+    rtt = stats.rtt if stats.rtt is not None else 1.0
+    score = rtt * (1.0 + 10.0 * stats.error_rate)
+    if head_block is not None and stats.head_block is not None:
+        score += (head_block - stats.head_block) * BLOCK_INTERVAL
+    score += stats.consecutive_errors * 10.0
+    return score
+
+
+class NodeSelector:
+    """
+    Track the health of a set of nodes and pick the best one.
+
+    :param list urls: Endpoints of the nodes
+    :param callable scoring: Scoring policy ``scoring(stats, head_block)`` that
+        returns a number, lower is better (defaults to :func:`latency_score`)
+    :param float probe_timeout: Timeout in seconds for :meth:`probe`
+
+    The same instance can be shared between RPC and websocket connections, e.g.
+    by passing it as ``node_selector`` to
+    :class:`deexapi.deexnoderpc.DeExNodeRPC` and
+    :class:`deexapi.websocket.DeExWebsocket`.
+
+    .. code-block:: python
+
+        nodes = NodeSelector(["wss://node1", "wss://node2"])
+        nodes.probe_all()
+        print(nodes.best(), nodes.ranked())
+    """
+
+    def __init__(self, urls, scoring=None, probe_timeout=5):
+        if not isinstance(urls, (list, tuple)):
+            urls = [urls]
+        self.urls = list(urls)
+        self.scoring = scoring or latency_score
+        self.probe_timeout = probe_timeout
+        self.stats = {url: NodeStats(url) for url in self.urls}
+        self._lock = threading.Lock()
+
+    def _stats(self, url):
+        if url not in self.stats:
+            self.urls.append(url)
+            self.stats[url] = NodeStats(url)
+        return self.stats[url]
+
+    @property
+    def head_block(self):
+        """Highest head block number seen on any node."""
+        blocks = [s.head_block for s in self.stats.values() if s.head_block]
+        return max(blocks) if blocks else None
+
+    def score(self, url):
+        return self.scoring(self._stats(url), self.head_block)
+
+    def ranked(self, urls=None):
+        """Return ``urls`` (defaults to all nodes) ordered from best to worst."""
+        head_block = self.head_block
+        with self._lock:
+            scores = {
+                url: self.scoring(self._stats(url), head_block)
+                for url in (urls or self.urls)
+            }
+        # sorted() is stable, ties keep the configured order
+        return sorted(scores, key=scores.get)
+
+    def best(self, exclude=None, urls=None):
+        """
+        Return the best node.
+
+        :param list exclude: Nodes to skip, unless there is no other node
+        :param list urls: Only consider these nodes
+        """
+        candidates = [u for u in (urls or self.urls) if u not in (exclude or [])]
+        return self.ranked(candidates or urls or self.urls)[0]
+
+    def all_failing(self):
+        """``True`` if the last call to every node has failed."""
+        return all(s.consecutive_errors for s in self.stats.values())
+
+    def record_success(self, url, rtt=None):
+        with self._lock:
+            self._stats(url).record_success(rtt)
+
+    def record_error(self, url):
+        with self._lock:
+            self._stats(url).record_error()
+
+    def record_head_block(self, url, block_num):
+        with self._lock:
+            self._stats(url).record_head_block(block_num)
+
+    def connection_class(self, url):
+        if url[:2] == "ws":
+            return Websocket
+        elif url[:4] == "http":
+            return Http
+        else:
+            raise ValueError("Only support http(s) and ws(s) connections!")
+
+    def probe(self, url):
+        """
+        Measure round trip time and head block of a node.
+
+        :returns: ``True`` if the node answered
+        """
+        try:
+            connection = self.connection_class(url)(url)
+            connection.connect()
+            try:
+                if hasattr(connection, "ws"):
+                    connection.ws.settimeout(self.probe_timeout)
+                start = time.monotonic()
+                props = connection.get_dynamic_global_properties()
+                rtt = time.monotonic() - start
+            finally:
+                connection.disconnect()
+        except Exception as e:
+            log.warning("Probing node {} failed: {}".format(url, str(e)))
+            self.record_error(url)
+            return False
+        self.record_success(url, rtt)
+        self.record_head_block(url, props["head_block_number"])
+        return True
+
+    def probe_all(self):
+        """Probe all nodes in parallel and return them ordered from best to
+        worst."""
+        threads = [
+            threading.Thread(target=self.probe, args=(url,)) for url in self.urls
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.ranked()
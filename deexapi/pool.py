@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import logging
+import queue
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+from .batch import Batch
+from . import deadline
+from .cache import ResponseCache
+from .deexnoderpc import DeExNodeRPC
+from .exceptions import DeadlineExceeded
+from .hedge import Hedger
+from .nodehealth import NodeSelector
+from .tracer import Tracer
+
+
+log = logging.getLogger(__name__)
+
+
+class PoolBatch(Batch):
+    """Batch that is sent over a single connection of the pool."""
+
+    def send(self):
+        pool = self.rpc
+        try:
+            with pool.checkout() as self.rpc:
+                return super().send()
+        finally:
+            self.rpc = pool
+
+
+class DeExNodeRPCPool(DeExNodeRPC):
+    """
+    Keep several RPC connections and spread calls over them.
+
+    :param list urls: Nodes to connect to
+    :param str user: Username for authentication
+    :param str password: Password for authentication
+    :param int pool_size: Number of connections
+    :param bool spread_nodes: Connect the n-th connection to the n-th node (in
+        a round robin), otherwise all connections go to the first node
+    :param list singleflight: See :class:`deexapi.deexnoderpc.Api`
+    :param cache: See :class:`deexapi.deexnoderpc.Api`
+    :param int cache_size: See :class:`deexapi.deexnoderpc.Api`
+    :param callable on_head_block: See :class:`deexapi.deexnoderpc.Api`
+    :param tracer: See :class:`deexapi.deexnoderpc.Api`
+    :param hedge: Hedge calls, either ``True`` for the default methods, a list
+        of methods or a :class:`deexapi.hedge.Hedger`
+
+    Further arguments are passed on to every
+    :class:`deexapi.deexnoderpc.DeExNodeRPC` connection of the pool. All
+    connections share the node health statistics, the cache, single flight
+    deduplication and the tracer.
+
+    Every call takes an idle connection for the time of the call, or waits
+    until one is available. Hence, up to ``pool_size`` threads can talk to the
+    nodes at the same time instead of waiting for a single socket:
+
+    .. code-block:: python
+
+        rpc = DeExNodeRPCPool(["wss://node1", "wss://node2"], pool_size=8)
+        with ThreadPoolExecutor(8) as executor:
+            accounts = executor.map(rpc.get_account, names)
+
+    Use ``DeEx(node, pool_size=8)`` to have a :class:`deex.deex.DeEx` instance
+    use a pool.
+
+    Hedged calls that take longer than usual are sent a second time over an
+    idle connection to another node, and the first answer wins:
+
+    .. code-block:: python
+
+        rpc = DeExNodeRPCPool(urls, pool_size=4, hedge=["get_order_book"])
+        rpc.get_order_book("1.3.0", "1.3.121", 50)
+        print(rpc.hedger.stats())
+    """
+
+    def __init__(
+        self,
+        urls,
+        user="",
+        password="",
+        *args,
+        pool_size=4,
+        spread_nodes=True,
+        node_selector=None,
+        node_scoring=None,
+        singleflight=None,
+        cache=None,
+        cache_size=1000,
+        on_head_block=None,
+        hedge=None,
+        tracer=None,
+        **kwargs
+    ):
+        if not isinstance(urls, list):
+            urls = [urls]
+        self.urls = urls
+        self.user = user
+        self.password = password
+        self.pool_size = max(int(pool_size), 1)
+        self.spread_nodes = spread_nodes
+        self.nodes = node_selector or NodeSelector(urls, scoring=node_scoring)
+        self._cnt_errors = 0
+        self.singleflight = self.singleflight_class(singleflight)
+        if cache is True:
+            cache = ResponseCache(maxsize=cache_size)
+        elif isinstance(cache, dict):
+            cache = ResponseCache(cache, maxsize=cache_size)
+        self.cache = cache if isinstance(cache, ResponseCache) else None
+        self.on_head_block = on_head_block
+        if hedge is True:
+            hedge = Hedger()
+        elif isinstance(hedge, (list, tuple, set, frozenset)):
+            hedge = Hedger(hedge)
+        self.hedger = hedge if isinstance(hedge, Hedger) else None
+        self.tracer = Tracer() if tracer is True else tracer
+
+        self.connections = []
+        for i in range(self.pool_size):
+            shift = i % len(urls) if spread_nodes else 0
+            self.connections.append(
+                DeExNodeRPC(
+                    urls[shift:] + urls[:shift],
+                    user,
+                    password,
+                    *args,
+                    node_selector=self.nodes,
+                    # The cache is applied by the pool, but the head blocks
+                    # are seen by the connections
+                    on_head_block=self._new_head_block,
+                    tracer=self.tracer,
+                    **kwargs
+                )
+            )
+        self._idle = queue.LifoQueue()
+        for connection in self.connections:
+            self._idle.put(connection)
+        self._network = self.connections[0].chain_params
+        self._executor = None
+        if self.hedger is not None:
+            self._executor = ThreadPoolExecutor(self.pool_size)
+
+    def _new_head_block(self, block_num):
+        if self.cache is not None:
+            self.cache.new_head_block(block_num)
+        if self.on_head_block is not None:
+            self.on_head_block(block_num)
+
+    def _get_idle(self):
+        try:
+            return self._idle.get(timeout=deadline.remaining())
+        except queue.Empty:
+            raise DeadlineExceeded("Deadline exceeded waiting for a connection")
+
+    @contextmanager
+    def checkout(self):
+        """Take an idle connection of the pool for the duration of the
+        ``with`` block."""
+        connection = self._get_idle()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    @property
+    def url(self):
+        return self.connections[0].url
+
+    @property
+    def connection(self):
+        """Connection of the first member, for compatibility with a single
+        :class:`deexapi.deexnoderpc.DeExNodeRPC`."""
+        return self.connections[0].connection
+
+    @property
+    def chain_params(self):
+        return self._network
+
+    def connect(self):
+        for connection in self.connections:
+            connection.connect()
+
+    def disconnect(self):
+        for connection in self.connections:
+            connection.connection.disconnect()
+
+    def rebalance(self):
+        """Probe all nodes and move the connections to the best ones.
+
+        Waits until every connection is idle.
+        """
+        ranked = self.nodes.probe_all()
+        idle = [self._idle.get() for _ in self.connections]
+        try:
+            for i, connection in enumerate(self.connections):
+                best = ranked[i % len(ranked)] if self.spread_nodes else ranked[0]
+                if best != connection.url:
+                    log.info(
+                        "Switching from node {} to {}".format(connection.url, best)
+                    )
+                    connection.connection.disconnect()
+                    connection.url = best
+                    connection.connect()
+        finally:
+            for connection in idle:
+                self._idle.put(connection)
+
+    def _checkout_other(self, url):
+        """Take an idle connection to another node than ``url``, or return
+        ``None``."""
+        taken, other = [], None
+        try:
+            while other is None:
+                connection = self._idle.get_nowait()
+                if connection.url != url:
+                    other = connection
+                else:
+                    taken.append(connection)
+        except queue.Empty:
+            pass
+        for connection in taken:
+            self._idle.put(connection)
+        return other
+
+    def _call(self, connection, name, args, kwargs):
+        try:
+            return getattr(connection, name)(*args, **kwargs)
+        finally:
+            self._idle.put(connection)
+
+    def _hedged(self, name):
+        def hedged(*args, **kwargs):
+            start = time.monotonic()
+            primary = self._get_idle()
+            # Calls run in other threads, which need the deadline
+            context = contextvars.copy_context()
+            futures = {
+                self._executor.submit(
+                    context.run, self._call, primary, name, args, kwargs
+                ): False
+            }
+            done, _ = wait(futures, timeout=self.hedger.delay(name))
+            if not done:
+                backup = self._checkout_other(primary.url)
+                if backup is not None:
+                    log.debug("Hedging {} on {}".format(name, backup.url))
+                    self.hedger.fired[name] += 1
+                    future = self._executor.submit(
+                        contextvars.copy_context().run,
+                        self._call,
+                        backup,
+                        name,
+                        args,
+                        kwargs,
+                    )
+                    futures[future] = True
+            pending, error = set(futures), None
+            while pending:
+                done, pending = wait(
+                    pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    raise DeadlineExceeded("Deadline exceeded calling {}".format(name))
+                for future in done:
+                    if future.exception() is None:
+                        if futures[future]:
+                            self.hedger.won[name] += 1
+                        self.hedger.record(name, time.monotonic() - start)
+                        return future.result()
+                    error = future.exception()
+            raise error
+
+        return hedged
+
+    def batch(self, mode=None):
+        """See :meth:`deexapi.deexnoderpc.Api.batch`."""
+        return PoolBatch(self, mode)
+
+    def _checked_out(self, name):
+        def method(*args, **kwargs):
+            with self.checkout() as connection:
+                return getattr(connection, name)(*args, **kwargs)
+
+        return method
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        if self.hedger is not None and name in self.hedger:
+            method = self._hedged(name)
+        else:
+            method = self._checked_out(name)
+        if name in self.singleflight:
+            method = self._collapse(name, method)
+        if self.cache is not None and name in self.cache:
+            method = self._cached(name, method)
+        return method
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import gzip
+import json
+import logging
+import time
+
+
+log = logging.getLogger(__name__)
+
+
+class StreamRecorder:
+    """
+    Record the raw frames a websocket connection receives.
+
+    :param str path: File to write to, compressed with gzip
+
+    Every frame is stored as one JSON line ``[seconds, frame]``, where
+    ``seconds`` is the time since the recorder was opened.
+
+    .. code-block:: python
+
+        ws = DeExWebsocket("wss://node.deex.eu", accounts=["init0"])
+        with StreamRecorder("init0.jsonl.gz") as recorder:
+            recorder.attach(ws)
+            ws.run_forever()
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.frames = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._start = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def record(self, frame):
+        """Append a single raw frame."""
+        if isinstance(frame, bytes):
+            frame = frame.decode("utf-8")
+        self._file.write(json.dumps([time.monotonic() - self._start, frame]))
+        self._file.write("\n")
+        self.frames += 1
+
+    def attach(self, ws):
+        """Record every frame ``ws`` receives before it is processed.
+
+        :param deexapi.websocket.DeExWebsocket ws: Websocket connection, sync or
+            aio
+        """
+        on_message = ws.on_message
+
+        def recording_on_message(reply, *args, **kwargs):
+            self.record(reply)
+            return on_message(reply, *args, **kwargs)
+
+        ws.on_message = recording_on_message
+
+    def close(self):
+        self._file.close()
+
+
+class StreamReplayer:
+    """
+    Replay frames recorded by :class:`StreamRecorder`.
+
+    :param str path: Recorded file
+
+    The frames are read into memory once, hence reading the file does not
+    count towards the measured throughput.
+
+    .. code-block:: python
+
+        ws = DeExWebsocket("ws://localhost", accounts=["init0"])
+        ws.on_account += print
+        stats = StreamReplayer("init0.jsonl.gz").replay(ws.on_message)
+        print(stats["messages_per_sec"])
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with gzip.open(path, "rt", encoding="utf-8") as fp:
+            self.frames = [tuple(json.loads(line)) for line in fp if line.strip()]
+
+    def __len__(self):
+        return len(self.frames)
+
+    def replay(self, on_message, speed=None):
+        """
+        Feed the recorded frames to ``on_message`` in order.
+
+        :param callable on_message: Receives each raw frame, usually
+            :meth:`deexapi.websocket.DeExWebsocket.on_message`
+        :param float speed: ``None`` (default) replays as fast as possible,
+            ``1.0`` at recorded speed, ``2.0`` twice as fast, and so on
+        :returns: Throughput and handler latency, see :func:`replay_stats`
+        """
+        latencies = []
+        start = time.monotonic()
+        for offset, frame in self.frames:
+            if speed:
+                delay = start + offset / speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            called = time.monotonic()
+            try:
+                on_message(frame)
+            except Exception as e:
+                log.warning("Replaying frame failed: {}".format(str(e)))
+            latencies.append(time.monotonic() - called)
+        return replay_stats(latencies, time.monotonic() - start)
+
+
+def replay_stats(latencies, seconds):
+    """
+    Summarize a replay.
+
+    :param list latencies: Seconds spent in the handler for every message
+    :param float seconds: Duration of the replay
+    :returns: dict with ``messages``, ``seconds``, ``messages_per_sec`` and the
+        mean, median, 99th percentile and maximum handler latency in seconds
+    """
+    ordered = sorted(latencies)
+    count = len(ordered)
+
+    def percentile(p):
+        return ordered[min(int(count * p), count - 1)] if count else 0.0
+
+    return dict(
+        messages=count,
+        seconds=seconds,
+        messages_per_sec=count / seconds if seconds else 0.0,
+        latency_mean=sum(ordered) / count if count else 0.0,
+        latency_p50=percentile(0.5),
+        latency_p99=percentile(0.99),
+        latency_max=ordered[-1] if count else 0.0,
+    )
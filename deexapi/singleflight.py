@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+
+from collections import Counter
+from concurrent.futures import Future, TimeoutError
+
+from . import deadline
+from .exceptions import DeadlineExceeded
+
+
+class SingleFlight:
+    """
+    Share one request between identical calls that are in flight at the same
+    time.
+
+    :param list methods: Names of the RPC methods to deduplicate
+
+    A call is identical if method name and arguments are equal. Only the first
+    call goes to the node, the others wait for it and receive the very same
+    result object, hence callers must not modify it. Errors are raised in every
+    waiting call, except for an exceeded deadline of the first call, after
+    which a waiting call with time left sends the request itself.
+    ``collapsed`` counts the calls per method that did not cause a request of
+    their own.
+
+    .. code-block:: python
+
+        rpc = DeExNodeRPC(urls, singleflight=["get_ticker", "get_objects"])
+        ...
+        print(rpc.singleflight.collapsed)
+    """
+
+    def __init__(self, methods=None):
+        self.methods = frozenset(methods or ())
+        self.collapsed = Counter()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self.methods
+
+    @staticmethod
+    def key(name, args, kwargs):
+        return name, json.dumps([args, kwargs], sort_keys=True, default=str)
+
+    def call(self, name, args, kwargs, func):
+        """Return ``func(*args, **kwargs)``, or the result of an identical call
+        in flight."""
+        key = self.key(name, args, kwargs)
+        while True:
+            with self._lock:
+                future = self._inflight.get(key)
+                if future is None:
+                    future = self._inflight[key] = Future()
+                    break
+                self.collapsed[name] += 1
+            try:
+                return future.result(timeout=deadline.remaining())
+            except TimeoutError:
+                raise DeadlineExceeded("Deadline exceeded waiting for {}".format(name))
+            except DeadlineExceeded:
+                # The deadline of the call that sent the request has passed,
+                # if ours has not, take over and send it again
+                deadline.remaining()
+                with self._lock:
+                    self.collapsed[name] -= 1
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            # Done before the waiting calls wake up, which may take over
+            self._finish(key)
+            future.set_exception(e)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key):
+        with self._lock:
+            del self._inflight[key]
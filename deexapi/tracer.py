@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+import bisect
+import json
+import sys
+import threading
+import time
+
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+#: Upper bounds of the latency histogram buckets in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float("inf"))
+
+#: Frames of these packages make up the span of a call
+SPAN_PACKAGES = ("deex.",)
+
+_spans = ContextVar("spans", default=())
+
+
+class Histogram:
+    """Latency histogram with fixed buckets, see :data:`BUCKETS`."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket that holds the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max  # pragma: no cover
+
+    def todict(self):
+        return dict(
+            count=self.count,
+            mean=self.sum / self.count if self.count else 0.0,
+            p50=self.quantile(0.5),
+            p99=self.quantile(0.99),
+            max=self.max,
+            buckets=OrderedDict(
+                (str(bound), count) for bound, count in zip(self.buckets, self.counts)
+            ),
+        )
+
+
+@contextmanager
+def span(name):
+    """Group the calls made within the ``with`` block under ``name``, in
+    addition to the spans taken from the calling ``deex`` methods."""
+    token = _spans.set(_spans.get() + (name,))
+    try:
+        yield
+    finally:
+        _spans.reset(token)
+
+
+def _qualname(frame):
+    """``Class.method`` for methods, else the function name (``co_qualname``
+    is not available before Python 3.11)."""
+    code = frame.f_code
+    if code.co_argcount and code.co_varnames[0] in ("self", "cls"):
+        owner = frame.f_locals.get(code.co_varnames[0])
+        if owner is not None:
+            if not isinstance(owner, type):
+                owner = type(owner)
+            return "{}.{}".format(owner.__name__, code.co_name)
+    return code.co_name
+
+
+def caller_spans(frame=None):
+    """Names of the ``deex`` methods on the stack, outermost first."""
+    frame = frame or sys._getframe(1)
+    spans = []
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        code = frame.f_code
+        if module.startswith(SPAN_PACKAGES) and (
+            code.co_name == "__init__" or not code.co_name.startswith("_")
+        ):
+            name = _qualname(frame)
+            if not spans or spans[-1] != name:
+                spans.append(name)
+        frame = frame.f_back
+    return _spans.get() + tuple(reversed(spans))
+
+
+class Tracer:
+    """
+    Record every RPC call and aggregate per method and per span.
+
+    :param str path: Append every call as a JSON line to this file
+    :param int keep: Number of recent calls to keep in :attr:`calls`
+
+    For every call the method, the size of the params and of the response in
+    bytes, the node, the latency, the number of retries and the span are
+    recorded. The span names the ``deex`` methods the call was made from,
+    e.g. ``("Market.ticker", "Asset.__init__")``, see also :func:`span`.
+
+    .. code-block:: python
+
+        deex = DeEx(node, tracer=True)
+        Market("USD:DEEX", blockchain_instance=deex).ticker()
+        print(deex.rpc.tracer.stats())
+    """
+
+    def __init__(self, path=None, keep=1000):
+        self.path = path
+        self.calls = deque(maxlen=keep)
+        self.methods = {}
+        self.spans = {}
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8") if path else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def size(data):
+        return len(json.dumps(data, default=str))
+
+    def record(self, method, params, result, node, latency, retries=0, error=None):
+        call = dict(
+            time=time.time(),
+            method=method,
+            params_bytes=self.size(params),
+            response_bytes=0 if error else self.size(result),
+            node=node,
+            latency=latency,
+            retries=retries,
+            error=repr(error) if error else None,
+            span=caller_spans(sys._getframe(1)),
+        )
+        with self._lock:
+            self.calls.append(call)
+            if method not in self.methods:
+                self.methods[method] = dict(
+                    latency=Histogram(),
+                    errors=0,
+                    retries=0,
+                    params_bytes=0,
+                    response_bytes=0,
+                )
+            stats = self.methods[method]
+            stats["latency"].add(latency)
+            stats["errors"] += bool(error)
+            stats["retries"] += retries
+            stats["params_bytes"] += call["params_bytes"]
+            stats["response_bytes"] += call["response_bytes"]
+            key = " > ".join(call["span"])
+            spans = self.spans.setdefault(key, {})
+            spans.setdefault(method, Histogram()).add(latency)
+            if self._file is not None:
+                self._file.write(json.dumps(call))
+                self._file.write("\n")
+                self._file.flush()
+        return call
+
+    def histogram(self, method):
+        """Latency :class:`Histogram` of ``method``, or ``None``."""
+        stats = self.methods.get(method)
+        return stats["latency"] if stats else None
+
+    def stats(self):
+        """Histograms and totals per method and call counts per span."""
+        with self._lock:
+            methods = {
+                method: dict(stats, latency=stats["latency"].todict())
+                for method, stats in self.methods.items()
+            }
+            spans = {
+                key: {
+                    method: dict(count=h.count, seconds=h.sum)
+                    for method, h in by_method.items()
+                }
+                for key, by_method in self.spans.items()
+            }
+        return dict(methods=methods, spans=spans)
+
+    def dump(self, path):
+        """Write :meth:`stats` to ``path`` as JSON."""
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump(self.stats(), fp, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.methods.clear()
+            self.spans.clear()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -1,15 +1,21 @@
 # -*- coding: utf-8 -*-
 import json
 import time
+import select
 import signal
 import logging
 import threading
 import websocket
 import traceback
 
+from concurrent.futures import Future
+from collections import OrderedDict
 from itertools import cycle
 from events import Events
+from grapheneapi.exceptions import RPCError
+from .dispatch import Dispatcher
 from .exceptions import NumRetriesReached
+from .nodehealth import NodeSelector
 
 # This restores the default Ctrl+C signal handler, which just kills the process
 signal.signal(signal.SIGINT, signal.SIG_DFL)
@@ -17,6 +23,99 @@ signal.signal(signal.SIGINT, signal.SIG_DFL)
 log = logging.getLogger(__name__)
 # logging.basicConfig(level=logging.DEBUG)
 
+#: Ways to keep the connection alive
+KEEPALIVE_MODES = ("rpc", "ping")
+
+
+class KeepaliveDispatcher:
+    """
+    Read from the socket and keep the connection alive from the same thread.
+
+    This is a dispatcher for :meth:`websocket.WebSocketApp.run_forever`. Every
+    ``interval`` seconds it sends a websocket ping frame, and considers the
+    connection dead if no pong arrives within ``timeout`` seconds.
+
+    If a node never answers a ping, it is asked for a small object instead. If
+    that reply arrives in time, the node is alive but ignores ping frames. The
+    dispatcher then switches to such RPC pings for the rest of the connection,
+    and so does every later connection to that node.
+
+    :param DeExWebsocket client: The websocket client
+    :param websocket.WebSocketApp app: The running app
+    :param float interval: Seconds between two pings
+    :param float timeout: Seconds to wait for an answer
+    """
+
+    def __init__(self, client, app, interval, timeout):
+        self.client = client
+        self.app = app
+        self.interval = interval
+        self.timeout = timeout
+        self.use_rpc = client.url in client.no_pong_urls
+        self.pong_seen = False
+        self.sent_at = None
+        self.next_ping = time.monotonic() + interval
+        self._pongs = None
+        self._future = None
+
+    def read(self, sock, read_callback, check_callback):
+        while self.app.keep_running:
+            if hasattr(sock, "pending") and sock.pending():
+                readable = True
+            else:
+                readable, _, _ = select.select((sock,), (), (), self._wait())
+            if readable and not read_callback():
+                break
+            self.check()
+            check_callback()
+
+    def _wait(self):
+        now = time.monotonic()
+        if self.sent_at is not None:
+            return max(self.sent_at + self.timeout - now, 0)
+        return max(self.next_ping - now, 0)
+
+    def _answered(self):
+        if self.use_rpc:
+            return self._future.done()
+        if self.app.last_pong_tm != self._pongs:
+            self.pong_seen = True
+            return True
+        return False
+
+    def send(self, now):
+        self.sent_at = now
+        self.next_ping = now + self.interval
+        if self.use_rpc:
+            log.debug("Sending RPC ping")
+            self._future = self.client.get_objects(["2.8.0"])
+        else:
+            log.debug("Sending ping frame")
+            self._pongs = self.app.last_pong_tm
+            self.app.sock.ping()
+
+    def check(self):
+        """Send a ping if due and raise if the last one has not been answered
+        in time."""
+        now = time.monotonic()
+        if self.sent_at is not None:
+            if self._answered():
+                self.sent_at = None
+            elif now - self.sent_at > self.timeout:
+                if self.use_rpc or self.pong_seen:
+                    raise websocket.WebSocketTimeoutException(
+                        "Keepalive timed out, connection to {} is dead".format(
+                            self.client.url
+                        )
+                    )
+                # The node may just not answer ping frames, ask it via RPC
+                log.info("No pong from {}, trying an RPC ping".format(self.client.url))
+                self.use_rpc = True
+                self.client.no_pong_urls.add(self.client.url)
+                self.send(now)
+        if self.sent_at is None and now >= self.next_ping:
+            self.send(now)
+
 
 class DeExWebsocket(Events):
     """
@@ -29,6 +128,28 @@ class DeExWebsocket(Events):
     :param list markets: list of asset_ids, e.g. ``[['1.3.0', '1.3.121']]``
     :param list objects: list of objects id's you'd like to be notified when changing
     :param int keep_alive: seconds between a ping to the backend (defaults to 25seconds)
+    :param str keepalive_mode: ``rpc`` (default) requests a small object from a
+        separate thread, ``ping`` sends websocket ping frames from the reading
+        thread and detects dead connections (see :class:`KeepaliveDispatcher`)
+    :param float ping_timeout: seconds to wait for an answer to a ping in
+        ``ping`` mode (defaults to 10 seconds)
+    :param int dispatch_workers: number of workers that call the event slots, ``0``
+        (default) calls them inline while reading from the socket
+    :param int dispatch_queue_size: maximum number of notifications waiting for a
+        worker
+    :param str dispatch_policy: ``block``, ``drop`` or ``coalesce``, see
+        :class:`deexapi.dispatch.Dispatcher`
+    :param deexapi.nodehealth.NodeSelector node_selector: share node health
+        statistics with other connections
+    :param callable node_scoring: scoring policy for the nodes
+    :param int max_backfill: maximum number of blocks that are fetched after a
+        reconnect to close the gap in ``on_block`` (defaults to 1000, ``0``
+        disables backfilling)
+    :param float coalesce_notices: if set, object notices are coalesced so that
+        only the latest version of every object id reaches ``on_object`` and
+        ``on_account``. ``0`` coalesces the notices of a single message, a
+        positive number the notices received within that many seconds.
+        Defaults to ``None``, which delivers every notice.
 
     After instanciating this class, you can add event slots for:
 
@@ -92,10 +213,34 @@ class DeExWebsocket(Events):
         .. code-block:: js
 
             ['1.7.68612']
+
+    After a reconnect, blocks missed in the meantime are fetched with
+    ``get_block`` and delivered to ``on_block`` before any new block, hence
+    ``on_block`` sees every block id exactly once and in order. Market
+    notifications cannot be recovered this way.
+
+    RPC calls made through this instance share the notification socket. They
+    return a :class:`concurrent.futures.Future` that is resolved once the node
+    replies:
+
+    .. code-block:: python
+
+        future = ws.get_objects(["2.1.0"])
+        print(future.result(timeout=10))
+
+    Replies are read by the thread that runs :meth:`run_forever`, hence, never
+    block on a future from within an inline event slot.
+
+    With ``dispatch_workers`` set, a slow event slot no longer stalls reading from
+    the socket. Notifications for the same event (and, for ``on_object`` and
+    ``on_account``, the same object id) are still delivered in order. Queue depth
+    and lag are available from ``ws.dispatcher.metrics()``.
     """
 
     __events__ = ["on_tx", "on_object", "on_block", "on_account", "on_market"]
 
+    dispatcher_class = Dispatcher
+
     def __init__(
         self,
         urls,
@@ -111,29 +256,83 @@ class DeExWebsocket(Events):
         on_account=None,
         on_market=None,
         keep_alive=25,
+        keepalive_mode="rpc",
+        ping_timeout=10,
         num_retries=-1,
+        dispatch_workers=0,
+        dispatch_queue_size=1000,
+        dispatch_policy="block",
+        node_selector=None,
+        node_scoring=None,
+        max_backfill=1000,
+        coalesce_notices=None,
         **kwargs
     ):
 
         self.num_retries = num_retries
         self.keepalive = None
         self._request_id = 0
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._sent_at = {}
+
+        # Last block delivered to on_block and blocks received while backfilling
+        self.max_backfill = max_backfill
+        self._head_block_handlers = []
+        self._last_block_num = None
+        self._backfilling = False
+        self._buffered_blocks = []
+
+        # Object notices waiting to be coalesced, by object id
+        self.coalesce_notices = coalesce_notices
+        self.coalesced_notices = 0
+        self._notices = OrderedDict()
+        self._notices_lock = threading.Lock()
+        self._flush_timer = None
         self.ws = None
         self.user = user
         self.password = password
         self.keep_alive = keep_alive
+        if keepalive_mode not in KEEPALIVE_MODES:
+            raise ValueError(
+                "Unknown keepalive mode {}, use one of {}".format(
+                    keepalive_mode, KEEPALIVE_MODES
+                )
+            )
+        self.keepalive_mode = keepalive_mode
+        self.ping_timeout = ping_timeout
+        # Nodes that do not answer websocket ping frames
+        self.no_pong_urls = set()
         self.run_event = threading.Event()
+        self.dispatcher = None
+        if dispatch_workers:
+            self.dispatcher = self.dispatcher_class(
+                workers=dispatch_workers,
+                maxsize=dispatch_queue_size,
+                policy=dispatch_policy,
+            )
+        self.url = None
+        self.nodes = node_selector
         if isinstance(urls, cycle):
             self.urls = urls
-        elif isinstance(urls, list):
-            self.urls = cycle(urls)
         else:
-            self.urls = cycle([urls])
+            if not isinstance(urls, list):
+                urls = [urls]
+            self.urls = cycle(urls)
+            if self.nodes is None:
+                self.nodes = NodeSelector(urls, scoring=node_scoring)
 
         # Instanciate Events
         Events.__init__(self)
         self.events = Events()
 
+        # What the node currently sends us notifications for
+        self._node_accounts = set()
+        self._node_markets = set()
+        self._object_callback = False
+        self._muted_accounts = set()
+        self._account_ids = {}
+
         # Store the objects we are interested in
         self.subscription_accounts = accounts or []
         self.subscription_markets = markets or []
@@ -150,6 +349,31 @@ class DeExWebsocket(Events):
         if on_market:
             self.on_market += on_market
 
+    @property
+    def subscription_objects(self):
+        return self._subscription_objects
+
+    @subscription_objects.setter
+    def subscription_objects(self, objects):
+        """Store the subscribed objects and rebuild the indices used by
+        :meth:`process_notice`.
+
+        Exact object ids end up in a hash set, wildcards like ``1.3.x`` are
+        indexed by their space and type ``1.3``. Hence, matching a notice costs
+        the same no matter how many objects are subscribed.
+        """
+        self._subscription_objects = objects
+        exact = set()
+        spaces = set()
+        for id in objects:
+            space_type, _, instance = id.rpartition(".")
+            if instance == "x":
+                spaces.add(space_type)
+            else:
+                exact.add(id)
+        self._subscribed_ids = frozenset(exact)
+        self._subscribed_spaces = frozenset(spaces)
+
     def cancel_subscriptions(self):
         self.cancel_all_subscriptions()
 
@@ -166,42 +390,252 @@ class DeExWebsocket(Events):
         self.login(self.user, self.password, api_id=1)
         self.database(api_id=1)
         self.__set_subscriptions()
-        self.keepalive = threading.Thread(target=self._ping)
-        self.keepalive.start()
-
-    def reset_subscriptions(self, accounts=None, markets=None, objects=None):
-        self.subscription_accounts = accounts or []
-        self.subscription_markets = markets or []
-        self.subscription_objects = objects or []
-        self.__set_subscriptions()
+        if self._needs_backfill():
+            self._backfilling = True
+            future = self.get_dynamic_global_properties()
+            future.add_done_callback(self._request_backfill)
+        if self.keepalive_mode == "rpc":
+            self.keepalive = threading.Thread(target=self._ping)
+            self.keepalive.start()
+
+    def reset_subscriptions(
+        self, accounts=None, markets=None, objects=None, full=False
+    ):
+        """
+        Change the subscriptions of a running connection.
+
+        Only the difference to the current subscriptions is sent to the node.
+        Added markets are subscribed and removed markets are unsubscribed. Added
+        accounts are subscribed with ``get_full_accounts``. The node does not
+        allow to unsubscribe a single account, hence, notifications for removed
+        accounts are dropped locally until the next reconnect. Objects are
+        matched locally and need no calls at all.
+
+        :param list accounts: account names or ids
+        :param list markets: list of asset id pairs
+        :param list objects: object ids
+        :param bool full: cancel all subscriptions and subscribe to everything
+            again, as done on connect
+        """
+        if full:
+            self.subscription_accounts = accounts or []
+            self.subscription_markets = markets or []
+            self.subscription_objects = objects or []
+            calls = self._subscription_calls()
+        else:
+            calls = self._subscription_update_calls(
+                accounts or [], markets or [], objects or []
+            )
+        if self.ws:
+            self._issue_subscription_calls(calls)
 
     def __set_subscriptions(self):
-        self.cancel_all_subscriptions()
+        self._issue_subscription_calls(self._subscription_calls())
+
+    def _issue_subscription_calls(self, calls):
+        for name, args in calls:
+            future = getattr(self, name)(*args)
+            if name == "get_full_accounts":
+                future.add_done_callback(self._remember_account_ids)
+
+    def _remember_account_ids(self, future):
+        if not future.cancelled() and not future.exception():
+            self._store_account_ids(future.result())
+
+    def _store_account_ids(self, full_accounts):
+        """Learn the ids of accounts that have been subscribed by name."""
+        for name, full_account in full_accounts or []:
+            self._account_ids[name] = full_account["account"]["id"]
+
+    def _subscription_calls(self):
+        """
+        Return the ``(method, args)`` RPC calls that (re)establish all
+        subscriptions.
+
+        The calls are only assembled here so that the synchronous and the asyncio
+        client can issue them in their own way.
+        """
+        calls = [("cancel_all_subscriptions", [])]
+        self._node_accounts = set()
+        self._node_markets = set()
+        self._muted_accounts = set()
+        self._object_callback = False
 
         # Subscribe to events on the Backend and give them a
         # callback number that allows us to identify the event
 
         if len(self.on_object) or len(self.subscription_accounts):
-            self.set_subscribe_callback(self.__events__.index("on_object"), False)
+            calls.append(
+                ("set_subscribe_callback", [self.__events__.index("on_object"), False])
+            )
+            self._object_callback = True
 
         if self.subscription_accounts and self.on_account:
             # Unfortunately, account subscriptions don't have their own
             # callback number
             log.debug("Subscribing to accounts %s" % str(self.subscription_accounts))
-            self.get_full_accounts(self.subscription_accounts, True)
+            calls.append(("get_full_accounts", [self.subscription_accounts, True]))
+            self._node_accounts = set(self.subscription_accounts)
 
         if self.subscription_markets and self.on_market:
             log.debug("Subscribing to markets %s" % str(self.subscription_markets))
             for market in self.subscription_markets:
                 # Technially, every market could have it's own
                 # callback number
-                self.subscribe_to_market(
-                    self.__events__.index("on_market"), market[0], market[1]
+                calls.append(
+                    (
+                        "subscribe_to_market",
+                        [self.__events__.index("on_market"), market[0], market[1]],
+                    )
                 )
+                self._node_markets.add(tuple(market))
         if len(self.on_tx):
-            self.set_pending_transaction_callback(self.__events__.index("on_tx"))
+            calls.append(
+                ("set_pending_transaction_callback", [self.__events__.index("on_tx")])
+            )
         if len(self.on_block):
-            self.set_block_applied_callback(self.__events__.index("on_block"))
+            calls.append(
+                ("set_block_applied_callback", [self.__events__.index("on_block")])
+            )
+        return calls
+
+    def _subscription_update_calls(self, accounts, markets, objects):
+        """
+        Store the new subscriptions and return the ``(method, args)`` RPC calls
+        that turn the current subscriptions into the new ones.
+        """
+        calls = []
+        self.subscription_accounts = accounts
+        self.subscription_markets = markets
+        self.subscription_objects = objects
+
+        if not self._object_callback and (len(self.on_object) or len(accounts)):
+            calls.append(
+                ("set_subscribe_callback", [self.__events__.index("on_object"), False])
+            )
+            self._object_callback = True
+
+        # Accounts
+        wanted = set(accounts) if self.on_account else set()
+        for account in self._node_accounts - wanted:
+            self._muted_accounts.add(self._account_ids.get(account, account))
+        for account in self._node_accounts & wanted:
+            self._muted_accounts.discard(self._account_ids.get(account, account))
+        added = [a for a in accounts if a in wanted and a not in self._node_accounts]
+        if added:
+            log.debug("Subscribing to accounts %s" % str(added))
+            calls.append(("get_full_accounts", [added, True]))
+            self._node_accounts.update(added)
+
+        # Markets
+        wanted = [tuple(m) for m in markets] if self.on_market else []
+        for market in self._node_markets - set(wanted):
+            log.debug("Unsubscribing from market %s" % str(market))
+            calls.append(("unsubscribe_from_market", [market[0], market[1]]))
+            self._node_markets.discard(market)
+        for market in wanted:
+            if market not in self._node_markets:
+                log.debug("Subscribing to market %s" % str(market))
+                calls.append(
+                    (
+                        "subscribe_to_market",
+                        [self.__events__.index("on_market"), market[0], market[1]],
+                    )
+                )
+                self._node_markets.add(market)
+        return calls
+
+    def add_head_block_handler(self, handler):
+        """Call ``handler(block_id)`` for new blocks like ``on_block``, but
+        without fetching the blocks missed during a reconnect for it, e.g. to
+        invalidate caches."""
+        self._head_block_handlers.append(handler)
+        self.on_block += handler
+
+    def _needs_backfill(self):
+        # Handlers that only need the head block do not need the missed blocks
+        return bool(
+            self.max_backfill
+            and self._last_block_num is not None
+            and len(self.on_block) > len(self._head_block_handlers)
+        )
+
+    def _backfill_range(self, head_block_num):
+        """Return the block numbers missed since the last delivered block."""
+        first = self._last_block_num + 1
+        if head_block_num - first >= self.max_backfill:
+            log.warning(
+                "Missed {} blocks, only backfilling the last {}".format(
+                    head_block_num - first + 1, self.max_backfill
+                )
+            )
+            first = head_block_num - self.max_backfill + 1
+        return range(first, head_block_num + 1)
+
+    def _request_backfill(self, future):
+        """Fetch all missed blocks at once, once the head block is known."""
+        try:
+            nums = self._backfill_range(future.result()["head_block_number"])
+            futures = [self.get_block(num) for num in nums]
+        except Exception as e:
+            log.warning("Backfilling blocks failed: {}".format(str(e)))
+            self._finish_backfill([])
+            return
+        if not futures:
+            self._finish_backfill([])
+            return
+
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def on_done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            blocks = []
+            for f in futures:
+                if f.cancelled() or f.exception():
+                    log.warning("Backfilling blocks failed: {}".format(f.exception()))
+                    break
+                blocks.append(f.result())
+            self._finish_backfill(blocks)
+
+        for f in futures:
+            f.add_done_callback(on_done)
+
+    def _finish_backfill(self, blocks):
+        """Deliver the backfilled blocks in order, followed by the blocks that
+        have been received in the meantime."""
+        block_ids = [block.get("block_id") if block else None for block in blocks]
+        for i, block in enumerate(blocks[1:]):
+            # Older nodes only tell us the id of a block by its successor
+            if block and not block_ids[i]:
+                block_ids[i] = block["previous"]
+        for block_id in block_ids:
+            if block_id:
+                self._deliver_block(block_id)
+        buffered, self._buffered_blocks = self._buffered_blocks, []
+        self._backfilling = False
+        for block_id in buffered:
+            self._deliver_block(block_id)
+
+    def _on_block_notice(self, block_id):
+        if self.nodes:
+            # The block number is encoded in the block id
+            self.nodes.record_head_block(self.url, int(block_id[:8], 16))
+        if self._backfilling:
+            self._buffered_blocks.append(block_id)
+        else:
+            self._deliver_block(block_id)
+
+    def _deliver_block(self, block_id):
+        """Call ``on_block`` unless the block has been delivered already."""
+        block_num = int(block_id[:8], 16)
+        if self._last_block_num is not None and block_num <= self._last_block_num:
+            return
+        self._last_block_num = block_num
+        self._dispatch("on_block", block_id)
 
     def _ping(self):
         # We keep the connection alive by requesting a short object
@@ -217,17 +651,65 @@ class DeExWebsocket(Events):
         """
         id = notice["id"]
 
-        _a, _b, _ = id.split(".")
+        if id in self._subscribed_ids:
+            self._dispatch("on_object", notice, id)
 
-        if id in self.subscription_objects:
-            self.on_object(notice)
-
-        elif ".".join([_a, _b, "x"]) in self.subscription_objects:
-            self.on_object(notice)
+        elif id[: id.rfind(".")] in self._subscribed_spaces:
+            self._dispatch("on_object", notice, id)
 
         elif id[:4] == "2.6.":
             # Treat account updates separately
-            self.on_account(notice)
+            if notice.get("owner") in self._muted_accounts:
+                return
+            self._dispatch("on_account", notice, id)
+
+    def _collect_notice(self, notice):
+        """Process ``notice`` or keep it to be coalesced."""
+        if self.coalesce_notices is None:
+            self.process_notice(notice)
+            return
+        with self._notices_lock:
+            if notice["id"] in self._notices:
+                self.coalesced_notices += 1
+            self._notices[notice["id"]] = notice
+            if self.coalesce_notices and self._flush_timer is None:
+                self._flush_timer = self._schedule_flush(self.coalesce_notices)
+
+    def _schedule_flush(self, delay):
+        timer = threading.Timer(delay, self.flush_notices)
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def flush_notices(self):
+        """Process the coalesced notices, the latest version of every object
+        id in the order they first arrived."""
+        with self._notices_lock:
+            notices = self._notices
+            self._notices = OrderedDict()
+            self._flush_timer = None
+        for notice in notices.values():
+            try:
+                self.process_notice(notice)
+            except Exception as e:
+                log.critical(
+                    "Error in process_notice: {}\n\n{}".format(
+                        str(e), traceback.format_exc()
+                    )
+                )
+
+    def _dispatch(self, name, payload, object_id=None):
+        """Call the event slot ``name``, either right away or through the
+        dispatcher."""
+        slot = getattr(self.events, name)
+        if self.dispatcher is None:
+            slot(payload)
+            return
+        if object_id:
+            key = (name, object_id)
+            self.dispatcher.submit(key, slot, payload, coalesce_key=key)
+        else:
+            self.dispatcher.submit(name, slot, payload)
 
     def on_message(self, reply, *args, **kwargs):
         """
@@ -244,7 +726,10 @@ class DeExWebsocket(Events):
         except ValueError:
             raise ValueError("API node returned invalid format. Expected JSON!")
 
-        if data.get("method") == "notice":
+        if "id" in data and data.get("method") is None:
+            self._resolve_request(data)
+
+        elif data.get("method") == "notice":
             id = data["params"][0]
 
             if id >= len(self.__events__):
@@ -253,40 +738,66 @@ class DeExWebsocket(Events):
 
             # This is a "general" object change notification
             if id == self.__events__.index("on_object"):
-                # Let's see if a specific object has changed
-                for notice in data["params"][1]:
-                    try:
-                        if "id" in notice:
-                            self.process_notice(notice)
-                        else:
-                            for obj in notice:
-                                if "id" in obj:
-                                    self.process_notice(obj)
-                    except Exception as e:
-                        log.critical(
-                            "Error in process_notice: {}\n\n{}".format(
-                                str(e), traceback.format_exc
-                            )
-                        )
+                self._on_object_notices(data["params"][1])
             else:
-                try:
-                    callbackname = self.__events__[id]
-                    log.debug("Patching through to call %s" % callbackname)
-                    [getattr(self.events, callbackname)(x) for x in data["params"][1]]
-                except Exception as e:
-                    log.critical(
-                        "Error in {}: {}\n\n{}".format(
-                            callbackname, str(e), traceback.format_exc()
-                        )
+                self._on_event_notices(self.__events__[id], data["params"][1])
+
+    def _on_object_notices(self, notices):
+        """Hand the changed objects of a notice on to ``process_notice``."""
+        for notice in notices:
+            try:
+                if "id" in notice:
+                    self._collect_notice(notice)
+                else:
+                    for obj in notice:
+                        if "id" in obj:
+                            self._collect_notice(obj)
+            except Exception as e:
+                log.critical(
+                    "Error in process_notice: {}\n\n{}".format(
+                        str(e), traceback.format_exc()
                     )
+                )
+        if self.coalesce_notices == 0:
+            self.flush_notices()
+
+    def _on_event_notices(self, callbackname, notices):
+        """Call ``callbackname`` for every entry of a notice."""
+        try:
+            log.debug("Patching through to call %s" % callbackname)
+            for x in notices:
+                if callbackname == "on_block":
+                    self._on_block_notice(x)
+                else:
+                    self._dispatch(callbackname, x)
+        except Exception as e:
+            log.critical(
+                "Error in {}: {}\n\n{}".format(
+                    callbackname, str(e), traceback.format_exc()
+                )
+            )
 
     def on_error(self, error, *args, **kwargs):
         """Called on websocket errors."""
         log.exception(error)
+        if self.nodes and self.url:
+            self.nodes.record_error(self.url)
+
+    def _next_url(self):
+        """Return the best node to connect to, or the next one if nodes are not
+        tracked."""
+        if self.nodes is None:
+            return next(self.urls)
+        return self.nodes.best()
+
+    def _should_back_off(self):
+        """Only wait before reconnecting if there is no healthy node left."""
+        return self.nodes is None or self.nodes.all_failing()
 
     def on_close(self, *args, **kwargs):
         """Called when websocket connection is closed."""
         log.debug("Closing WebSocket connection with {}".format(self.url))
+        self._fail_pending(IOError("Connection was closed before a reply arrived"))
 
     def run_forever(self, *args, **kwargs):
         """
@@ -298,7 +809,7 @@ class DeExWebsocket(Events):
         cnt = 0
         while not self.run_event.is_set():
             cnt += 1
-            self.url = next(self.urls)
+            self.url = self._next_url()
             log.debug("Trying to connect to node %s" % self.url)
             try:
                 # websocket.enableTrace(True)
@@ -309,13 +820,22 @@ class DeExWebsocket(Events):
                     on_close=self.on_close,
                     on_open=self.on_open,
                 )
-                self.ws.run_forever()
+                if self.keepalive_mode == "ping":
+                    self.ws.run_forever(
+                        dispatcher=KeepaliveDispatcher(
+                            self, self.ws, self.keep_alive, self.ping_timeout
+                        )
+                    )
+                else:
+                    self.ws.run_forever()
             except websocket.WebSocketException:
+                if self.nodes:
+                    self.nodes.record_error(self.url)
                 if self.num_retries >= 0 and cnt > self.num_retries:
                     raise NumRetriesReached()
 
                 sleeptime = (cnt - 1) * 2 if cnt < 10 else 10
-                if sleeptime:
+                if sleeptime and self._should_back_off():
                     log.warning(
                         "Lost connection to node during wsconnect(): %s (%d/%d) "
                         % (self.url, cnt, self.num_retries)
@@ -338,9 +858,64 @@ class DeExWebsocket(Events):
         if self.keepalive and self.keepalive.is_alive():
             self.keepalive.join()
 
+        if self._flush_timer:
+            self._flush_timer.cancel()
+        self.flush_notices()
+
+        if self.dispatcher:
+            self.dispatcher.stop()
+
     def get_request_id(self):
-        self._request_id += 1
-        return self._request_id
+        with self._pending_lock:
+            self._request_id += 1
+            return self._request_id
+
+    def _create_future(self):
+        return Future()
+
+    def _register_request(self, request_id):
+        """Create and store the future that is resolved by the reply to
+        ``request_id``."""
+        future = self._create_future()
+        with self._pending_lock:
+            self._pending[request_id] = future
+            self._sent_at[request_id] = time.monotonic()
+        return future
+
+    def _resolve_request(self, data):
+        """Resolve the pending future that matches the JSON-RPC ``id`` of a reply."""
+        with self._pending_lock:
+            future = self._pending.pop(data["id"], None)
+            sent_at = self._sent_at.pop(data["id"], None)
+        if future is None:
+            log.debug("Received reply for unknown request id %s" % data["id"])
+            return
+        if self.nodes and sent_at is not None and "error" not in data:
+            self.nodes.record_success(self.url, time.monotonic() - sent_at)
+        if future.done():
+            return
+        if "error" in data:
+            future.set_exception(RPCError(self._decode_error(data["error"])))
+        else:
+            future.set_result(data.get("result"))
+
+    @staticmethod
+    def _decode_error(error):
+        if "detail" in error:
+            return error["detail"]
+        elif error.get("message") == "Execution error":
+            stack = error["data"]["stack"][0]
+            return stack["format"].replace("${", "{").format(**stack["data"])
+        return error.get("message", str(error))
+
+    def _fail_pending(self, exception):
+        """Fail all requests that are still waiting for a reply."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            self._sent_at = {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exception)
 
     """ RPC Calls
     """
@@ -350,11 +925,21 @@ class DeExWebsocket(Events):
         Execute a call by sending the payload.
 
         :param dict payload: Payload data
-        :raises ValueError: if the server does not respond in proper JSON format
-        :raises RPCError: if the server returns an error
+        :returns: future that resolves to the result of the call
+        :rtype: concurrent.futures.Future
+
+        The future raises ``RPCError`` if the server returns an error.
         """
         log.debug(json.dumps(payload))
-        self.ws.send(json.dumps(payload, ensure_ascii=False).encode("utf8"))
+        future = self._register_request(payload["id"])
+        try:
+            self.ws.send(json.dumps(payload, ensure_ascii=False).encode("utf8"))
+        except Exception:
+            with self._pending_lock:
+                self._pending.pop(payload["id"], None)
+                self._sent_at.pop(payload["id"], None)
+            raise
+        return future
 
     def __getattr__(self, name):
         """Map all methods to RPC calls and pass through the arguments."""
@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+import importlib
+
+
 __all__ = [
     "account",
     "bip38",
@@ -11,3 +14,15 @@ __all__ = [
     "signedtransactions",
     "transactions",
 ]
+
+
+def __getattr__(name):
+    """Import the submodules on first access, e.g. ``deexbase.operations``,
+    without importing all of them with the package (PEP 562)."""
+    if name in __all__:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+import struct
+import time
+
+from binascii import hexlify
+from functools import lru_cache
+
+from graphenebase.types import timeformat
+
+from . import schemas
+from .account import PublicKey
+from .objects import Operation, default_prefix
+from .objecttypes import object_type
+from .operationids import operation_names
+from .records import record_class, record_for
+from .signedtransactions import Signed_Transaction
+
+
+_decoders = {}
+
+
+def _read_varint(data, offset):
+    result = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, offset
+        shift += 7
+
+
+def _unpacker(format):
+    unpack_from = struct.Struct(format).unpack_from
+    size = struct.calcsize(format)
+
+    def decode(data, offset, prefix):
+        return unpack_from(data, offset)[0], offset + size
+
+    return decode
+
+
+def _decode_varint32(data, offset, prefix):
+    return _read_varint(data, offset)
+
+
+def _decode_bool(data, offset, prefix):
+    return bool(data[offset]), offset + 1
+
+
+def _read_buffer(data, offset):
+    length, offset = _read_varint(data, offset)
+    end = offset + length
+    if end > len(data):
+        raise IndexError("Buffer exceeds the data")
+    return data[offset:end], end
+
+
+def _decode_string(data, offset, prefix):
+    value, offset = _read_buffer(data, offset)
+    return bytes(value).decode("utf-8"), offset
+
+
+def _decode_bytes(data, offset, prefix):
+    value, offset = _read_buffer(data, offset)
+    return hexlify(value).decode("ascii"), offset
+
+
+def _hash(size):
+    def decode(data, offset, prefix):
+        end = offset + size
+        if end > len(data):
+            raise IndexError("Hash exceeds the data")
+        return hexlify(data[offset:end]).decode("ascii"), end
+
+    return decode
+
+
+_uint32 = struct.Struct("<I").unpack_from
+_uint64 = struct.Struct("<Q").unpack_from
+
+
+@lru_cache(maxsize=1024)
+def _time(timestamp):
+    return time.strftime(timeformat[:-2], time.gmtime(timestamp))
+
+
+def _decode_time(data, offset, prefix):
+    return _time(_uint32(data, offset)[0]), offset + 4
+
+
+def _decode_vote_id(data, offset, prefix):
+    value = _uint32(data, offset)[0]
+    return "%d:%d" % (value & 0xFF, value >> 8), offset + 4
+
+
+@lru_cache(maxsize=1024)
+def _public_key(key, prefix):
+    return format(PublicKey(hexlify(key).decode("ascii"), prefix=prefix), prefix)
+
+
+def _decode_public_key(data, offset, prefix):
+    end = offset + 33
+    if end > len(data):
+        raise IndexError("Public key exceeds the data")
+    return _public_key(bytes(data[offset:end]), prefix), end
+
+
+def _decode_empty_set(data, offset, prefix):
+    length, offset = _read_varint(data, offset)
+    if length:
+        raise ValueError("Extensions are not supported")
+    return [], offset
+
+
+def _decode_none(data, offset, prefix):
+    if data[offset]:
+        raise ValueError("Optional value is not supported")
+    return None, offset + 1
+
+
+def _decode_memo(data, offset, prefix):
+    memo = {}
+    memo["from"], offset = _decode_public_key(data, offset, prefix)
+    memo["to"], offset = _decode_public_key(data, offset, prefix)
+    memo["nonce"] = _uint64(data, offset)[0]
+    memo["message"], offset = _decode_bytes(data, offset + 8, prefix)
+    return memo, offset
+
+
+def _decode_operation(data, offset, prefix):
+    id, offset = _read_varint(data, offset)
+    if id not in operation_names:
+        raise ValueError("Unknown Operation ID %d" % id)
+    op, offset = decoder_for(id)(data, offset, prefix)
+    return [id, op], offset
+
+
+def _decode_operation_record(data, offset, prefix):
+    id, offset = _read_varint(data, offset)
+    if id not in operation_names:
+        raise ValueError("Unknown Operation ID %d" % id)
+    return decoder_for(id, records=True)(data, offset, prefix)
+
+
+#: Decoders of the primitive types by name, see :mod:`deexbase.schemas`
+primitives = {
+    "uint8": _unpacker("<B"),
+    "uint16": _unpacker("<H"),
+    "uint32": _unpacker("<I"),
+    "uint64": _unpacker("<Q"),
+    "int16": _unpacker("<h"),
+    "int64": _unpacker("<q"),
+    "varint32": _decode_varint32,
+    "bool": _decode_bool,
+    "string": _decode_string,
+    "bytes": _decode_bytes,
+    "ripemd160": _hash(20),
+    "sha1": _hash(20),
+    "sha256": _hash(32),
+    "time": _decode_time,
+    "vote_id": _decode_vote_id,
+    "public_key": _decode_public_key,
+    "signature": _hash(65),
+    "extensions": _decode_empty_set,
+    "none": _decode_none,
+}
+
+
+def _object_id(type, records=False):
+    template = "1.%d.%%d" % object_type[type]
+
+    def decode(data, offset, prefix):
+        instance, offset = _read_varint(data, offset)
+        return template % instance, offset
+
+    return decode
+
+
+def _optional(type, present, records=False):
+    inner = compile_type(type, records)
+
+    def decode(data, offset, prefix):
+        if not data[offset]:
+            return None, offset + 1
+        return inner(data, offset + 1, prefix)
+
+    return decode
+
+
+def _default(type, default, records=False):
+    return compile_type(type, records)
+
+
+def _unprefixed(type, records=False):
+    inner = compile_type(type, records)
+
+    def decode(data, offset, prefix):
+        return inner(data, offset, PublicKey.prefix)
+
+    return decode
+
+
+def _array(type, sort, records=False):
+    inner = compile_type(type, records)
+
+    def decode(data, offset, prefix):
+        length, offset = _read_varint(data, offset)
+        items = []
+        for _ in range(length):
+            item, offset = inner(data, offset, prefix)
+            items.append(item)
+        return items, offset
+
+    return decode
+
+
+def _map(key, value, sort, records=False):
+    decode_key = compile_type(key, records)
+    decode_value = compile_type(value, records)
+
+    def decode(data, offset, prefix):
+        length, offset = _read_varint(data, offset)
+        pairs = []
+        for _ in range(length):
+            k, offset = decode_key(data, offset, prefix)
+            v, offset = decode_value(data, offset, prefix)
+            pairs.append([k, v])
+        return pairs, offset
+
+    return decode
+
+
+def _struct(fields, records=False):
+    compiled = tuple((name, compile_type(type, records)) for name, type in fields)
+
+    def decode(data, offset, prefix):
+        result = {}
+        for name, field in compiled:
+            value, offset = field(data, offset, prefix)
+            if value is not None:
+                # Unset optionals are left out, like in the JSON of the classes
+                result[name] = value
+        return result, offset
+
+    return decode
+
+
+def _static_variant(types, records=False):
+    compiled = tuple(compile_type(type, records) for type in types)
+
+    def decode(data, offset, prefix):
+        id, offset = _read_varint(data, offset)
+        if id >= len(compiled):
+            raise ValueError("Unknown static variant {}".format(id))
+        value, offset = compiled[id](data, offset, prefix)
+        return [id, value], offset
+
+    return decode
+
+
+def _extension(options, records=False):
+    compiled = tuple((name, compile_type(type, records)) for name, type in options)
+
+    def decode(data, offset, prefix):
+        length, offset = _read_varint(data, offset)
+        result = {}
+        for _ in range(length):
+            index, offset = _read_varint(data, offset)
+            if index >= len(compiled):
+                raise ValueError("Unknown extension {}".format(index))
+            name, field = compiled[index]
+            result[name], offset = field(data, offset, prefix)
+        return result, offset
+
+    return decode
+
+
+_composites = {
+    "object_id": _object_id,
+    "optional": _optional,
+    "default": _default,
+    "unprefixed": _unprefixed,
+    "array": _array,
+    "map": _map,
+    "struct": _struct,
+    "static_variant": _static_variant,
+    "extension": _extension,
+    "memo": lambda records: _decode_memo,
+    "operation": lambda records: (
+        _decode_operation_record if records else _decode_operation
+    ),
+}
+
+
+def _record(fields, klass):
+    compiled = tuple(compile_type(type, True) for _, type in fields)
+
+    def decode(data, offset, prefix):
+        values = []
+        for field in compiled:
+            value, offset = field(data, offset, prefix)
+            values.append(value)
+        return klass._make(values), offset
+
+    return decode
+
+
+def compile_type(type, records=False):
+    """Compile a type of :mod:`deexbase.schemas` into a function
+    ``decode(data, offset, prefix)`` that returns the value at ``offset`` of
+    ``data`` and the offset after it, ``prefix`` is the prefix of the public
+    keys. With ``records``, structs are decoded into records of
+    :mod:`deexbase.records` instead of dicts."""
+    if isinstance(type, str):
+        return primitives[type]
+    if records and type[0] == "struct":
+        return _record(type[1], record_class(type))
+    return _composites[type[0]](*type[1:], records=records)
+
+
+def decoder_for(op, records=False):
+    """
+    Return the decoder of an operation.
+
+    :param op: Operation name, id or class of :mod:`deexbase.operations`
+    :param bool records: Decode into a record of :mod:`deexbase.records`
+
+    The decoder is compiled once from :data:`deexbase.schemas.operations`
+    and returns the data of an operation as dict, as it is given to the
+    operation class, or as record, and the offset after it:
+
+    .. code-block:: python
+
+        decode = decoder_for("transfer")
+        data, offset = decode(raw, 0, "DX")
+    """
+    if isinstance(op, type):
+        op = op.__name__.lower()
+    elif not isinstance(op, str):
+        op = operation_names[int(op)]
+    if (op, records) not in _decoders:
+        if op not in schemas.operations:
+            raise NotImplementedError("Unimplemented Operation %s" % op)
+        if records:
+            klass = record_for(op)
+            fields = _record(schemas.operations[op], klass)
+
+            def decode(data, offset, prefix):
+                record, offset = fields(data, offset, prefix)
+                if prefix != default_prefix:
+                    record.prefix = prefix
+                return record, offset
+
+        else:
+            fields = _struct(schemas.operations[op])
+
+            def decode(data, offset, prefix):
+                result, offset = fields(data, offset, prefix)
+                if prefix != default_prefix:
+                    result["prefix"] = prefix
+                return result, offset
+
+        _decoders[op, records] = decode
+    return _decoders[op, records]
+
+
+def _decode(decoder, data, prefix):
+    try:
+        value, offset = decoder(data, 0, prefix)
+    except (IndexError, struct.error):
+        raise ValueError("Data ends unexpectedly")
+    if offset != len(data):
+        raise ValueError("{} bytes left over".format(len(data) - offset))
+    return value
+
+
+def decode(type, data, prefix=default_prefix, records=False):
+    """
+    Decode a value of a type of :mod:`deexbase.schemas` from bytes.
+
+    :param type: Type, e.g. :data:`deexbase.schemas.PRICE_FEED`
+    :param bytes data: Wire format
+    :param str prefix: Prefix of the public keys
+    :param bool records: Decode structs into records of
+        :mod:`deexbase.records`
+
+    .. code-block:: python
+
+        decode(schemas.PRICE, bytes(Price(price)))
+    """
+    return _decode(compile_type(type, records), data, prefix)
+
+
+def decode_operation(data, prefix=default_prefix, objects=False, records=False):
+    """
+    Decode an operation from bytes.
+
+    :param bytes data: Wire format, e.g. ``bytes(Operation(op))``
+    :param str prefix: Prefix of the public keys
+    :param bool objects: Return a :class:`deexbase.objects.Operation`
+        instead of ``[id, data]``
+    :param bool records: Return a compact record of :mod:`deexbase.records`
+        instead of ``[id, data]``
+
+    The data is a dict as it is given to the operation class, together with
+    the ``prefix`` if it is not the default one.
+    """
+    if records and not objects:
+        return _decode(_decode_operation_record, data, prefix)
+    op = _decode(_decode_operation, data, prefix)
+    return Operation(op) if objects else op
+
+
+_transaction = compile_type(schemas.TRANSACTION)
+_transaction_records = _struct(schemas.TRANSACTION[1], records=True)
+_signatures = compile_type(schemas.array("signature"))
+
+
+def _transaction_decoder(transaction):
+    def decode(data, offset, prefix):
+        tx, offset = transaction(data, offset, prefix)
+        if offset < len(data):
+            tx["signatures"], offset = _signatures(data, offset, prefix)
+        return tx, offset
+
+    return decode
+
+
+_decode_transaction = _transaction_decoder(_transaction)
+_decode_transaction_records = _transaction_decoder(_transaction_records)
+
+
+def decode_transaction(data, prefix=default_prefix, objects=False, records=False):
+    """
+    Decode a transaction from bytes.
+
+    :param bytes data: Wire format, with or without the signatures, e.g.
+        ``bytes(Signed_Transaction(...))``
+    :param str prefix: Prefix of the public keys
+    :param bool objects: Return a
+        :class:`deexbase.signedtransactions.Signed_Transaction` instead of a
+        dict
+    :param bool records: Return the operations as compact records of
+        :mod:`deexbase.records`
+
+    The dict holds the operations as ``[id, data]`` and the signatures as hex
+    strings, if there are any:
+
+    .. code-block:: python
+
+        tx = decode_transaction(raw, prefix="DX")
+        for id, op in tx["operations"]:
+            ...
+    """
+    if records and not objects:
+        return _decode(_decode_transaction_records, data, prefix)
+    tx = _decode(_decode_transaction, data, prefix)
+    if objects:
+        return Signed_Transaction(**tx)
+    return tx
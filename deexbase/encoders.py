@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+import struct
+import time
+
+from binascii import unhexlify
+from calendar import timegm
+from functools import lru_cache
+
+from graphenebase.account import PublicKey as GPHPublicKey
+from graphenebase.objects import GrapheneObject
+from graphenebase.types import timeformat
+from graphenebase.utils import unicodify
+
+from . import schemas
+from .account import PublicKey
+from .objects import default_prefix
+from .objecttypes import object_type
+from .operationids import operation_names, operations
+from .records import OperationRecord
+
+
+_encoders = {}
+
+_uint8 = struct.Struct("<B").pack
+_uint32 = struct.Struct("<I").pack
+_uint64 = struct.Struct("<Q").pack
+
+
+def _varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _packer(format):
+    pack = struct.Struct(format).pack
+
+    def encode(buf, value, prefix):
+        buf += pack(int(value))
+
+    return encode
+
+
+def _encode_varint32(buf, value, prefix):
+    _varint(buf, int(value))
+
+
+def _encode_bool(buf, value, prefix):
+    buf += _uint8(int(value))
+
+
+def _encode_string(buf, value, prefix):
+    data = unicodify(value) if value else b""
+    _varint(buf, len(data))
+    buf += data
+
+
+def _encode_bytes(buf, value, prefix):
+    data = unhexlify(bytes(value, "utf-8"))
+    _varint(buf, len(data))
+    buf += data
+
+
+def _hash(length):
+    def encode(buf, value, prefix):
+        assert len(value) == length, "Require {} char long hex".format(length)
+        buf += unhexlify(bytes(value, "utf-8"))
+
+    return encode
+
+
+@lru_cache(maxsize=1024)
+def _timestamp(value):
+    return _uint32(timegm(time.strptime(value + "UTC", timeformat)))
+
+
+def _encode_time(buf, value, prefix):
+    buf += _timestamp(value)
+
+
+def _encode_vote_id(buf, value, prefix):
+    type, instance = value.split(":")
+    buf += _uint32((int(type) & 0xFF) | (int(instance) << 8))
+
+
+@lru_cache(maxsize=1024)
+def _public_key(key, prefix):
+    return bytes(PublicKey(key, prefix=prefix))
+
+
+def _encode_public_key(buf, value, prefix):
+    if isinstance(value, GPHPublicKey):
+        buf += bytes(value)
+    else:
+        buf += _public_key(value, prefix)
+
+
+def _encode_signature(buf, value, prefix):
+    buf += unhexlify(value)
+
+
+def _encode_empty_set(buf, value, prefix):
+    buf.append(0)
+
+
+def _encode_memo(buf, value, prefix):
+    if isinstance(value, GrapheneObject):
+        buf += bytes(value)
+    elif value.get("message"):
+        if prefix is None:
+            prefix = value.get("prefix")
+        buf += _public_key(value["from"], prefix)
+        buf += _public_key(value["to"], prefix)
+        buf += _uint64(int(value["nonce"]))
+        _encode_bytes(buf, value["message"], prefix)
+
+
+def _encode_operation(buf, value, prefix):
+    if isinstance(value, OperationRecord):
+        _varint(buf, value._id)
+        encoder_for(value._name)(buf, value)
+        return
+    if isinstance(value, GrapheneObject):
+        name, data = value.__class__.__name__.lower(), value
+    else:
+        name, data = value
+        if not isinstance(name, str):
+            name = operation_names[int(name)]
+    _varint(buf, operations[name])
+    if isinstance(data, GrapheneObject):
+        buf += bytes(data)
+    else:
+        encoder_for(name)(buf, data)
+
+
+#: Encoders of the primitive types by name, see :mod:`deexbase.schemas`
+primitives = {
+    "uint8": _packer("<B"),
+    "uint16": _packer("<H"),
+    "uint32": _packer("<I"),
+    "uint64": _packer("<Q"),
+    "int16": _packer("<h"),
+    "int64": _packer("<q"),
+    "varint32": _encode_varint32,
+    "bool": _encode_bool,
+    "string": _encode_string,
+    "bytes": _encode_bytes,
+    "ripemd160": _hash(40),
+    "sha1": _hash(40),
+    "sha256": _hash(64),
+    "time": _encode_time,
+    "vote_id": _encode_vote_id,
+    "public_key": _encode_public_key,
+    "signature": _encode_signature,
+    "extensions": _encode_empty_set,
+    "none": _encode_empty_set,
+}
+
+
+def _object_id(type):
+    expected = object_type[type]
+
+    def encode(buf, value, prefix):
+        parts = value.split(".")
+        if len(parts) != 3:
+            raise ValueError("Object id is invalid")
+        assert (
+            int(parts[1]) == expected
+        ), "Object id does not match object type! " + "Excpected %d, got %d" % (
+            expected,
+            int(parts[1]),
+        )
+        _varint(buf, int(parts[2]))
+
+    return encode
+
+
+def _optional(type, present):
+    inner = compile_type(type)
+
+    def encode(buf, value, prefix):
+        if value is None or not (present or value):
+            buf.append(0)
+            return
+        flag = len(buf)
+        buf.append(1)
+        inner(buf, value, prefix)
+        if len(buf) == flag + 1:
+            # Empty values are left out
+            buf[flag] = 0
+
+    return encode
+
+
+def _default(type, default):
+    inner = compile_type(type)
+
+    def encode(buf, value, prefix):
+        inner(buf, default if value is None else value, prefix)
+
+    return encode
+
+
+def _unprefixed(type):
+    inner = compile_type(type)
+
+    def encode(buf, value, prefix):
+        inner(buf, value, None)
+
+    return encode
+
+
+def _array(type, sort):
+    inner = compile_type(type)
+
+    def encode(buf, value, prefix):
+        value = value or []
+        if sort is not None:
+            value = sort(value, prefix)
+        _varint(buf, len(value))
+        for item in value:
+            inner(buf, item, prefix)
+
+    return encode
+
+
+def _map(key, value, sort):
+    encode_key, encode_value = compile_type(key), compile_type(value)
+
+    def encode(buf, pairs, prefix):
+        if sort is not None:
+            pairs = sort(pairs, prefix)
+        _varint(buf, len(pairs))
+        for k, v in pairs:
+            encode_key(buf, k, prefix)
+            encode_value(buf, v, prefix)
+
+    return encode
+
+
+def _required(type):
+    if isinstance(type, str):
+        return type not in ("extensions", "none")
+    return type[0] not in ("optional", "default")
+
+
+def _struct(fields):
+    # Missing fields that are not required are None, others raise KeyError
+    compiled = tuple(
+        (name, compile_type(type), _required(type)) for name, type in fields
+    )
+
+    def encode(buf, value, prefix):
+        if isinstance(value, GrapheneObject):
+            buf += bytes(value)
+            return
+        for name, field, required in compiled:
+            field(buf, value[name] if required else value.get(name), prefix)
+
+    return encode
+
+
+def _static_variant(types):
+    compiled = tuple(compile_type(type) for type in types)
+
+    def encode(buf, value, prefix):
+        id, data = value
+        if id >= len(compiled):
+            raise ValueError("Unknown static variant {}".format(id))
+        _varint(buf, id)
+        compiled[id](buf, data, prefix)
+
+    return encode
+
+
+def _extension(options):
+    compiled = tuple(
+        (index, name.lower(), compile_type(type))
+        for index, (name, type) in enumerate(options)
+    )
+
+    def encode(buf, value, prefix):
+        if not isinstance(value, dict):
+            buf.append(0)
+            return
+        given = [
+            (index, field, value[key])
+            for index, name, field in compiled
+            for key in value
+            if key.lower() == name
+        ]
+        _varint(buf, len(given))
+        for index, field, data in given:
+            _varint(buf, index)
+            field(buf, data, prefix)
+
+    return encode
+
+
+_composites = {
+    "object_id": _object_id,
+    "optional": _optional,
+    "default": _default,
+    "unprefixed": _unprefixed,
+    "array": _array,
+    "map": _map,
+    "struct": _struct,
+    "static_variant": _static_variant,
+    "extension": _extension,
+    "memo": lambda: _encode_memo,
+    "operation": lambda: _encode_operation,
+}
+
+
+def compile_type(type):
+    """Compile a type of :mod:`deexbase.schemas` into a function
+    ``encode(buf, value, prefix)`` that appends ``value`` to the bytearray
+    ``buf``, ``prefix`` is the prefix of the public keys (``None`` for the
+    default prefix)."""
+    if isinstance(type, str):
+        return primitives[type]
+    return _composites[type[0]](*type[1:])
+
+
+def _fallback(name):
+    # Operations without a schema take the way over the classes
+    from . import operations as classes
+
+    klass = getattr(classes, name[0].upper() + name[1:], None)
+    if klass is None:
+        raise NotImplementedError("Unimplemented Operation %s" % name)
+
+    def encode(buf, data):
+        buf += bytes(klass(**data))
+
+    return encode
+
+
+def encoder_for(op):
+    """
+    Return the encoder of an operation.
+
+    :param op: Operation name, id or class of :mod:`deexbase.operations`
+
+    The encoder is compiled once from :data:`deexbase.schemas.operations` and
+    appends the wire format of an operation, given as a plain dict like to the
+    operation class, to a bytearray:
+
+    .. code-block:: python
+
+        encode = encoder_for("transfer")
+        buf = bytearray()
+        encode(buf, {"fee": ..., "from": "1.2.0", ...})
+        assert bytes(buf) == bytes(Transfer(**{"fee": ..., "from": "1.2.0", ...}))
+    """
+    if isinstance(op, type):
+        op = op.__name__.lower()
+    elif not isinstance(op, str):
+        op = operation_names[int(op)]
+    if op not in _encoders:
+        if op in schemas.operations:
+            fields = _struct(schemas.operations[op])
+
+            def encode(buf, data):
+                fields(buf, data, data.get("prefix", default_prefix))
+
+            _encoders[op] = encode
+        else:
+            _encoders[op] = _fallback(op)
+    return _encoders[op]
+
+
+def encode(type, value, prefix=default_prefix):
+    """
+    Encode a value of a type of :mod:`deexbase.schemas` to bytes.
+
+    :param type: Type, e.g. :data:`deexbase.schemas.PRICE_FEED`
+    :param value: Value as given to the class of the type
+    :param str prefix: Prefix of the public keys
+    """
+    buf = bytearray()
+    compile_type(type)(buf, value, prefix)
+    return bytes(buf)
+
+
+def encode_operation(op):
+    """Return the wire format of an operation ``[id or name, data]`` or of an
+    operation record (see :mod:`deexbase.records`), same as
+    ``bytes(Operation(op))``."""
+    buf = bytearray()
+    _encode_operation(buf, op, default_prefix)
+    return bytes(buf)
+
+
+_transaction = compile_type(schemas.TRANSACTION)
+_signatures = compile_type(schemas.array("signature"))
+
+
+def encode_transaction(
+    ref_block_num, ref_block_prefix, expiration, operations, signatures=None
+):
+    """
+    Return the wire format of a transaction.
+
+    :param int ref_block_num: See :class:`deexbase.signedtransactions.Signed_Transaction`
+    :param int ref_block_prefix: See :class:`deexbase.signedtransactions.Signed_Transaction`
+    :param str expiration: Expiration time
+    :param list operations: Operations as ``[id or name, data]``
+    :param list signatures: Signatures as hex strings, left out by default
+
+    Without signatures, this is the message that is signed (after the chain
+    id), with signatures the transaction as it is broadcast. Both equal the
+    bytes of :class:`deexbase.signedtransactions.Signed_Transaction`.
+    """
+    buf = bytearray()
+    _transaction(
+        buf,
+        dict(
+            ref_block_num=ref_block_num,
+            ref_block_prefix=ref_block_prefix,
+            expiration=expiration,
+            operations=operations,
+        ),
+        default_prefix,
+    )
+    if signatures is not None:
+        _signatures(buf, signatures, default_prefix)
+    return bytes(buf)
@@ -27,7 +27,7 @@ from graphenebase.types import (
 
 from .account import PublicKey
 from .objecttypes import object_type
-from .operationids import operations
+from .operationids import operation_names, operations
 
 
 default_prefix = "BTS"
@@ -41,6 +41,13 @@ class Operation(GrapheneOperation):
     module = "deexbase.operations"
     operations = operations
 
+    def getOperationNameForId(self, i):
+        """Convert an operation id into the corresponding string."""
+        try:
+            return operation_names[int(i)]
+        except KeyError:
+            raise ValueError("Unknown Operation ID %d" % i)
+
 
 class ObjectId(GPHObjectId):
     """Need to overwrite a few attributes to load proper object_types from deex."""
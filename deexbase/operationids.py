@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from types import MappingProxyType
+
 #: Operation ids
 ops = [
     "transfer",
@@ -56,15 +58,18 @@ ops = [
     "htlc_extend",
     "htlc_refund",
 ]
-operations = {o: ops.index(o) for o in ops}
+#: Operation ids by name (read-only)
+operations = MappingProxyType({o: i for i, o in enumerate(ops)})
+#: Operation names by id (read-only)
+operation_names = MappingProxyType(dict(enumerate(ops)))
 
 
 def getOperationNameForId(i):
     """Convert an operation id into the corresponding string."""
-    for key in operations:
-        if int(operations[key]) is int(i):
-            return key
-    return "Unknown Operation ID %d" % i
+    try:
+        return operation_names[int(i)]
+    except KeyError:
+        return "Unknown Operation ID %d" % i
 
 
 def getOperationName(id: str):
@@ -73,7 +78,7 @@ def getOperationName(id: str):
     if isinstance(id, str):
         # Some graphene chains (e.g. steem) do not encode the
         # operation_type as id but in its string form
-        assert id in operations.keys(), "Unknown operation {}".format(id)
+        assert id in operations, "Unknown operation {}".format(id)
         return id
     elif isinstance(id, int):
         return getOperationNameForId(id)
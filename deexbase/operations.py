@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from collections import OrderedDict
+from types import MappingProxyType
 
 from graphenebase.types import (
     Array,
@@ -45,40 +46,41 @@ from .objects import (
     isArgsThisClass,
     AssertPredicate,
 )
-from .operationids import operations
+from .operationids import getOperationNameForId, operations
 
 
 default_prefix = "BTS"
-class_idmap = {}
-class_namemap = {}
+#: Operation classes by id (read-only), filled on import
+class_idmap = MappingProxyType({})
+#: Operation ids by class name (read-only), filled on import
+class_namemap = MappingProxyType({})
 
 
 def fill_classmaps():
-    for name, ind in operations.items():
-        classname = name[0:1].upper() + name[1:]
-        class_namemap[classname] = ind
-        try:
-            class_idmap[ind] = globals()[classname]
-        except Exception:
-            continue
+    """Build :data:`class_idmap` and :data:`class_namemap` from the operation
+    classes of this module. This is done once on import, the maps are
+    read-only afterwards."""
+    global class_idmap, class_namemap
+    classes = {
+        klass.__name__: klass
+        for klass in GrapheneObject.__subclasses__()
+        if klass.__module__ == __name__
+    }
+    namemap = {name[0:1].upper() + name[1:]: ind for name, ind in operations.items()}
+    class_namemap = MappingProxyType(namemap)
+    class_idmap = MappingProxyType(
+        {ind: classes[name] for name, ind in namemap.items() if name in classes}
+    )
 
 
 def getOperationClassForId(op_id):
     """Convert an operation id into the corresponding class."""
-    return class_idmap[op_id] if op_id in class_idmap else None
+    return class_idmap.get(op_id)
 
 
 def getOperationIdForClass(name):
     """Convert an operation classname into the corresponding id."""
-    return class_namemap[name] if name in class_namemap else None
-
-
-def getOperationNameForId(i):
-    """Convert an operation id into the corresponding string."""
-    for key in operations:
-        if int(operations[key]) is int(i):
-            return key
-    return "Unknown Operation ID %d" % i
+    return class_namemap.get(name)
 
 
 class Transfer(GrapheneObject):
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+import builtins
+
+from graphenebase.objects import GrapheneObject
+
+from . import schemas
+from .objects import Operation
+from .operationids import operation_names, operations
+
+
+_classes = {}
+_operation_classes = {}
+
+#: Class names of the records of the structs of :mod:`deexbase.schemas`
+record_names = {
+    id(schemas.ASSET): "Asset",
+    id(schemas.PRICE): "Price",
+    id(schemas.PRICE_FEED): "PriceFeed",
+    id(schemas.PERMISSION): "Permission",
+    id(schemas.ACCOUNT_OPTIONS): "AccountOptions",
+    id(schemas.ASSET_OPTIONS): "AssetOptions",
+    id(schemas.BITASSET_OPTIONS): "BitAssetOptions",
+    id(schemas.OP_WRAPPER): "Op_wrapper",
+}
+
+
+class Record:
+    """
+    Compact record of a struct of :mod:`deexbase.schemas`.
+
+    Records keep their fields in slots and the values as they are given,
+    i.e. without a wrapper object per value and without a dict per instance.
+    Nested structs become records as well. ``bytes(record)`` serializes them
+    with :mod:`deexbase.encoders`, ``record.json()`` returns the data as dict.
+
+    The classes are made from the schemas by :func:`record_class` and
+    :func:`record_for`.
+    """
+
+    __slots__ = ()
+
+    #: Names of the fields
+    _fields = ()
+    #: ``(name, convert, required)`` of the fields
+    _converters = ()
+    #: Schema type of the record
+    _type = None
+
+    def __init__(self, *args, **kwargs):
+        if len(args) == 1 and not kwargs:
+            kwargs = args[0]
+        for name, convert, required in self._converters:
+            value = kwargs[name] if required else kwargs.get(name)
+            setattr(self, name, value if convert is None else convert(value))
+
+    @classmethod
+    def _make(cls, values):
+        """Create a record from the values of its fields, without conversion."""
+        self = cls.__new__(cls)
+        for name, value in zip(cls._fields, values):
+            setattr(self, name, value)
+        return self
+
+    def __getitem__(self, name):
+        if name not in self._fields:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name, default=None):
+        value = getattr(self, name, None) if name in self.__slots__ else None
+        return default if value is None else value
+
+    def __contains__(self, name):
+        return name in self._fields and getattr(self, name) is not None
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self):
+        return "{}({})".format(
+            self.__class__.__name__,
+            ", ".join(
+                "{}={!r}".format(name, getattr(self, name))
+                for name in self._fields
+                if getattr(self, name) is not None
+            ),
+        )
+
+    def __bytes__(self):
+        from .encoders import compile_type, default_prefix
+
+        buf = bytearray()
+        compile_type(self._type)(buf, self, default_prefix)
+        return bytes(buf)
+
+    def __json__(self):
+        return {
+            name: _json(getattr(self, name))
+            for name in self._fields
+            if getattr(self, name) is not None
+        }
+
+    json = __json__
+
+
+class OperationRecord(Record):
+    """Compact record of an operation, see :func:`record_for`.
+
+    The prefix of the public keys is kept in ``prefix``.
+    """
+
+    __slots__ = ()
+
+    #: Operation id
+    _id = None
+    #: Operation name
+    _name = None
+
+    def __init__(self, *args, **kwargs):
+        if len(args) == 1 and not kwargs:
+            kwargs = args[0]
+        super().__init__(kwargs)
+        self.prefix = kwargs.get("prefix")
+
+    @classmethod
+    def _make(cls, values, prefix=None):
+        self = super()._make(values)
+        self.prefix = prefix
+        return self
+
+    def __bytes__(self):
+        from .encoders import encoder_for
+
+        buf = bytearray()
+        encoder_for(self._name)(buf, self)
+        return bytes(buf)
+
+    def operation(self):
+        """Return the :class:`deexbase.objects.Operation` of the record."""
+        return Operation(_json(self))
+
+
+def _json(value):
+    if isinstance(value, OperationRecord):
+        data = value.json()
+        if value.prefix is not None:
+            data["prefix"] = value.prefix
+        return [value._id, data]
+    if isinstance(value, Record):
+        return value.json()
+    if isinstance(value, list):
+        return [_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _json(item) for key, item in value.items()}
+    return value
+
+
+def _required(type):
+    if isinstance(type, str):
+        return type not in ("extensions", "none")
+    return type[0] not in ("optional", "default")
+
+
+def _converter(type):
+    """Return a function that turns values of ``type`` into records, or
+    ``None`` if they are kept as they are."""
+    if isinstance(type, str):
+        return None
+    kind = type[0]
+    if kind == "struct":
+        klass = record_class(type)
+        return lambda value: (
+            klass(value)
+            if isinstance(value, dict) and not isinstance(value, GrapheneObject)
+            else value
+        )
+    if kind == "operation":
+        return lambda value: (
+            record_for(value[0])(value[1])
+            if isinstance(value, (list, tuple))
+            else value
+        )
+    if kind in ("optional", "default", "unprefixed"):
+        return _converter(type[1])
+    if kind == "array":
+        convert = _converter(type[1])
+        if convert is None:
+            return None
+        return lambda value: value if value is None else [convert(v) for v in value]
+    return None
+
+
+def _make_class(name, base, type, slots, **attributes):
+    fields = type[1]
+    klass = _classes[id(type)] = builtins.type(
+        name,
+        (base,),
+        dict(
+            attributes,
+            __slots__=tuple(name for name, _ in fields) + slots,
+            _fields=tuple(name for name, _ in fields),
+            _type=type,
+        ),
+    )
+    # The class is registered before the fields are compiled for nested types
+    klass._converters = tuple(
+        (name, _converter(field), _required(field)) for name, field in fields
+    )
+    return klass
+
+
+def record_class(type):
+    """
+    Return the record class of a struct of :mod:`deexbase.schemas`.
+
+    .. code-block:: python
+
+        Price = record_class(schemas.PRICE)
+        price = Price(base={"amount": 1, "asset_id": "1.3.0"}, quote=...)
+        price.base.amount
+    """
+    if id(type) not in _classes:
+        _make_class(record_names.get(id(type), "Record"), Record, type, ())
+    return _classes[id(type)]
+
+
+def record_for(op):
+    """
+    Return the record class of an operation.
+
+    :param op: Operation name, id or class of :mod:`deexbase.operations`
+
+    .. code-block:: python
+
+        Transfer = record_for("transfer")
+        op = Transfer({"fee": ..., "from": "1.2.0", ...})
+        bytes(op) == bytes(operations.Transfer(**{"fee": ..., "from": "1.2.0", ...}))
+    """
+    if isinstance(op, type):
+        op = op.__name__.lower()
+    elif not isinstance(op, str):
+        op = operation_names[int(op)]
+    if op not in _operation_classes:
+        if op not in schemas.operations:
+            raise NotImplementedError("Unimplemented Operation %s" % op)
+        _operation_classes[op] = _make_class(
+            op[0].upper() + op[1:],
+            OperationRecord,
+            schemas.struct(*schemas.operations[op]),
+            ("prefix",),
+            _id=operations[op],
+            _name=op,
+        )
+    return _operation_classes[op]
@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+"""
+Wire format of the operations and objects in :mod:`deexbase.operations` and
+:mod:`deexbase.objects`.
+
+A type is either the name of a primitive type (e.g. ``"uint16"``) or a tuple
+whose first element names a composite type:
+
+* ``("object_id", type)``: instance of an object id of the given object type
+* ``("optional", type, present)``: a flag and the value if it is set, an
+  empty value counts as unset. With ``present``, any value given counts as
+  set, otherwise only a truthy one
+* ``("array", type, sort)``: length and elements, ``sort`` orders the
+  elements first (it gets the elements and the key prefix)
+* ``("map", key, value, sort)``: length and key/value pairs, ``sort``
+  orders the pairs first
+* ``("default", type, value)``: ``type`` with ``value`` if it is not given
+* ``("unprefixed", type)``: ``type`` with public keys of the default prefix
+  of :class:`deexbase.account.PublicKey` instead of the prefix of the
+  operation
+* ``("struct", fields)``: ``(name, type)`` fields one after the other
+* ``("static_variant", types)``: index of the type and the value
+* ``("extension", options)``: the ``(name, type)`` options that are given
+* ``("memo",)``, ``("operation",)``: memo and operation
+
+An operation is a list of fields like a struct. The primitive types are
+the keys of :data:`deexbase.encoders.primitives`, of which ``"extensions"``
+is an empty set and ``"none"`` an unset optional, both ignore their value.
+"""
+
+from functools import lru_cache
+
+from .account import PublicKey
+
+
+def object_id(type):
+    return ("object_id", type)
+
+
+def optional(type, present=False):
+    return ("optional", type, present)
+
+
+def array(type, sort=None):
+    return ("array", type, sort)
+
+
+def mapping(key, value, sort=None):
+    return ("map", key, value, sort)
+
+
+def default(type, value):
+    return ("default", type, value)
+
+
+def unprefixed(type):
+    return ("unprefixed", type)
+
+
+def struct(*fields):
+    return ("struct", fields)
+
+
+def static_variant(*types):
+    return ("static_variant", types)
+
+
+def extension(*options):
+    return ("extension", options)
+
+
+MEMO = ("memo",)
+OPERATION = ("operation",)
+ACCOUNT = object_id("account")
+ASSET_ID = object_id("asset")
+
+
+@lru_cache(maxsize=1024)
+def _address(key, prefix):
+    return repr(PublicKey(key, prefix=prefix).address)
+
+
+# Same orders as the classes in deexbase.objects and deexbase.operations
+def _by_address(key_auths, prefix):
+    return sorted(key_auths, key=lambda x: _address(x[0], prefix))
+
+
+def _by_vote_instance(votes, prefix):
+    return sorted(list(set(votes)), key=lambda x: float(x.split(":")[1]))
+
+
+def _by_instance(ids, prefix):
+    return sorted(ids, key=lambda x: float(x.split(".")[2]))
+
+
+ASSET = struct(("amount", "int64"), ("asset_id", ASSET_ID))
+PRICE = struct(("base", ASSET), ("quote", ASSET))
+PRICE_FEED = struct(
+    ("settlement_price", PRICE),
+    ("maintenance_collateral_ratio", "uint16"),
+    ("maximum_short_squeeze_ratio", "uint16"),
+    ("core_exchange_rate", PRICE),
+)
+PERMISSION = struct(
+    ("weight_threshold", "uint32"),
+    ("account_auths", mapping(ACCOUNT, "uint16")),
+    ("key_auths", mapping("public_key", "uint16", _by_address)),
+    ("extensions", "extensions"),
+)
+ACCOUNT_OPTIONS = struct(
+    ("memo_key", "public_key"),
+    ("voting_account", ACCOUNT),
+    ("num_witness", "uint16"),
+    ("num_committee", "uint16"),
+    ("votes", array("vote_id", _by_vote_instance)),
+    ("extensions", "extensions"),
+)
+ASSET_OPTIONS = struct(
+    ("max_supply", "int64"),
+    ("market_fee_percent", "uint16"),
+    ("max_market_fee", "int64"),
+    ("issuer_permissions", "uint16"),
+    ("flags", "uint16"),
+    ("core_exchange_rate", PRICE),
+    ("whitelist_authorities", array(ACCOUNT)),
+    ("blacklist_authorities", array(ACCOUNT)),
+    ("whitelist_markets", array(ASSET_ID)),
+    ("blacklist_markets", array(ASSET_ID)),
+    ("description", "string"),
+    ("extensions", "extensions"),
+)
+BITASSET_OPTIONS = struct(
+    ("feed_lifetime_sec", "uint32"),
+    ("minimum_feeds", "uint8"),
+    ("force_settlement_delay_sec", "uint32"),
+    ("force_settlement_offset_percent", "uint16"),
+    ("maximum_force_settlement_volume", "uint16"),
+    ("short_backing_asset", ASSET_ID),
+    ("extensions", "extensions"),
+)
+WORKER_INITIALIZER = static_variant(
+    struct(), struct(("pay_vesting_period_days", "uint16")), struct()
+)
+SPECIAL_AUTHORITY = static_variant(
+    struct(), struct(("asset", ASSET_ID), ("num_top_holders", "uint8"))
+)
+ACCOUNT_CREATE_EXTENSIONS = extension(
+    ("null_ext", struct()),
+    ("owner_special_authority", SPECIAL_AUTHORITY),
+    ("active_special_authority", SPECIAL_AUTHORITY),
+    (
+        "buyback_options",
+        struct(
+            ("asset_to_buy", ASSET_ID),
+            ("asset_to_buy_issuer", ACCOUNT),
+            ("markets", array(ASSET_ID)),
+        ),
+    ),
+)
+CALL_ORDER_EXTENSION = extension(("target_collateral_ratio", "uint16"))
+ASSERT_PREDICATE = static_variant(
+    struct(("account_id", ACCOUNT), ("name", "string")),
+    struct(("asset_id", ASSET_ID), ("symbol", "string")),
+    struct(("id", "ripemd160")),
+)
+HTLC_HASH = static_variant("ripemd160", "sha1", "sha256")
+OP_WRAPPER = struct(("op", OPERATION))
+
+#: Fields of the operations by operation name
+operations = {
+    "transfer": [
+        ("fee", ASSET),
+        ("from", ACCOUNT),
+        ("to", ACCOUNT),
+        ("amount", ASSET),
+        ("memo", optional(MEMO)),
+        ("extensions", "extensions"),
+    ],
+    "limit_order_create": [
+        ("fee", ASSET),
+        ("seller", ACCOUNT),
+        ("amount_to_sell", ASSET),
+        ("min_to_receive", ASSET),
+        ("expiration", "time"),
+        ("fill_or_kill", "bool"),
+        ("extensions", "extensions"),
+    ],
+    "limit_order_cancel": [
+        ("fee", ASSET),
+        ("fee_paying_account", ACCOUNT),
+        ("order", object_id("limit_order")),
+        ("extensions", "extensions"),
+    ],
+    "call_order_update": [
+        ("fee", ASSET),
+        ("funding_account", ACCOUNT),
+        ("delta_collateral", ASSET),
+        ("delta_debt", ASSET),
+        ("extensions", CALL_ORDER_EXTENSION),
+    ],
+    "account_create": [
+        ("fee", ASSET),
+        ("registrar", ACCOUNT),
+        ("referrer", ACCOUNT),
+        ("referrer_percent", "uint16"),
+        ("name", "string"),
+        ("owner", PERMISSION),
+        ("active", PERMISSION),
+        ("options", ACCOUNT_OPTIONS),
+        ("extensions", ACCOUNT_CREATE_EXTENSIONS),
+    ],
+    "account_update": [
+        ("fee", ASSET),
+        ("account", ACCOUNT),
+        ("owner", optional(PERMISSION, present=True)),
+        ("active", optional(PERMISSION, present=True)),
+        ("new_options", optional(ACCOUNT_OPTIONS, present=True)),
+        ("extensions", "extensions"),
+    ],
+    "account_whitelist": [
+        ("fee", ASSET),
+        ("authorizing_account", ACCOUNT),
+        ("account_to_list", ACCOUNT),
+        ("new_listing", "uint8"),
+        ("extensions", "extensions"),
+    ],
+    "account_upgrade": [
+        ("fee", ASSET),
+        ("account_to_upgrade", ACCOUNT),
+        ("upgrade_to_lifetime_member", "bool"),
+        ("extensions", "extensions"),
+    ],
+    "asset_create": [
+        ("fee", ASSET),
+        ("issuer", ACCOUNT),
+        ("symbol", "string"),
+        ("precision", "uint8"),
+        ("common_options", ASSET_OPTIONS),
+        ("bitasset_opts", optional(BITASSET_OPTIONS)),
+        ("is_prediction_market", "bool"),
+        ("extensions", "extensions"),
+    ],
+    "asset_update": [
+        ("fee", ASSET),
+        ("issuer", ACCOUNT),
+        ("asset_to_update", ASSET_ID),
+        ("new_issuer", "none"),
+        ("new_options", ASSET_OPTIONS),
+        ("extensions", "extensions"),
+    ],
+    "asset_update_bitasset": [
+        ("fee", ASSET),
+        ("issuer", ACCOUNT),
+        ("asset_to_update", ASSET_ID),
+        ("new_options", BITASSET_OPTIONS),
+        ("extensions", "extensions"),
+    ],
+    "asset_update_feed_producers": [
+        ("fee", ASSET),
+        ("issuer", ACCOUNT),
+        ("asset_to_update", ASSET_ID),
+        ("new_feed_producers", array(ACCOUNT, _by_instance)),
+        ("extensions", "extensions"),
+    ],
+    "asset_issue": [
+        ("fee", ASSET),
+        ("issuer", ACCOUNT),
+        ("asset_to_issue", ASSET),
+        ("issue_to_account", ACCOUNT),
+        ("memo", optional(MEMO)),
+        ("extensions", "extensions"),
+    ],
+    "asset_reserve": [
+        ("fee", ASSET),
+        ("payer", ACCOUNT),
+        ("amount_to_reserve", ASSET),
+        ("extensions", "extensions"),
+    ],
+    "asset_fund_fee_pool": [
+        ("fee", ASSET),
+        ("from_account", ACCOUNT),
+        ("asset_id", ASSET_ID),
+        ("amount", "int64"),
+        ("extensions", "extensions"),
+    ],
+    "asset_settle": [
+        ("fee", ASSET),
+        ("account", ACCOUNT),
+        ("amount", ASSET),
+        ("extensions", "extensions"),
+    ],
+    "asset_global_settle": [
+        ("fee", ASSET),
+        ("issuer", ACCOUNT),
+        ("asset_to_settle", ASSET_ID),
+        ("settle_price", PRICE),
+        ("extensions", "extensions"),
+    ],
+    "asset_publish_feed": [
+        ("fee", ASSET),
+        ("publisher", ACCOUNT),
+        ("asset_id", ASSET_ID),
+        ("feed", PRICE_FEED),
+        ("extensions", "extensions"),
+    ],
+    "witness_update": [
+        ("fee", ASSET),
+        ("witness", object_id("witness")),
+        ("witness_account", ACCOUNT),
+        ("new_url", optional("string")),
+        ("new_signing_key", optional(unprefixed("public_key"))),
+    ],
+    "proposal_create": [
+        ("fee", ASSET),
+        ("fee_paying_account", ACCOUNT),
+        ("expiration_time", "time"),
+        ("proposed_ops", array(OP_WRAPPER)),
+        ("review_period_seconds", optional("uint32", present=True)),
+        ("extensions", "extensions"),
+    ],
+    "proposal_update": [
+        ("fee", ASSET),
+        ("fee_paying_account", ACCOUNT),
+        ("proposal", object_id("proposal")),
+        ("active_approvals_to_add", default(array(ACCOUNT), [])),
+        ("active_approvals_to_remove", default(array(ACCOUNT), [])),
+        ("owner_approvals_to_add", default(array(ACCOUNT), [])),
+        ("owner_approvals_to_remove", default(array(ACCOUNT), [])),
+        ("key_approvals_to_add", default(array(unprefixed("public_key")), [])),
+        ("key_approvals_to_remove", default(array(unprefixed("public_key")), [])),
+        ("extensions", "extensions"),
+    ],
+    "withdraw_permission_create": [
+        ("fee", ASSET),
+        ("withdraw_from_account", ACCOUNT),
+        ("authorized_account", ACCOUNT),
+        ("withdrawal_limit", ASSET),
+        ("withdrawal_period_sec", "uint32"),
+        ("periods_until_expiration", "uint32"),
+        ("period_start_time", "time"),
+    ],
+    "committee_member_create": [
+        ("fee", ASSET),
+        ("committee_member_account", ACCOUNT),
+        ("url", "string"),
+    ],
+    "vesting_balance_withdraw": [
+        ("fee", ASSET),
+        ("vesting_balance", object_id("vesting_balance")),
+        ("owner", ACCOUNT),
+        ("amount", ASSET),
+    ],
+    "worker_create": [
+        ("fee", ASSET),
+        ("owner", ACCOUNT),
+        ("work_begin_date", "time"),
+        ("work_end_date", "time"),
+        ("daily_pay", "uint64"),
+        ("name", "string"),
+        ("url", "string"),
+        ("initializer", WORKER_INITIALIZER),
+    ],
+    "custom": [
+        ("fee", ASSET),
+        ("payer", ACCOUNT),
+        ("required_auths", array(ACCOUNT)),
+        ("id", "uint16"),
+        ("data", "bytes"),
+    ],
+    "assert": [
+        ("fee", ASSET),
+        ("fee_paying_account", ACCOUNT),
+        ("predicates", array(ASSERT_PREDICATE)),
+        ("required_auths", array(ACCOUNT)),
+        ("extensions", "extensions"),
+    ],
+    "balance_claim": [
+        ("fee", ASSET),
+        ("deposit_to_account", ACCOUNT),
+        ("balance_to_claim", object_id("balance")),
+        ("balance_owner_key", "public_key"),
+        ("total_claimed", ASSET),
+    ],
+    "override_transfer": [
+        ("fee", ASSET),
+        ("issuer", ACCOUNT),
+        ("from", ACCOUNT),
+        ("to", ACCOUNT),
+        ("amount", ASSET),
+        ("memo", optional(unprefixed(MEMO), present=True)),
+        ("extensions", "extensions"),
+    ],
+    "asset_claim_fees": [
+        ("fee", ASSET),
+        ("issuer", ACCOUNT),
+        ("amount_to_claim", ASSET),
+        ("extensions", "extensions"),
+    ],
+    "bid_collateral": [
+        ("fee", ASSET),
+        ("bidder", ACCOUNT),
+        ("additional_collateral", ASSET),
+        ("debt_covered", ASSET),
+        ("extensions", "extensions"),
+    ],
+    "asset_claim_pool": [
+        ("fee", ASSET),
+        ("issuer", ACCOUNT),
+        ("asset_id", ASSET_ID),
+        ("amount_to_claim", ASSET),
+        ("extensions", "extensions"),
+    ],
+    "asset_update_issuer": [
+        ("fee", ASSET),
+        ("issuer", ACCOUNT),
+        ("asset_to_update", ASSET_ID),
+        ("new_issuer", ACCOUNT),
+        ("extensions", "extensions"),
+    ],
+    "htlc_create": [
+        ("fee", ASSET),
+        ("from", ACCOUNT),
+        ("to", ACCOUNT),
+        ("amount", ASSET),
+        ("preimage_hash", HTLC_HASH),
+        ("preimage_size", "uint16"),
+        ("claim_period_seconds", "uint32"),
+        ("extensions", "extensions"),
+    ],
+    "htlc_redeem": [
+        ("fee", ASSET),
+        ("htlc_id", object_id("htlc")),
+        ("redeemer", ACCOUNT),
+        ("preimage", "bytes"),
+        ("extensions", "extensions"),
+    ],
+    "htlc_extend": [
+        ("fee", ASSET),
+        ("htlc_id", object_id("htlc")),
+        ("update_issuer", ACCOUNT),
+        ("seconds_to_add", "uint32"),
+        ("extensions", "extensions"),
+    ],
+}
+
+#: Fields of a transaction, without the signatures
+TRANSACTION = struct(
+    ("ref_block_num", "uint16"),
+    ("ref_block_prefix", "uint32"),
+    ("expiration", "time"),
+    ("operations", array(OPERATION)),
+    ("extensions", "extensions"),
+)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from deex.aio import DeEx as AioDeEx
+from deex.aio.market import Market as AioMarket
+from deexapi.deexnoderpc import DeExNodeRPC
+from deexapi.aio.batch import Batch as AioBatch
+from deexapi.exceptions import UnhandledRPCError
+
+from .mocknode import MockNode
+
+
+class Testcases(unittest.TestCase):
+    def run_batch(self, node, mode=None):
+        rpc = DeExNodeRPC(node.url, num_retries=1)
+        try:
+            calls = node.calls
+            with rpc.batch(mode) as batch:
+                props = batch.get_dynamic_global_properties()
+                asset = batch.get_asset("USD")
+                account = batch.get_account("1.2.100")
+                missing = batch.get_witness("1.6.1")
+            self.assertEqual(props.result()["id"], "2.1.0")
+            self.assertEqual(asset.result()["id"], "1.3.121")
+            self.assertEqual(account.result()["name"], "init0")
+            with self.assertRaises(UnhandledRPCError):
+                missing.result()
+            return node.calls - calls, rpc
+        finally:
+            rpc.connection.disconnect()
+
+    def test_pipeline(self):
+        with MockNode() as node:
+            calls, _ = self.run_batch(node)
+        self.assertEqual(calls, 4)
+
+    def test_array(self):
+        with MockNode(batches=True) as node:
+            calls, rpc = self.run_batch(node, "array")
+        self.assertEqual(calls, 4)
+        self.assertTrue(rpc._batch_arrays)
+
+    def test_array_fallback(self):
+        with MockNode() as node:
+            calls, rpc = self.run_batch(node, "array")
+        self.assertEqual(calls, 4)
+        self.assertFalse(rpc._batch_arrays)
+
+    def test_aio(self):
+        node = MockNode()
+        pending = []
+
+        class Rpc:
+            # Replies are held back until every call of the batch is pending
+            def __getattr__(self, name):
+                async def method(*args):
+                    pending.append(name)
+                    while len(pending) < 2:
+                        await asyncio.sleep(0)
+                    return node.call(name, list(args))
+
+                return method
+
+        async def run():
+            async with AioBatch(Rpc()) as batch:
+                props = batch.get_dynamic_global_properties()
+                asset = batch.get_asset("1.3.121")
+            return props.result(), asset.result()
+
+        props, asset = asyncio.run(run())
+        self.assertEqual(props["id"], "2.1.0")
+        self.assertEqual(asset["symbol"], "USD")
+
+    def test_aio_ticker(self):
+        node = MockNode()
+
+        class Rpc:
+            def batch(self):
+                return AioBatch(self)
+
+            async def get_object(self, id):
+                return node.call("get_objects", [[id]])[0]
+
+            async def get_asset(self, name):
+                if len(name.split(".")) == 3:
+                    return await self.get_object(name)
+                return node.call("lookup_asset_symbols", [[name]])[0]
+
+            def __getattr__(self, name):
+                async def method(*args, **kwargs):
+                    return node.call(name, list(args))
+
+                return method
+
+        async def run():
+            deex = AioDeEx(nobroadcast=True)
+            deex.rpc = Rpc()
+            # USD is a bitasset, its bitasset data is fetched in the batch
+            market = await AioMarket("USD:DEEX", blockchain_instance=deex)
+            self.assertIn("bitasset_data_id", market["quote"])
+            return await market.ticker()
+
+        ticker = asyncio.run(run())
+        self.assertEqual(ticker["latest"]["price"], 0.05)
+        self.assertIn("quoteSettlement_price", ticker)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from deexapi.cache import ResponseCache
+from deexapi.deexnoderpc import DeExNodeRPC
+
+from .mocknode import MockNode
+
+
+class Testcases(unittest.TestCase):
+    def test_policies(self):
+        cache = ResponseCache(
+            {"get_config": "immutable", "get_ticker": "block", "get_objects": 0},
+            maxsize=2,
+        )
+        self.assertNotIn("get_order_book", cache)
+        cache.put("get_config", (), {}, {"prefix": "DX"})
+        self.assertEqual(cache.get("get_config", (), {}), (True, {"prefix": "DX"}))
+
+        cache.new_head_block(10)
+        cache.put("get_ticker", ("1.3.0", "1.3.121"), {}, "ticker")
+        self.assertTrue(cache.get("get_ticker", ("1.3.0", "1.3.121"), {})[0])
+        self.assertFalse(cache.get("get_ticker", ("1.3.0", "1.3.120"), {})[0])
+        cache.on_block("0000000b" + "0" * 32)
+        self.assertFalse(cache.get("get_ticker", ("1.3.0", "1.3.121"), {})[0])
+
+        # Expired right away
+        cache.put("get_objects", (["2.1.0"],), {}, [])
+        self.assertFalse(cache.get("get_objects", (["2.1.0"],), {})[0])
+
+        # Least recently used results are evicted
+        cache.put("get_ticker", ("1.3.0", "1.3.121"), {}, "ticker")
+        cache.put("get_ticker", ("1.3.0", "1.3.120"), {}, "ticker")
+        self.assertEqual(len(cache), 2)
+        self.assertFalse(cache.get("get_config", (), {})[0])
+
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["methods"]["get_config"]["hits"], 1)
+        self.assertEqual(stats["methods"]["get_ticker"]["misses"], 2)
+
+        with self.assertRaises(ValueError):
+            ResponseCache({"get_ticker": "forever"})
+
+    def test_block_ttl(self):
+        cache = ResponseCache({"get_ticker": "block"}, block_ttl=0)
+        # Without head blocks, results expire after block_ttl
+        cache.put("get_ticker", (), {}, "ticker")
+        self.assertFalse(cache.get("get_ticker", (), {})[0])
+        # With head blocks, they expire after block_ttl as well
+        cache.new_head_block(10)
+        cache.put("get_ticker", (), {}, "ticker")
+        self.assertFalse(cache.get("get_ticker", (), {})[0])
+
+        # or with the next block, whatever comes first
+        cache.block_ttl = 60
+        cache.put("get_ticker", (), {}, "ticker")
+        self.assertEqual(cache.get("get_ticker", (), {}), (True, "ticker"))
+        cache.new_head_block(11)
+        self.assertFalse(cache.get("get_ticker", (), {})[0])
+
+    def test_rpc_cache(self):
+        with MockNode() as node:
+            rpc = DeExNodeRPC(node.url, num_retries=1, cache=True)
+            try:
+                calls = node.calls
+                for _ in range(3):
+                    rpc.get_ticker("1.3.0", "1.3.121")
+                    rpc.lookup_asset_symbols(["USD"])
+                self.assertEqual(node.calls - calls, 2)
+
+                # A new head block invalidates the ticker
+                props = rpc.get_dynamic_global_properties()
+                rpc.cache.new_head_block(props["head_block_number"] + 1)
+                rpc.get_ticker("1.3.0", "1.3.121")
+                rpc.lookup_asset_symbols(["USD"])
+                self.assertEqual(node.calls - calls, 4)
+                self.assertEqual(rpc.cache.stats()["hits"], 5)
+            finally:
+                rpc.connection.disconnect()
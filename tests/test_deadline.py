@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+import unittest
+
+from deex import DeEx
+from deex.exceptions import DeadlineExceeded
+from deex.market import Market
+from deexapi.deadline import deadline, get_deadline, remaining, with_deadline
+from deexapi.deexnoderpc import DeExNodeRPC
+
+from .mocknode import MockNode
+
+
+class Testcases(unittest.TestCase):
+    def test_nesting(self):
+        self.assertIsNone(remaining())
+        with deadline(10) as outer:
+            with deadline(20):
+                self.assertEqual(get_deadline(), outer)
+            with deadline(0.01):
+                self.assertLess(remaining(), 0.02)
+                time.sleep(0.02)
+                with self.assertRaises(DeadlineExceeded):
+                    remaining()
+            self.assertEqual(get_deadline(), outer)
+        self.assertIsNone(get_deadline())
+
+    def test_rpc(self):
+        with MockNode() as node:
+            rpc = DeExNodeRPC(node.url, num_retries=1)
+            node.latency = 0.3
+            start = time.monotonic()
+            with self.assertRaises(DeadlineExceeded):
+                with deadline(0.05):
+                    rpc.get_objects(["2.1.0"])
+            self.assertLess(time.monotonic() - start, 0.25)
+            self.assertEqual(rpc.nodes.stats[node.url].errors, 0)
+
+            # The late reply of the abandoned call is not mistaken for this one
+            node.latency = 0
+            self.assertEqual(rpc.get_objects(["1.3.0"])[0]["id"], "1.3.0")
+
+    def test_reconnect_login(self):
+        with MockNode() as node:
+            rpc = DeExNodeRPC(node.url, "user", "password", num_retries=1)
+            node.latency = 0.3
+            with self.assertRaises(DeadlineExceeded):
+                with deadline(0.05):
+                    rpc.get_objects(["2.1.0"])
+
+            # The timeout dropped the connection, logging in again on the
+            # reconnect must not wait for the lock of the call
+            node.latency = 0
+            results = []
+            thread = threading.Thread(
+                target=lambda: results.append(rpc.get_objects(["1.3.0"])),
+                daemon=True,
+            )
+            thread.start()
+            thread.join(5)
+            self.assertEqual(results[0][0]["id"], "1.3.0")
+
+    def test_threads(self):
+        with MockNode() as node:
+            rpc = DeExNodeRPC(node.url, num_retries=1)
+            node.latency = 0.3
+            results = {}
+
+            def call(name, timeout=None):
+                try:
+                    with deadline(timeout):
+                        results[name] = rpc.get_objects(["2.1.0"])[0]["id"]
+                except DeadlineExceeded as e:
+                    results[name] = e
+
+            # The calls wait for each other, the timeouts of the calls without
+            # deadline must neither cut the call with deadline nor extend it
+            threads = [
+                threading.Thread(target=call, args=("first",)),
+                threading.Thread(target=call, args=("hurried", 0.15)),
+                threading.Thread(target=call, args=("last",)),
+            ]
+            for thread in threads:
+                thread.start()
+                time.sleep(0.05)
+            for thread in threads:
+                thread.join()
+            self.assertEqual(results["first"], "2.1.0")
+            self.assertEqual(results["last"], "2.1.0")
+            self.assertIsInstance(results["hurried"], DeadlineExceeded)
+            self.assertEqual(rpc.nodes.stats[node.url].errors, 0)
+
+    def test_market(self):
+        with MockNode() as node:
+            deex = DeEx(node.url, nobroadcast=True, num_retries=1)
+            market = Market("USD:DEEX", blockchain_instance=deex)
+            self.assertIn("bids", market.orderbook(timeout=1))
+            node.latency = 0.3
+            with self.assertRaises(DeadlineExceeded):
+                market.orderbook(timeout=0.05)
+
+    def test_coroutine(self):
+        @with_deadline
+        async def left():
+            return remaining()
+
+        self.assertLessEqual(asyncio.run(left(timeout=1)), 1)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import copy
+import unittest
+
+from deexbase import objects, schemas
+from deexbase.account import PrivateKey
+from deexbase.decoders import decode, decode_operation, decode_transaction
+from deexbase.encoders import encode, encode_operation, encode_transaction
+from deexbase.objects import Operation
+from deexbase.signedtransactions import Signed_Transaction
+
+from .test_encoders import (
+    account_options,
+    asset_options,
+    bitasset_options,
+    expiration,
+    memo,
+    permission,
+    price,
+    ref_block_num,
+    ref_block_prefix,
+    test_operations,
+)
+
+
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+prefix = "DX"
+
+
+class Testcases(unittest.TestCase):
+    def test_operations(self):
+        for op in test_operations:
+            raw = encode_operation(op)
+            decoded = decode_operation(raw, prefix=prefix)
+            self.assertEqual(decoded[0], Operation(copy.deepcopy(op)).id, op[0])
+            self.assertEqual(encode_operation(decoded), raw, op[0])
+            self.assertEqual(bytes(Operation(decoded)), raw, op[0])
+            self.assertEqual(
+                bytes(decode_operation(raw, prefix=prefix, objects=True)), raw, op[0]
+            )
+
+    def test_operation_data(self):
+        op = test_operations[2]
+        self.assertEqual(
+            decode_operation(encode_operation(op)),
+            [
+                1,
+                {
+                    "fee": {"amount": 100, "asset_id": "1.3.0"},
+                    "seller": "1.2.29",
+                    "amount_to_sell": {"amount": 100000, "asset_id": "1.3.0"},
+                    "min_to_receive": {"amount": 10000, "asset_id": "1.3.105"},
+                    "expiration": "2016-05-18T09:22:05",
+                    "fill_or_kill": True,
+                    "extensions": [],
+                },
+            ],
+        )
+        _, data = decode_operation(encode_operation(test_operations[0]), prefix)
+        self.assertEqual(data["memo"], dict(memo, nonce=int(memo["nonce"])))
+        self.assertEqual(data["prefix"], prefix)
+        _, data = decode_operation(encode_operation(test_operations[1]), prefix)
+        self.assertNotIn("memo", data)
+        _, data = decode_operation(encode_operation(test_operations[4]))
+        self.assertEqual(data["extensions"], {"target_collateral_ratio": 12345})
+        _, data = decode_operation(encode_operation(test_operations[5]), prefix)
+        self.assertEqual(
+            data["extensions"]["owner_special_authority"],
+            [1, {"asset": "1.3.127", "num_top_holders": 10}],
+        )
+
+    def test_objects(self):
+        cases = [
+            (schemas.PRICE, objects.Price(price)),
+            (schemas.PRICE_FEED, objects.PriceFeed(test_operations[11][1]["feed"])),
+            (schemas.PERMISSION, objects.Permission(permission, prefix=prefix)),
+            (
+                schemas.ACCOUNT_OPTIONS,
+                objects.AccountOptions(account_options, prefix=prefix),
+            ),
+            (schemas.ASSET_OPTIONS, objects.AssetOptions(asset_options)),
+            (schemas.BITASSET_OPTIONS, objects.BitAssetOptions(bitasset_options)),
+            (schemas.WORKER_INITIALIZER, objects.Worker_initializer([2, {}])),
+            (
+                schemas.SPECIAL_AUTHORITY,
+                objects.SpecialAuthority([1, {"asset": "1.3.1", "num_top_holders": 3}]),
+            ),
+            (
+                schemas.ACCOUNT_CREATE_EXTENSIONS,
+                objects.AccountCreateExtensions({"null_ext": {}}),
+            ),
+            (
+                schemas.CALL_ORDER_EXTENSION,
+                objects.CallOrderExtension({"target_collateral_ratio": 1750}),
+            ),
+            (
+                schemas.ASSERT_PREDICATE,
+                objects.AssertPredicate([1, {"asset_id": "1.3.1", "symbol": "USD"}]),
+            ),
+            (schemas.MEMO, objects.Memo(dict(memo, prefix=prefix))),
+        ]
+        for type, obj in cases:
+            raw = bytes(obj)
+            value = decode(type, raw, prefix)
+            self.assertEqual(encode(type, value, prefix), raw, obj)
+        self.assertEqual(decode(schemas.PRICE, bytes(objects.Price(price))), price)
+
+    def test_transaction(self):
+        ops = [Operation(copy.deepcopy(op)) for op in test_operations]
+        tx = Signed_Transaction(
+            ref_block_num=ref_block_num,
+            ref_block_prefix=ref_block_prefix,
+            expiration=expiration,
+            operations=ops,
+        )
+        tx = tx.sign([wif], chain=prefix)
+        raw = bytes(tx)
+
+        decoded = decode_transaction(raw, prefix=prefix)
+        self.assertEqual(decoded["ref_block_num"], ref_block_num)
+        self.assertEqual(decoded["expiration"], expiration)
+        self.assertEqual(len(decoded["operations"]), len(test_operations))
+        self.assertEqual(len(decoded["signatures"]), 1)
+        self.assertEqual(
+            encode_transaction(
+                decoded["ref_block_num"],
+                decoded["ref_block_prefix"],
+                decoded["expiration"],
+                decoded["operations"],
+                decoded["signatures"],
+            ),
+            raw,
+        )
+
+        tx = decode_transaction(raw, prefix=prefix, objects=True)
+        self.assertEqual(bytes(tx), raw)
+        tx.verify([PrivateKey(wif).pubkey], prefix)
+
+        unsigned = decode_transaction(
+            encode_transaction(
+                ref_block_num, ref_block_prefix, expiration, test_operations
+            ),
+            prefix=prefix,
+        )
+        self.assertNotIn("signatures", unsigned)
+
+    def test_errors(self):
+        raw = encode_operation(test_operations[0])
+        with self.assertRaises(ValueError):
+            decode_operation(raw[:-1])
+        with self.assertRaises(ValueError):
+            decode_operation(raw + b"\x00")
+        with self.assertRaises(ValueError):
+            decode_operation(b"\x7f" + raw[1:])
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import unittest
+
+import pytest
+
+from deexapi.dispatch import Dispatcher
+from deexapi.aio.dispatch import Dispatcher as AioDispatcher
+
+
+class Testcases(unittest.TestCase):
+    def test_ordering(self):
+        received = []
+        dispatcher = Dispatcher(workers=4)
+        for i in range(100):
+            dispatcher.submit("on_market", received.append, i)
+        dispatcher.stop()
+        self.assertEqual(received, list(range(100)))
+        self.assertEqual(dispatcher.metrics()["dispatched"], 100)
+        self.assertEqual(dispatcher.depth, 0)
+
+    def test_drop(self):
+        release = threading.Event()
+        received = []
+        dispatcher = Dispatcher(workers=1, maxsize=2, policy="drop")
+        dispatcher.submit("key", release.wait)
+        # Wait for the worker to pick up the blocking call
+        while dispatcher.depth:
+            pass
+        self.assertTrue(dispatcher.submit("key", received.append, 1))
+        self.assertTrue(dispatcher.submit("key", received.append, 2))
+        self.assertFalse(dispatcher.submit("key", received.append, 3))
+        release.set()
+        dispatcher.stop()
+        self.assertEqual(received, [1, 2])
+        self.assertEqual(dispatcher.metrics()["dropped"], 1)
+
+    def test_coalesce(self):
+        release = threading.Event()
+        received = []
+        dispatcher = Dispatcher(workers=1, policy="coalesce")
+        dispatcher.submit("key", release.wait)
+        for version in range(5):
+            dispatcher.submit(
+                "key", received.append, ("2.1.0", version), coalesce_key="2.1.0"
+            )
+        dispatcher.submit("key", received.append, ("2.1.1", 0), coalesce_key="2.1.1")
+        release.set()
+        dispatcher.stop()
+        self.assertEqual(received, [("2.1.0", 4), ("2.1.1", 0)])
+        self.assertEqual(dispatcher.metrics()["coalesced"], 4)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            Dispatcher(policy="foobar")
+
+
+@pytest.mark.asyncio
+async def test_aio_dispatcher():
+    received = []
+    dispatcher = AioDispatcher(workers=2, maxsize=10)
+    for i in range(20):
+        dispatcher.submit("on_block", received.append, i)
+    assert dispatcher.depth == 20
+    await asyncio.wait_for(dispatcher.wait_for_space(), 1)
+    assert dispatcher.depth < 10
+    await dispatcher.stop()
+    assert received == list(range(20))
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+import copy
+import unittest
+
+from binascii import hexlify
+
+from deexbase import objects, operations
+from deexbase.encoders import encode_operation, encode_transaction, encoder_for
+from deexbase.objects import Operation
+from deexbase.signedtransactions import Signed_Transaction
+
+
+ref_block_num = 34294
+ref_block_prefix = 3707022213
+expiration = "2016-04-06T08:29:27"
+
+fee = {"amount": 100, "asset_id": "1.3.0"}
+key1 = "DX6pbVDAjRFiw6fkiKYCrkz7PFeL7XNAfefrsREwg8MKpJ9VYV9x"
+key2 = "DX6zLNtyFVToBsBZDsgMhgjpwysYVbsQD6YhP3kRkQhANUB4w7Qp"
+key3 = "DX8CemMDjdUWSV5wKotEimhK6c4dY7p2PdzC2qM1HpAP8aLtZfE7"
+memo_key = "DX5TPTziKkLexhVKsQKtSpo4bAv5RnB8oXcG4sMHEwCcTf3r7dqE"
+price = {
+    "base": {"amount": 1241, "asset_id": "1.3.0"},
+    "quote": {"amount": 6231, "asset_id": "1.3.14"},
+}
+permission = {
+    "weight_threshold": 1,
+    "account_auths": [["1.2.96086", 1]],
+    "key_auths": [[key3, 1], [key1, 1], [key2, 2]],
+    "address_auths": [],
+}
+account_options = {
+    "memo_key": memo_key,
+    "voting_account": "1.2.5",
+    "num_witness": 1,
+    "num_committee": 1,
+    "votes": ["1:25", "0:11", "1:25"],
+    "extensions": [],
+}
+asset_options = {
+    "max_supply": "1000000000000000",
+    "market_fee_percent": 0,
+    "max_market_fee": "1000000000000000",
+    "issuer_permissions": 79,
+    "flags": 0,
+    "core_exchange_rate": price,
+    "whitelist_authorities": ["1.2.0"],
+    "blacklist_authorities": ["1.2.1"],
+    "whitelist_markets": ["1.3.0"],
+    "blacklist_markets": ["1.3.1"],
+    "description": "Foobar think",
+    "extensions": [],
+}
+bitasset_options = {
+    "feed_lifetime_sec": 86400,
+    "minimum_feeds": 7,
+    "force_settlement_delay_sec": 86400,
+    "force_settlement_offset_percent": 100,
+    "maximum_force_settlement_volume": 50,
+    "short_backing_asset": "1.3.0",
+    "extensions": [],
+}
+memo = {
+    "from": memo_key,
+    "to": key1,
+    "nonce": "5862723643998573708",
+    "message": "8c94d19817945c5120fa5b6e83079a87",
+}
+
+test_operations = [
+    [
+        "transfer",
+        {
+            "fee": fee,
+            "from": "1.2.0",
+            "to": "1.2.1",
+            "amount": {"amount": 1000000, "asset_id": "1.3.4"},
+            "memo": memo,
+            "prefix": "DX",
+        },
+    ],
+    [
+        "transfer",
+        {
+            "fee": fee,
+            "from": "1.2.0",
+            "to": "1.2.1",
+            "amount": {"amount": 1000000, "asset_id": "1.3.4"},
+        },
+    ],
+    [
+        "limit_order_create",
+        {
+            "fee": fee,
+            "seller": "1.2.29",
+            "amount_to_sell": {"amount": 100000, "asset_id": "1.3.0"},
+            "min_to_receive": {"amount": 10000, "asset_id": "1.3.105"},
+            "expiration": "2016-05-18T09:22:05",
+            "fill_or_kill": True,
+            "extensions": [],
+        },
+    ],
+    [
+        "limit_order_cancel",
+        {
+            "fee": fee,
+            "fee_paying_account": "1.2.104",
+            "order": "1.7.51840",
+            "extensions": [],
+        },
+    ],
+    [
+        "call_order_update",
+        {
+            "fee": fee,
+            "delta_debt": {"amount": 10000, "asset_id": "1.3.22"},
+            "delta_collateral": {"amount": -100000000, "asset_id": "1.3.0"},
+            "funding_account": "1.2.29",
+            "extensions": {"target_collateral_ratio": 12345},
+        },
+    ],
+    [
+        "account_create",
+        {
+            "fee": fee,
+            "registrar": "1.2.33",
+            "referrer": "1.2.27",
+            "referrer_percent": 3,
+            "name": "foobar-f124",
+            "owner": permission,
+            "active": permission,
+            "options": account_options,
+            "extensions": {
+                "buyback_options": {
+                    "asset_to_buy": "1.3.127",
+                    "asset_to_buy_issuer": "1.2.31",
+                    "markets": ["1.3.20"],
+                },
+                "null_ext": {},
+                "owner_special_authority": [
+                    1,
+                    {"asset": "1.3.127", "num_top_holders": 10},
+                ],
+            },
+            "prefix": "DX",
+        },
+    ],
+    [
+        "account_update",
+        {
+            "fee": fee,
+            "account": "1.2.15",
+            "active": permission,
+            "new_options": account_options,
+            "extensions": {},
+            "prefix": "DX",
+        },
+    ],
+    [
+        "asset_create",
+        {
+            "fee": fee,
+            "issuer": "1.2.0",
+            "symbol": "THING",
+            "precision": 0,
+            "common_options": asset_options,
+            "bitasset_opts": bitasset_options,
+            "is_prediction_market": False,
+            "extensions": [],
+        },
+    ],
+    [
+        "asset_update",
+        {
+            "fee": fee,
+            "issuer": "1.2.0",
+            "asset_to_update": "1.3.0",
+            "new_options": asset_options,
+            "extensions": [],
+        },
+    ],
+    [
+        "asset_update_feed_producers",
+        {
+            "fee": fee,
+            "issuer": "1.2.214",
+            "asset_to_update": "1.3.132",
+            "new_feed_producers": ["1.2.214", "1.2.341", "1.2.2414"],
+            "extensions": [],
+        },
+    ],
+    [
+        "asset_issue",
+        {
+            "fee": fee,
+            "issuer": "1.2.0",
+            "asset_to_issue": {"amount": 1, "asset_id": "1.3.4"},
+            "issue_to_account": "1.2.1",
+            "memo": memo,
+            "prefix": "DX",
+        },
+    ],
+    [
+        "asset_publish_feed",
+        {
+            "fee": fee,
+            "publisher": "1.2.0",
+            "asset_id": "1.3.3",
+            "feed": {
+                "settlement_price": price,
+                "core_exchange_rate": price,
+                "maximum_short_squeeze_ratio": 1100,
+                "maintenance_collateral_ratio": 1750,
+            },
+        },
+    ],
+    [
+        "proposal_create",
+        {
+            "fee": fee,
+            "fee_paying_account": "1.2.0",
+            "expiration_time": "1970-01-01T00:00:00",
+            "proposed_ops": [
+                {
+                    "op": [
+                        0,
+                        {
+                            "fee": fee,
+                            "from": "1.2.0",
+                            "to": "1.2.0",
+                            "amount": {"amount": 0, "asset_id": "1.3.0"},
+                            "extensions": [],
+                        },
+                    ]
+                }
+            ],
+            "review_period_seconds": 0,
+            "extensions": [],
+        },
+    ],
+    [
+        "proposal_update",
+        {
+            "fee_paying_account": "1.2.1",
+            "proposal": "1.10.90",
+            "active_approvals_to_add": ["1.2.5"],
+            "fee": fee,
+        },
+    ],
+    [
+        "worker_create",
+        {
+            "fee": fee,
+            "owner": "1.2.0",
+            "work_begin_date": "2016-04-06T08:29:27",
+            "work_end_date": "2017-04-06T08:29:27",
+            "daily_pay": 1000,
+            "name": "worker",
+            "url": "",
+            "initializer": [1, {"pay_vesting_period_days": 7}],
+        },
+    ],
+    [
+        "custom",
+        {
+            "fee": fee,
+            "payer": "1.2.0",
+            "required_auths": ["1.2.100", "1.2.101"],
+            "id": "35235",
+            "data": hexlify(b"Foobar").decode("ascii"),
+        },
+    ],
+    [
+        "balance_claim",
+        {
+            "fee": fee,
+            "deposit_to_account": "1.2.121",
+            "balance_to_claim": "1.15.0",
+            "balance_owner_key": key1,
+            "total_claimed": {"amount": 1, "asset_id": "1.3.0"},
+            "prefix": "DX",
+        },
+    ],
+    [
+        "htlc_create",
+        {
+            "fee": fee,
+            "from": "1.2.123",
+            "to": "1.2.124",
+            "amount": {"amount": 1123456, "asset_id": "1.3.0"},
+            "preimage_hash": [2, "ab" * 32],
+            "preimage_size": 200,
+            "claim_period_seconds": 120,
+            "extensions": [],
+        },
+    ],
+    [
+        "assert",
+        {
+            "fee": fee,
+            "fee_paying_account": "1.2.4",
+            "predicates": [
+                [0, {"account_id": "1.2.2414", "name": "foobar"}],
+                [1, {"asset_id": "1.3.2424", "symbol": "USD"}],
+                [2, {"id": "0260c042666dd23b6c380f55be2eaae0086f643f"}],
+            ],
+            "required_auths": ["1.2.124124"],
+            "extensions": [],
+        },
+    ],
+]
+
+
+class Testcases(unittest.TestCase):
+    def test_operations(self):
+        for op in test_operations:
+            expected = bytes(Operation(copy.deepcopy(op)))
+            self.assertEqual(encode_operation(copy.deepcopy(op)), expected, op[0])
+            self.assertEqual(encode_operation([op[0], op[1]]), expected, op[0])
+
+    def test_operation_by_id(self):
+        op = test_operations[2]
+        self.assertEqual(
+            encode_operation([1, op[1]]), bytes(Operation(copy.deepcopy(op)))
+        )
+
+    def test_encoder_for(self):
+        op = test_operations[3]
+        for key in ("limit_order_cancel", 2, operations.Limit_order_cancel):
+            buf = bytearray(b"\xff")
+            encoder_for(key)(buf, op[1])
+            self.assertEqual(
+                bytes(buf), b"\xff" + bytes(operations.Limit_order_cancel(**op[1]))
+            )
+
+    def test_objects_in_data(self):
+        op = operations.Asset_publish_feed(
+            fee=objects.Asset(amount=100, asset_id="1.3.0"),
+            publisher="1.2.0",
+            asset_id="1.3.3",
+            feed=objects.PriceFeed(test_operations[11][1]["feed"]),
+        )
+        self.assertEqual(
+            encode_operation(["asset_publish_feed", op]), bytes(Operation(op))
+        )
+        self.assertEqual(encode_operation(op), bytes(Operation(op)))
+
+    def test_transaction(self):
+        ops = [copy.deepcopy(op) for op in test_operations]
+        tx = Signed_Transaction(
+            ref_block_num=ref_block_num,
+            ref_block_prefix=ref_block_prefix,
+            expiration=expiration,
+            operations=[Operation(copy.deepcopy(op)) for op in ops],
+        )
+        wire = encode_transaction(
+            ref_block_num, ref_block_prefix, expiration, ops, signatures=[]
+        )
+        self.assertEqual(wire, bytes(tx))
+        self.assertEqual(
+            encode_transaction(ref_block_num, ref_block_prefix, expiration, ops),
+            wire[:-1],
+        )
+
+    def test_wire_format(self):
+        # Same as in test_transactions, without the signature
+        op = [
+            "limit_order_create",
+            {
+                "fee": {"amount": 100, "asset_id": "1.3.0"},
+                "seller": "1.2.29",
+                "amount_to_sell": {"amount": 100000, "asset_id": "1.3.0"},
+                "min_to_receive": {"amount": 10000, "asset_id": "1.3.105"},
+                "expiration": "2016-05-18T09:22:05",
+                "fill_or_kill": False,
+                "extensions": [],
+            },
+        ]
+        self.assertEqual(
+            hexlify(
+                encode_transaction(
+                    ref_block_num, ref_block_prefix, expiration, [op], signatures=[]
+                )
+            ).decode("ascii"),
+            "f68585abf4dce7c8045701016400000000000000001da08601000"
+            "0000000001027000000000000693d343c5700000000",
+        )
+
+    def test_errors(self):
+        op = copy.deepcopy(test_operations[3])
+        op[1]["order"] = "1.2.51840"
+        with self.assertRaises(AssertionError):
+            encode_operation(op)
+        del op[1]["order"]
+        with self.assertRaises(KeyError):
+            encode_operation(op)
+        with self.assertRaises(NotImplementedError):
+            encode_operation(["fill_order", {}])
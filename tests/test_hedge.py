@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import time
+import unittest
+
+from deexapi.hedge import Hedger
+from deexapi.pool import DeExNodeRPCPool
+
+from .mocknode import MockNode
+
+
+class Testcases(unittest.TestCase):
+    def test_delay(self):
+        hedger = Hedger(["get_objects"], percentile=0.9, initial_delay=1)
+        self.assertIn("get_objects", hedger)
+        self.assertNotIn("broadcast_transaction", hedger)
+        self.assertEqual(hedger.delay("get_objects"), 1)
+        for i in range(20):
+            hedger.record("get_objects", i / 100)
+        self.assertEqual(hedger.delay("get_objects"), 0.18)
+        self.assertEqual(hedger.stats()["get_objects"]["calls"], 20)
+
+    def test_hedge(self):
+        with MockNode() as fast, MockNode(latency=0.5) as slow:
+            rpc = DeExNodeRPCPool(
+                [fast.url, slow.url],
+                pool_size=2,
+                num_retries=1,
+                hedge=Hedger(initial_delay=0.05),
+            )
+            try:
+                # The idle connection to the slow node is taken first
+                start = time.monotonic()
+                self.assertEqual(rpc.get_objects(["2.1.0"])[0]["id"], "2.1.0")
+                self.assertLess(time.monotonic() - start, 0.4)
+                stats = rpc.hedger.stats()["get_objects"]
+                self.assertEqual((stats["fired"], stats["won"]), (1, 1))
+
+                # Not hedged
+                rpc.get_dynamic_global_properties()
+                self.assertEqual(sum(rpc.hedger.fired.values()), 1)
+            finally:
+                rpc.disconnect()
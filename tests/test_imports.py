@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+import unittest
+
+
+def loaded_modules(statement):
+    """Return the modules that are loaded by ``statement`` in a fresh
+    interpreter."""
+    output = subprocess.check_output(
+        [sys.executable, "-c", statement + "\nimport sys\nprint(*sys.modules)"],
+        universal_newlines=True,
+    )
+    return set(output.split())
+
+
+class Testcases(unittest.TestCase):
+    def test_lazy(self):
+        heavy = {"deex.deex", "deex.aio.deex", "deexbase.operations", "sqlite3"}
+        for statement in ("import deex", "import deex.aio", "import deexbase"):
+            self.assertFalse(loaded_modules(statement) & heavy, statement)
+
+    def test_attributes(self):
+        import deex
+        import deex.aio
+        import deexbase
+
+        from deex.deex import DeEx
+
+        self.assertIs(deex.DeEx, DeEx)
+        self.assertIn("DeEx", dir(deex))
+        self.assertEqual(deex.aio.DeEx.__module__, "deex.aio.deex")
+        self.assertEqual(deexbase.operations.__name__, "deexbase.operations")
+        self.assertEqual(deex.market.__name__, "deex.market")
+        self.assertFalse(hasattr(deex.aio, "storage"))
+        with self.assertRaises(AttributeError):
+            deex.foo
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from deexapi.aio.deexnoderpc import DeExNodeRPC
+from deexapi.aio.loader import DataLoader
+from deexapi.deadline import deadline, get_deadline
+from deexapi.exceptions import DeadlineExceeded
+
+
+class Testcases(unittest.TestCase):
+    def test_coalescing(self):
+        calls = []
+
+        async def fetch(ids):
+            calls.append(ids)
+            if "bad" in ids:
+                raise ValueError("Invalid object id")
+            return [{"id": id} for id in ids]
+
+        async def run():
+            loader = DataLoader(fetch, max_batch_size=100)
+            ids = ["1.2.{}".format(i) for i in range(250)]
+            results = await asyncio.gather(*[loader.load(id) for id in ids + ids])
+            self.assertEqual([x["id"] for x in results], ids + ids)
+            self.assertEqual([len(x) for x in calls], [100, 100, 50])
+            self.assertEqual(loader.loads, 500)
+
+            # A failing batch is retried one by one
+            del calls[:]
+            good, bad = await asyncio.gather(
+                loader.load("1.3.0"), loader.load("bad"), return_exceptions=True
+            )
+            self.assertEqual(good, {"id": "1.3.0"})
+            self.assertIsInstance(bad, ValueError)
+            self.assertEqual(calls, [["1.3.0", "bad"], ["1.3.0"], ["bad"]])
+
+            # Lookups are collected for flush_delay seconds
+            del calls[:]
+            loader = DataLoader(fetch, flush_delay=0.05)
+            first = loader.load("1.2.0")
+            await asyncio.sleep(0.01)
+            await asyncio.gather(first, loader.load("1.2.1"))
+            self.assertEqual(calls, [["1.2.0", "1.2.1"]])
+
+        asyncio.run(run())
+
+    def test_cancelled_caller(self):
+        async def fetch(ids):
+            await asyncio.sleep(0.05)
+            return [{"id": id} for id in ids]
+
+        async def run():
+            loader = DataLoader(fetch)
+            first = asyncio.wait_for(loader.load("1.2.0"), 0.01)
+            second = loader.load("1.2.0")
+            first, second = await asyncio.gather(first, second, return_exceptions=True)
+            self.assertIsInstance(first, asyncio.TimeoutError)
+            self.assertEqual(second, {"id": "1.2.0"})
+
+        asyncio.run(run())
+
+    def test_deadlines(self):
+        deadlines = []
+
+        async def fetch(ids):
+            deadlines.append(get_deadline())
+            await asyncio.sleep(0.1)
+            return [{"id": id} for id in ids]
+
+        async def run():
+            rpc = DeExNodeRPC("ws://127.0.0.1:1")
+            rpc.loaders["objects"].fetch = fetch
+
+            async def hurried():
+                with deadline(0.05):
+                    return await rpc.get_object("1.2.0")
+
+            # Both lookups share a batch, only the first one has a deadline
+            first, second = await asyncio.gather(
+                hurried(), rpc.get_object("1.2.1"), return_exceptions=True
+            )
+            self.assertIsInstance(first, DeadlineExceeded)
+            self.assertEqual(second, {"id": "1.2.1"})
+            self.assertEqual(deadlines, [None])
+
+        asyncio.run(run())
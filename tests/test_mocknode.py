@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import unittest
+
+from deex import DeEx
+from deex.account import Account
+from deex.market import Market
+
+from .mocknode import MockNode
+
+
+class Testcases(unittest.TestCase):
+    def test_call_paths(self):
+        with MockNode() as node:
+            deex = DeEx(node.url, nobroadcast=True, num_retries=1)
+            try:
+                self.assertEqual(deex.prefix, "DX")
+                Account.clear_cache()
+                account = Account("init0", blockchain_instance=deex)
+                self.assertEqual(account["id"], "1.2.100")
+                market = Market("USD:DEEX", blockchain_instance=deex)
+                self.assertEqual(market.ticker()["latest"]["price"], 0.05)
+                self.assertEqual(len(market.orderbook(limit=5)["bids"]), 5)
+            finally:
+                deex.rpc.connection.disconnect()
+        self.assertGreater(node.calls, 0)
+
+    def test_recorded_responses(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "responses.jsonl")
+            with open(path, "w") as fid:
+                fid.write(
+                    json.dumps(
+                        {"method": "get_objects", "params": [["1.7.1"]], "result": [1]}
+                    )
+                )
+                fid.write("\n")
+                fid.write(json.dumps({"method": "get_ticker", "result": "ticker"}))
+            node = MockNode(responses=path)
+        self.assertEqual(node.call("get_objects", [["1.7.1"]]), [1])
+        self.assertEqual(node.call("get_objects", [["1.7.2"]]), [None])
+        self.assertEqual(node.call("get_ticker", ["1.3.0", "1.3.121"]), "ticker")
+        reply = node.handle({"id": 1, "params": [2, "get_witness", []]})
+        self.assertIn("error", reply)
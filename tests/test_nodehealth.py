@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+import unittest
+
+from websockets.sync.server import serve
+
+from deexbase.chains import known_chains
+from deexapi.deexnoderpc import DeExNodeRPC
+from deexapi.nodehealth import NodeSelector
+
+
+def handler(conn):
+    for message in conn:
+        query = json.loads(message)
+        method = query["params"][1]
+        if method == "get_chain_properties":
+            result = {"chain_id": known_chains["TEST"]["chain_id"]}
+        elif method == "get_dynamic_global_properties":
+            result = {"head_block_number": 100}
+        else:
+            result = None
+        conn.send(json.dumps({"id": query["id"], "result": result}))
+
+
+class Testcases(unittest.TestCase):
+    def test_scoring(self):
+        nodes = NodeSelector(["ws://a", "ws://b", "ws://c"])
+        nodes.record_success("ws://a", 0.3)
+        nodes.record_success("ws://b", 0.1)
+        nodes.record_success("ws://c", 0.05)
+        self.assertEqual(nodes.ranked(), ["ws://c", "ws://b", "ws://a"])
+
+        # c lags behind by 10 blocks
+        nodes.record_head_block("ws://a", 110)
+        nodes.record_head_block("ws://b", 110)
+        nodes.record_head_block("ws://c", 100)
+        self.assertEqual(nodes.best(), "ws://b")
+
+        nodes.record_error("ws://b")
+        self.assertEqual(nodes.best(), "ws://a")
+        self.assertEqual(nodes.best(exclude=["ws://a"]), "ws://b")
+        self.assertFalse(nodes.all_failing())
+
+    def test_custom_scoring(self):
+        nodes = NodeSelector(
+            ["ws://a", "ws://b"], scoring=lambda stats, head: -stats.calls
+        )
+        nodes.record_success("ws://b")
+        self.assertEqual(nodes.best(), "ws://b")
+
+    def test_failover(self):
+        with serve(handler, "127.0.0.1", 0) as server:
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                live = "ws://127.0.0.1:{}".format(server.socket.getsockname()[1])
+                dead = "ws://127.0.0.1:1"
+                rpc = DeExNodeRPC([dead, live], num_retries=1)
+                self.assertEqual(rpc.url, live)
+                self.assertEqual(rpc.nodes.stats[dead].errors, 1)
+
+                rpc.get_dynamic_global_properties()
+                self.assertEqual(rpc.nodes.stats[live].head_block, 100)
+                self.assertIsNotNone(rpc.nodes.stats[live].rtt)
+
+                self.assertTrue(rpc.nodes.probe(live))
+                self.assertFalse(rpc.nodes.probe(dead))
+                self.assertEqual(rpc.nodes.ranked(), [live, dead])
+                rpc.connection.disconnect()
+            finally:
+                server.shutdown()
+                thread.join()
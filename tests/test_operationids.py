@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from deexbase import operationids, operations
+from deexbase.objects import Operation
+
+
+class Testcases(unittest.TestCase):
+    def test_names(self):
+        for id, name in enumerate(operationids.ops):
+            self.assertEqual(operationids.operations[name], id)
+            self.assertEqual(operationids.operation_names[id], name)
+            self.assertEqual(operationids.getOperationNameForId(id), name)
+            self.assertEqual(operationids.getOperationName(id), name)
+            self.assertEqual(operations.getOperationNameForId(id), name)
+        self.assertEqual(
+            operationids.getOperationNameForId(999), "Unknown Operation ID 999"
+        )
+        with self.assertRaises(ValueError):
+            Operation(999)
+
+    def test_classes(self):
+        for name, id in operationids.operations.items():
+            classname = name[0].upper() + name[1:]
+            self.assertEqual(operations.getOperationIdForClass(classname), id)
+            klass = operations.getOperationClassForId(id)
+            if klass is not None:
+                self.assertEqual(klass, getattr(operations, classname))
+        self.assertIs(operations.getOperationClassForId(0), operations.Transfer)
+        self.assertIsNone(operations.getOperationClassForId(4))
+        self.assertIsNone(operations.getOperationIdForClass("Op_wrapper"))
+        self.assertEqual(Operation(53).name, "htlc_refund")
+
+    def test_readonly(self):
+        with self.assertRaises(TypeError):
+            operationids.operations["foo"] = 100
+        with self.assertRaises(TypeError):
+            operationids.operation_names[100] = "foo"
+        with self.assertRaises(TypeError):
+            operations.class_idmap[100] = operations.Transfer
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from deex import DeEx
+from deexapi.pool import DeExNodeRPCPool
+
+from .mocknode import MockNode
+
+
+class Testcases(unittest.TestCase):
+    def test_pool(self):
+        with MockNode(latency=0.1) as node1, MockNode(latency=0.1) as node2:
+            rpc = DeExNodeRPCPool([node1.url, node2.url], pool_size=4, num_retries=1)
+            try:
+                self.assertEqual(
+                    [c.url for c in rpc.connections],
+                    [node1.url, node2.url, node1.url, node2.url],
+                )
+                start = time.monotonic()
+                with ThreadPoolExecutor(8) as executor:
+                    results = list(executor.map(rpc.get_object, ["2.1.0"] * 16))
+                # 16 calls of 0.1s over 4 connections
+                self.assertLess(time.monotonic() - start, 1.0)
+                self.assertEqual([x["id"] for x in results], ["2.1.0"] * 16)
+
+                with rpc.batch() as batch:
+                    asset = batch.get_asset("USD")
+                self.assertEqual(asset.result()["id"], "1.3.121")
+            finally:
+                rpc.disconnect()
+
+    def test_cache(self):
+        with MockNode() as node:
+            rpc = DeExNodeRPCPool(node.url, pool_size=2, num_retries=1, cache=True)
+            try:
+                calls = node.calls
+                rpc.get_ticker("1.3.0", "1.3.121")
+                rpc.get_ticker("1.3.0", "1.3.121")
+                self.assertEqual(node.calls - calls, 1)
+
+                # The head block seen by a connection invalidates the ticker
+                props = rpc.get_dynamic_global_properties()
+                self.assertEqual(rpc.cache.head_block, props["head_block_number"])
+                rpc.get_ticker("1.3.0", "1.3.121")
+                self.assertEqual(node.calls - calls, 3)
+            finally:
+                rpc.disconnect()
+
+    def test_deex_pool(self):
+        with MockNode() as node:
+            deex = DeEx(node.url, nobroadcast=True, num_retries=1, pool_size=2)
+            try:
+                self.assertIsInstance(deex.rpc, DeExNodeRPCPool)
+                self.assertEqual(deex.prefix, "DX")
+                self.assertEqual(deex.rpc.get_account("init0")["id"], "1.2.100")
+            finally:
+                deex.rpc.disconnect()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import unittest
+
+from deexapi.recorder import StreamRecorder, StreamReplayer
+from deexapi.websocket import DeExWebsocket
+
+
+def notice(event, payload):
+    return json.dumps(
+        {
+            "method": "notice",
+            "params": [DeExWebsocket.__events__.index(event), payload],
+        }
+    )
+
+
+class Testcases(unittest.TestCase):
+    def test_record_and_replay(self):
+        frames = [notice("on_block", ["{:08x}".format(i) + "0" * 32]) for i in range(5)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stream.jsonl.gz")
+
+            ws = DeExWebsocket("ws://localhost", max_backfill=0)
+            with StreamRecorder(path) as recorder:
+                recorder.attach(ws)
+                for frame in frames:
+                    ws.on_message(frame)
+            self.assertEqual(recorder.frames, 5)
+
+            replayer = StreamReplayer(path)
+            self.assertEqual([frame for _, frame in replayer.frames], frames)
+
+            blocks = []
+            ws = DeExWebsocket("ws://localhost", on_block=blocks.append)
+            stats = replayer.replay(ws.on_message)
+            self.assertEqual(len(blocks), 5)
+            self.assertEqual(stats["messages"], 5)
+            self.assertGreater(stats["messages_per_sec"], 0)
+
+            # Replaying at recorded speed keeps the offsets
+            stats = replayer.replay(lambda frame: None, speed=1.0)
+            self.assertGreaterEqual(stats["seconds"], replayer.frames[-1][0])
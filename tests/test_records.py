@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import copy
+import sys
+import unittest
+
+from deexbase import objects, operations, schemas
+from deexbase.decoders import decode, decode_operation, decode_transaction
+from deexbase.encoders import encode_operation, encode_transaction
+from deexbase.objects import Operation
+from deexbase.records import record_class, record_for
+
+from .test_encoders import (
+    expiration,
+    price,
+    ref_block_num,
+    ref_block_prefix,
+    test_operations,
+)
+
+
+prefix = "DX"
+
+
+class Testcases(unittest.TestCase):
+    def test_operations(self):
+        for name, data in test_operations:
+            expected = bytes(Operation(copy.deepcopy([name, data])))
+            record = record_for(name)(copy.deepcopy(data))
+            self.assertEqual(bytes(record), expected[1:], name)
+            self.assertEqual(encode_operation(record), expected, name)
+            self.assertEqual(bytes(record.operation()), expected, name)
+
+    def test_record_for(self):
+        for key in ("limit_order_cancel", 2, operations.Limit_order_cancel):
+            self.assertEqual(record_for(key).__name__, "Limit_order_cancel")
+        with self.assertRaises(NotImplementedError):
+            record_for("fill_order")
+
+    def test_fields(self):
+        name, data = test_operations[2]
+        record = record_for(name)(data)
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual(record.seller, "1.2.29")
+        self.assertEqual(record["seller"], "1.2.29")
+        self.assertEqual(record.amount_to_sell.asset_id, "1.3.0")
+        self.assertIsInstance(record.fee, record_class(schemas.ASSET))
+        self.assertEqual(record.json(), data)
+        with self.assertRaises(KeyError):
+            record["prefix"]
+
+        name, data = test_operations[1]
+        record = record_for(name)(**data)
+        self.assertNotIn("memo", record)
+        self.assertIsNone(record.memo)
+        self.assertEqual(record.get("memo", {}), {})
+        self.assertEqual(record.json(), data)
+
+        data = copy.deepcopy(data)
+        del data["fee"]
+        with self.assertRaises(KeyError):
+            record_for(name)(data)
+
+    def test_objects(self):
+        Price = record_class(schemas.PRICE)
+        self.assertEqual(Price.__name__, "Price")
+        self.assertEqual(bytes(Price(price)), bytes(objects.Price(price)))
+        self.assertEqual(
+            Price(price), decode(schemas.PRICE, bytes(Price(price)), records=True)
+        )
+
+    def test_decode(self):
+        for op in test_operations:
+            raw = encode_operation(op)
+            record = decode_operation(raw, prefix=prefix, records=True)
+            self.assertEqual(record._name, Operation(copy.deepcopy(op)).name, op[0])
+            self.assertEqual(record.prefix, prefix)
+            self.assertEqual(encode_operation(record), raw, op[0])
+            self.assertEqual(record, decode_operation(raw, prefix, records=True))
+
+        raw = encode_transaction(
+            ref_block_num, ref_block_prefix, expiration, test_operations
+        )
+        tx = decode_transaction(raw, prefix=prefix, records=True)
+        self.assertEqual(
+            encode_transaction(
+                tx["ref_block_num"],
+                tx["ref_block_prefix"],
+                tx["expiration"],
+                tx["operations"],
+            ),
+            raw,
+        )
+
+    def test_size(self):
+        name, data = test_operations[2]
+        record = record_for(name)(data)
+        self.assertLess(sys.getsizeof(record), sys.getsizeof(dict(data)))
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from deexapi.aio.scheduler import Scheduler
+
+
+class Testcases(unittest.TestCase):
+    def test_priorities(self):
+        order = []
+
+        async def call(name):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+        async def run():
+            scheduler = Scheduler(initial_limit=1, max_limit=1)
+            history = [
+                scheduler.call("get_account_history", call, "get_account_history")
+                for _ in range(5)
+            ]
+            tasks = [asyncio.ensure_future(x) for x in history]
+            await asyncio.sleep(0)
+            tasks.append(
+                asyncio.ensure_future(
+                    scheduler.call("broadcast_transaction", call, "broadcast")
+                )
+            )
+            await asyncio.gather(*tasks)
+            # The first history read was sent already, the broadcast is next
+            self.assertEqual(order[:2], ["get_account_history", "broadcast"])
+            self.assertEqual(scheduler.waited["broadcast_transaction"], 1)
+            self.assertEqual(scheduler.inflight, 0)
+
+        asyncio.run(run())
+
+    def test_aimd(self):
+        async def fast():
+            await asyncio.sleep(0)
+
+        async def slow():
+            await asyncio.sleep(0.05)
+
+        async def broken():
+            raise ConnectionError()
+
+        async def run():
+            scheduler = Scheduler(initial_limit=4, target_latency=0.02)
+            for _ in range(20):
+                await scheduler.call("get_objects", fast)
+            self.assertGreater(scheduler.limit, 6)
+
+            limit = scheduler.limit
+            await asyncio.gather(
+                *[scheduler.call("get_objects", slow) for _ in range(4)]
+            )
+            # Decreased once for calls that were in flight together
+            self.assertEqual(scheduler.limit, limit / 2)
+            self.assertEqual(scheduler.decreases, 1)
+
+            with self.assertRaises(ConnectionError):
+                await scheduler.call("get_objects", broken)
+            self.assertEqual(scheduler.limit, limit / 4)
+            self.assertEqual(scheduler.stats()["inflight"], 0)
+
+        asyncio.run(run())
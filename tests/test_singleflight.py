@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+import unittest
+
+from deexapi.deadline import deadline
+from deexapi.deexnoderpc import DeExNodeRPC
+from deexapi.exceptions import DeadlineExceeded
+from deexapi.aio.singleflight import SingleFlight as AioSingleFlight
+
+from .mocknode import MockNode
+
+
+class Testcases(unittest.TestCase):
+    def test_singleflight(self):
+        with MockNode(latency=0.1) as node:
+            rpc = DeExNodeRPC(node.url, num_retries=1, singleflight=["get_ticker"])
+            try:
+                calls = node.calls
+                results = []
+                threads = [
+                    threading.Thread(
+                        target=lambda: results.append(
+                            rpc.get_ticker("1.3.0", "1.3.121")
+                        )
+                    )
+                    for _ in range(10)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                self.assertEqual(node.calls - calls, 1)
+                self.assertEqual(rpc.singleflight.collapsed["get_ticker"], 9)
+                self.assertTrue(all(x is results[0] for x in results))
+
+                # Other params and other methods are not collapsed
+                rpc.get_ticker("1.3.0", "1.3.120")
+                rpc.get_objects(["2.1.0"])
+                self.assertEqual(node.calls - calls, 3)
+            finally:
+                rpc.connection.disconnect()
+
+    def test_deadlines(self):
+        with MockNode(latency=0.2) as node:
+            rpc = DeExNodeRPC(node.url, num_retries=1, singleflight=["get_ticker"])
+            try:
+                results = {}
+
+                def call(name, timeout=None):
+                    try:
+                        with deadline(timeout):
+                            results[name] = rpc.get_ticker("1.3.0", "1.3.121")
+                    except DeadlineExceeded as e:
+                        results[name] = e
+
+                # The deadline of the first call is not the one of the others
+                threads = [
+                    threading.Thread(target=call, args=("hurried", 0.05)),
+                    threading.Thread(target=call, args=("patient",)),
+                    threading.Thread(target=call, args=("late", 0.1)),
+                ]
+                for thread in threads:
+                    thread.start()
+                    time.sleep(0.01)
+                for thread in threads:
+                    thread.join()
+                self.assertIsInstance(results["hurried"], DeadlineExceeded)
+                self.assertIsInstance(results["late"], DeadlineExceeded)
+                self.assertEqual(results["patient"]["base"], "1.3.0")
+            finally:
+                rpc.connection.disconnect()
+
+    def test_aio_singleflight(self):
+        calls = []
+
+        async def get_ticker(base, quote):
+            calls.append((base, quote))
+            await asyncio.sleep(0.01)
+            if quote == "bad":
+                raise ValueError(quote)
+            return {"base": base, "quote": quote}
+
+        async def run():
+            singleflight = AioSingleFlight(["get_ticker"])
+            results = await asyncio.gather(
+                *[
+                    singleflight.call("get_ticker", args, {}, get_ticker)
+                    for args in [("1.3.0", "1.3.121")] * 5 + [("1.3.0", "bad")] * 2
+                ],
+                return_exceptions=True
+            )
+            self.assertEqual(results[:5], [{"base": "1.3.0", "quote": "1.3.121"}] * 5)
+            self.assertIsInstance(results[5], ValueError)
+            self.assertIsInstance(results[6], ValueError)
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(singleflight.collapsed["get_ticker"], 5)
+
+        asyncio.run(run())
+
+    def test_aio_cancelled_leader(self):
+        calls = []
+
+        async def get_ticker(base, quote):
+            calls.append((base, quote))
+            await asyncio.sleep(0.05)
+            return {"base": base, "quote": quote}
+
+        async def run():
+            singleflight = AioSingleFlight(["get_ticker"])
+            args = ("1.3.0", "1.3.121")
+            leader = asyncio.ensure_future(
+                singleflight.call("get_ticker", args, {}, get_ticker)
+            )
+            await asyncio.sleep(0.01)
+            followers = [
+                asyncio.ensure_future(
+                    singleflight.call("get_ticker", args, {}, get_ticker)
+                )
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            # The followers are not cancelled, one of them sends the call again
+            results = await asyncio.gather(*followers)
+            self.assertEqual(results, [{"base": "1.3.0", "quote": "1.3.121"}] * 2)
+            self.assertTrue(leader.cancelled())
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(singleflight.collapsed["get_ticker"], 1)
+
+        asyncio.run(run())
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import unittest
+
+from deex import DeEx
+from deex.asset import Asset
+from deex.market import Market
+from deexapi.tracer import Histogram, Tracer, span
+
+from .mocknode import MockNode
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        # The assets must be loaded from the node, not from the cache
+        Asset.clear_cache()
+
+    def test_histogram(self):
+        histogram = Histogram()
+        for latency in [0.001] * 90 + [0.2] * 10:
+            histogram.add(latency)
+        self.assertEqual(histogram.quantile(0.5), 0.005)
+        self.assertEqual(histogram.quantile(0.99), 0.2)
+        stats = histogram.todict()
+        self.assertEqual(stats["count"], 100)
+        self.assertEqual(stats["buckets"]["0.25"], 10)
+
+    def test_tracer(self):
+        path = os.path.join(tempfile.mkdtemp(), "trace.jsonl")
+        with MockNode() as node, Tracer(path) as tracer:
+            deex = DeEx(node.url, nobroadcast=True, num_retries=1, tracer=tracer)
+            self.assertIs(deex.rpc.tracer, tracer)
+            tracer.reset()
+
+            market = Market("USD:DEEX", blockchain_instance=deex)
+            with span("job"):
+                market.ticker()
+            stats = tracer.stats()
+            self.assertIn("get_ticker", stats["methods"])
+            ticker = stats["methods"]["get_ticker"]
+            self.assertEqual(ticker["latency"]["count"], 1)
+            self.assertGreater(ticker["response_bytes"], 0)
+            self.assertIn("job > Market.ticker", stats["spans"])
+            self.assertIn("get_ticker", stats["spans"]["job > Market.ticker"])
+            # Loading the assets of the market is nested under the market
+            self.assertTrue(
+                any(
+                    key.startswith("Market.__init__ > Asset.__init__")
+                    for key in stats["spans"]
+                )
+            )
+
+            call = tracer.calls[-1]
+            self.assertEqual(call["node"], node.url)
+            self.assertEqual(call["retries"], 0)
+
+        with open(path) as fp:
+            calls = [json.loads(line) for line in fp]
+        self.assertEqual(calls[-1]["method"], "get_ticker")
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import unittest
+
+import pytest
+import websockets
+
+from grapheneapi.exceptions import RPCError
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+from websocket import WebSocketTimeoutException
+
+from deexapi.exceptions import NumRetriesReached
+from deexapi.websocket import DeExWebsocket, KeepaliveDispatcher
+from deexapi.aio.websocket import DeExWebsocket as AioDeExWebsocket
+
+
+def notice(event, payload):
+    return json.dumps(
+        {
+            "method": "notice",
+            "params": [DeExWebsocket.__events__.index(event), payload],
+        }
+    )
+
+
+class Testcases(unittest.TestCase):
+    def test_process_notice(self):
+        received = []
+        ws = DeExWebsocket(
+            "ws://localhost", objects=["1.3.0", "2.1.x"], on_object=received.append
+        )
+        ws.process_notice({"id": "1.3.0"})
+        ws.process_notice({"id": "1.3.1"})
+        ws.process_notice({"id": "2.1.0"})
+        self.assertEqual([x["id"] for x in received], ["1.3.0", "2.1.0"])
+
+        # Indices follow changes of the subscribed objects
+        ws.subscription_objects = ["1.3.1"]
+        ws.process_notice({"id": "1.3.1"})
+        ws.process_notice({"id": "2.1.0"})
+        self.assertEqual([x["id"] for x in received], ["1.3.0", "2.1.0", "1.3.1"])
+
+    def test_on_message(self):
+        blocks = []
+        accounts = []
+        ws = DeExWebsocket(
+            "ws://localhost", on_block=blocks.append, on_account=accounts.append
+        )
+        ws.on_message(notice("on_block", ["0062f19d"]))
+        ws.on_message(notice("on_object", [[{"id": "2.6.29"}]]))
+        self.assertEqual(blocks, ["0062f19d"])
+        self.assertEqual(accounts, [{"id": "2.6.29"}])
+
+    def test_coalesce_notices(self):
+        received = []
+        ws = DeExWebsocket(
+            "ws://localhost",
+            objects=["2.1.0"],
+            on_object=received.append,
+            coalesce_notices=0,
+        )
+        ws.on_message(
+            notice(
+                "on_object",
+                [
+                    [
+                        {"id": "2.1.0", "head_block_number": 1},
+                        {"id": "2.6.29", "total_ops": 1},
+                        {"id": "2.1.0", "head_block_number": 2},
+                    ],
+                    [{"id": "2.6.29", "total_ops": 2}],
+                ],
+            )
+        )
+        self.assertEqual(received, [{"id": "2.1.0", "head_block_number": 2}])
+        self.assertEqual(ws.coalesced_notices, 2)
+
+        # Coalesce over a time window
+        ws = DeExWebsocket(
+            "ws://localhost",
+            objects=["2.1.0"],
+            on_object=received.append,
+            coalesce_notices=60,
+        )
+        for i in range(3):
+            ws.on_message(notice("on_object", [{"id": "2.1.0", "num": i}]))
+        self.assertEqual(len(received), 1)
+        ws._flush_timer.cancel()
+        ws.flush_notices()
+        self.assertEqual(received[1:], [{"id": "2.1.0", "num": 2}])
+
+    def test_dispatch_workers(self):
+        blocks = []
+        ws = DeExWebsocket("ws://localhost", on_block=blocks.append, dispatch_workers=2)
+        for i in range(10):
+            ws.on_message(notice("on_block", [str(i)]))
+        ws.dispatcher.stop()
+        self.assertEqual(blocks, [str(i) for i in range(10)])
+        self.assertEqual(ws.dispatcher.metrics()["dispatched"], 10)
+
+    def test_subscription_calls(self):
+        ws = DeExWebsocket(
+            "ws://localhost",
+            accounts=["init0"],
+            markets=[["1.3.0", "1.3.1"]],
+            on_account=print,
+            on_market=print,
+        )
+        names = [name for name, _ in ws._subscription_calls()]
+        self.assertEqual(
+            names,
+            [
+                "cancel_all_subscriptions",
+                "set_subscribe_callback",
+                "get_full_accounts",
+                "subscribe_to_market",
+            ],
+        )
+
+    def test_request_correlation(self):
+        sent = []
+
+        class FakeSocket:
+            def send(self, data):
+                sent.append(json.loads(data.decode("utf8")))
+
+        ws = DeExWebsocket("ws://localhost")
+        ws.ws = FakeSocket()
+        first = ws.get_objects(["2.1.0"])
+        second = ws.get_objects(["2.8.0"])
+        self.assertEqual([x["id"] for x in sent], [1, 2])
+
+        # Replies may arrive out of order
+        ws.on_message(json.dumps({"id": 2, "result": [{"id": "2.8.0"}]}))
+        ws.on_message(json.dumps({"id": 1, "error": {"message": "Assert Exception"}}))
+        self.assertEqual(second.result(timeout=1), [{"id": "2.8.0"}])
+        with self.assertRaises(RPCError):
+            first.result(timeout=1)
+
+        pending = ws.get_objects(["2.1.0"])
+        ws.on_close()
+        with self.assertRaises(IOError):
+            pending.result(timeout=1)
+
+    def test_incremental_subscriptions(self):
+        sent = []
+
+        class FakeSocket:
+            def send(self, data):
+                sent.append(json.loads(data.decode("utf8")))
+
+        accounts = []
+        ws = DeExWebsocket(
+            "ws://localhost",
+            on_account=accounts.append,
+            on_market=print,
+        )
+        ws.ws = FakeSocket()
+        ws.reset_subscriptions(
+            accounts=["init0"], markets=[["1.3.0", "1.3.1"]], full=True
+        )
+        ws.on_message(
+            json.dumps(
+                {
+                    "id": sent[-2]["id"],
+                    "result": [["init0", {"account": {"id": "1.2.100"}}]],
+                }
+            )
+        )
+
+        del sent[:]
+        ws.reset_subscriptions(accounts=["init1"], markets=[["1.3.0", "1.3.2"]])
+        self.assertEqual(
+            [(x["params"][1], x["params"][2]) for x in sent],
+            [
+                ("get_full_accounts", [["init1"], True]),
+                ("unsubscribe_from_market", ["1.3.0", "1.3.1"]),
+                ("subscribe_to_market", [4, "1.3.0", "1.3.2"]),
+            ],
+        )
+
+        # The removed account is still subscribed on the node, but muted
+        ws.process_notice({"id": "2.6.100", "owner": "1.2.100"})
+        ws.process_notice({"id": "2.6.101", "owner": "1.2.101"})
+        self.assertEqual([x["id"] for x in accounts], ["2.6.101"])
+
+        # Adding it back again requires no call
+        del sent[:]
+        ws.reset_subscriptions(
+            accounts=["init0", "init1"], markets=[["1.3.0", "1.3.2"]]
+        )
+        self.assertEqual(sent, [])
+        ws.process_notice({"id": "2.6.100", "owner": "1.2.100"})
+        self.assertEqual([x["id"] for x in accounts], ["2.6.101", "2.6.100"])
+
+    def test_backfill_after_reconnect(self):
+        sent = []
+
+        class FakeSocket:
+            def send(self, data):
+                sent.append(json.loads(data.decode("utf8")))
+
+        def block_id(num):
+            return "{:08x}".format(num) + "0" * 32
+
+        def reply(method, result):
+            query = [x for x in sent if x["params"][1] == method][-1]
+            ws.on_message(json.dumps({"id": query["id"], "result": result}))
+
+        blocks = []
+        ws = DeExWebsocket("ws://localhost", on_block=blocks.append)
+        ws.ws = FakeSocket()
+        ws.on_message(notice("on_block", [block_id(10), block_id(11)]))
+
+        # Reconnect, the keepalive thread is not needed here
+        ws.run_event.set()
+        ws.on_open()
+        ws.on_message(notice("on_block", [block_id(15)]))
+        reply("get_dynamic_global_properties", {"head_block_number": 14})
+        requested = [x for x in sent if x["params"][1] == "get_block"]
+        self.assertEqual([x["params"][2][0] for x in requested], [12, 13, 14])
+        for query in reversed(requested):
+            num = query["params"][2][0]
+            ws.on_message(
+                json.dumps(
+                    {
+                        "id": query["id"],
+                        "result": {"block_id": block_id(num), "previous": ""},
+                    }
+                )
+            )
+        # A duplicate is dropped
+        ws.on_message(notice("on_block", [block_id(15), block_id(16)]))
+        self.assertEqual(blocks, [block_id(x) for x in range(10, 17)])
+
+    def test_no_backfill_for_head_block_handlers(self):
+        sent = []
+
+        class FakeSocket:
+            def send(self, data):
+                sent.append(json.loads(data.decode("utf8")))
+
+        heads = []
+        ws = DeExWebsocket("ws://localhost")
+        ws.add_head_block_handler(heads.append)
+        ws.ws = FakeSocket()
+        ws.on_message(notice("on_block", ["0000000a" + "0" * 32]))
+        ws.run_event.set()
+        ws.on_open()
+        ws.on_message(notice("on_block", ["0000000f" + "0" * 32]))
+        self.assertEqual(len(heads), 2)
+        methods = [x["params"][1] for x in sent]
+        self.assertNotIn("get_dynamic_global_properties", methods)
+        self.assertNotIn("get_block", methods)
+
+    def test_keepalive_ping_frames(self):
+        pings = []
+        app = SimpleNamespace(
+            last_pong_tm=0, sock=SimpleNamespace(ping=lambda: pings.append(1))
+        )
+        ws = DeExWebsocket("ws://localhost", keepalive_mode="ping")
+        ws.url = "ws://localhost"
+        keepalive = KeepaliveDispatcher(ws, app, interval=0, timeout=0.01)
+        keepalive.check()
+        self.assertEqual(len(pings), 1)
+        # Pong arrives, the next ping is due right away
+        app.last_pong_tm = 1
+        keepalive.check()
+        self.assertEqual(len(pings), 2)
+        # No pong this time
+        keepalive.sent_at -= 1
+        with self.assertRaises(WebSocketTimeoutException):
+            keepalive.check()
+
+    def test_keepalive_rpc_fallback(self):
+        app = SimpleNamespace(last_pong_tm=0, sock=SimpleNamespace(ping=lambda: None))
+        ws = DeExWebsocket("ws://localhost", keepalive_mode="ping")
+        ws.url = "ws://localhost"
+        futures = []
+
+        def get_objects(ids):
+            futures.append(Future())
+            return futures[-1]
+
+        ws.get_objects = get_objects
+        keepalive = KeepaliveDispatcher(ws, app, interval=0, timeout=0.01)
+        keepalive.check()
+        # The node never answers ping frames, but RPC calls
+        keepalive.sent_at -= 1
+        keepalive.check()
+        self.assertTrue(keepalive.use_rpc)
+        self.assertIn("ws://localhost", ws.no_pong_urls)
+        self.assertEqual(len(futures), 1)
+        futures[0].set_result([])
+        keepalive.check()
+        self.assertEqual(len(futures), 2)
+        keepalive.sent_at -= 1
+        with self.assertRaises(WebSocketTimeoutException):
+            keepalive.check()
+
+        # Later connections to the node go straight to RPC pings
+        self.assertTrue(KeepaliveDispatcher(ws, app, 0, 0.01).use_rpc)
+
+    def test_keepalive_mode(self):
+        with self.assertRaises(ValueError):
+            DeExWebsocket("ws://localhost", keepalive_mode="tcp")
+
+
+@pytest.mark.asyncio
+async def test_aio_run_forever():
+    requests = []
+
+    async def handler(conn, *args):
+        async for message in conn:
+            query = json.loads(message)
+            requests.append(query["params"][1])
+            result = None
+            if query["params"][1] == "get_objects":
+                result = [{"id": x} for x in query["params"][2][0]]
+            await conn.send(json.dumps({"id": query["id"], "result": result}))
+            if query["params"][1] == "set_block_applied_callback":
+                await conn.send(notice("on_block", ["0062f19d"]))
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        blocks = []
+        objects = []
+        ws = AioDeExWebsocket("ws://127.0.0.1:{}".format(port))
+
+        async def lookup_and_close():
+            objects.extend(await ws.get_objects(["2.1.0"]))
+            await ws.close()
+
+        def on_block(block_id):
+            blocks.append(block_id)
+            asyncio.ensure_future(lookup_and_close())
+
+        ws.on_block += on_block
+        await asyncio.wait_for(ws.run_forever(), 5)
+
+    assert blocks == ["0062f19d"]
+    assert objects == [{"id": "2.1.0"}]
+    assert requests[:2] == ["login", "database"]
+    assert "set_block_applied_callback" in requests
+
+
+@pytest.mark.asyncio
+async def test_aio_run_forever_retries():
+    logins = []
+
+    async def handler(conn, *args):
+        async for message in conn:
+            query = json.loads(message)
+            logins.append(query["params"][1])
+            error = {"message": "login failed"}
+            await conn.send(json.dumps({"id": query["id"], "error": error}))
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        ws = AioDeExWebsocket("ws://127.0.0.1:{}".format(port), num_retries=1)
+        # A failing login counts as a failed connection attempt
+        with pytest.raises(NumRetriesReached):
+            await asyncio.wait_for(ws.run_forever(), 10)
+
+    assert logins == ["login"] * 2